@@ -1,36 +1,69 @@
 from selenium.webdriver.support.ui import WebDriverWait
+import time
 from time import sleep
 from selenium.webdriver.support import expected_conditions as Ec
 from selenium.common.exceptions import (
     WebDriverException
 )
 from .common import Common
+from .metrics import Metrics
+from .deadline import Deadline
+from .navigation import CircuitBreaker, backoff_delay, is_retryable
+from .rate import RateController
+from .proxies import ProxyPool
+try:
+    from settings import NAVIGATION_MAX_ATTEMPTS
+except ImportError:
+    from app.settings import NAVIGATION_MAX_ATTEMPTS
 
 
 class Base:
     timeout = 120
+    deadline = Deadline()  # none, the Backend and Parser of a job set the job's
+    metrics = Metrics()  # read by no one, the Backend and Parser of a job set the job's
 
     def openingurl(self, url: str):
         """
-        To avoid internet connection error while requesting"""
+        Open the url, retrying transient errors (timeouts, connection errors) with backoff.
+        Raises the error if it is fatal (dead driver, bad url) or the attempts are used up"""
 
-        while True:
+        for attempt in range(NAVIGATION_MAX_ATTEMPTS):
             if Common.close_thread_is_set():
                 self.driver.quit()
                 return
 
+            CircuitBreaker.wait(self.deadline)
+            if Common.close_thread_is_set():
+                self.driver.quit()
+                return
+            RateController.acquire(self.deadline)
+            startTime = time.time()
             try:
+                self.metrics.increment("navigations")
                 self.driver.get(url)
-            except WebDriverException:
-                sleep(5)
-                continue
+            except WebDriverException as e:
+                CircuitBreaker.record(False)
+                RateController.failure()
+                self.metrics.increment("navigation_failures")
+                if not is_retryable(e):
+                    self.metrics.increment("navigation_fatal")
+                    raise
+                ProxyPool.failure(self.driver)
+                if attempt + 1 == NAVIGATION_MAX_ATTEMPTS or self.deadline.expired():
+                    self.metrics.increment("navigation_gave_up")
+                    raise
+                self.metrics.increment("navigation_retries")
+                sleep(self.deadline.clamp(backoff_delay(attempt)))
             else:
-                break
+                CircuitBreaker.record(True)
+                RateController.success(time.time() - startTime)
+                ProxyPool.success(self.driver, time.time() - startTime)
+                return
 
     def findelementwithwait(self, by, value):
         """we will use this function to find an element"""
 
-        element = WebDriverWait(self.driver, self.timeout).until(
+        element = WebDriverWait(self.driver, self.deadline.clamp(self.timeout)).until(
             Ec.visibility_of_element_located((by, value))
         )
         return element
\ No newline at end of file
@@ -0,0 +1,92 @@
+"""
+This module contain the code for recognizing pages Google shows instead of Maps.
+A consent wall, an "unusual traffic" interstitial or a captcha is recognized from
+the url, the title and a few DOM markers with one script call right after a
+navigation, so a blocked job stops in seconds instead of waiting out timeouts
+"""
+
+try:
+    from scraper.communicator import Communicator
+    from scraper.rate import RateController
+except ImportError:
+    from app.scraper.communicator import Communicator
+    from app.scraper.rate import RateController
+
+
+PAGE_OK = "ok"
+PAGE_CONSENT = "consent"
+PAGE_UNUSUAL_TRAFFIC = "unusual_traffic"
+PAGE_CAPTCHA = "captcha"
+
+# Pages no navigation gets past, the job stops on them
+BLOCKED_PAGES = (PAGE_CONSENT, PAGE_UNUSUAL_TRAFFIC, PAGE_CAPTCHA)
+
+PAGE_STATE_SCRIPT = """
+var text = document.body ? document.body.innerText.slice(0, 3000) : '';
+return {
+    url: location.href,
+    title: document.title,
+    maps: !!document.querySelector('div[role="feed"], div[role="main"], #searchboxinput'),
+    captcha: !!document.querySelector('#captcha-form, .g-recaptcha, iframe[src*="recaptcha"]'),
+    consent: !!document.querySelector('form[action*="consent.google"]'),
+    interstitial: !!document.querySelector('#infoDiv'),
+    unusual: /unusual traffic|systems have detected/i.test(text)
+};
+"""
+
+
+class BlockedError(Exception):
+    def __init__(self, kind, url=None):
+        super().__init__(f"Google is showing a {kind.replace('_', ' ')} page instead of Maps")
+        self.kind = kind
+        self.url = url
+
+
+def classify_url(url):
+    """State of a page known only by its url"""
+    url = (url or "").lower()
+    if "google.com/sorry/" in url or "/sorry/index" in url:
+        return PAGE_UNUSUAL_TRAFFIC
+    if "consent.google." in url:
+        return PAGE_CONSENT
+    return PAGE_OK
+
+
+def classify(page):
+    """State of a page from the values of PAGE_STATE_SCRIPT"""
+    # A Maps page is never the interstitial, even if a business or a review mentions unusual traffic
+    if not page.get("maps"):
+        if page.get("captcha"):
+            return PAGE_CAPTCHA
+        if page.get("interstitial") or page.get("unusual"):
+            return PAGE_UNUSUAL_TRAFFIC
+
+    state = classify_url(page.get("url"))
+    if state != PAGE_OK:
+        return state
+    if page.get("consent") or (page.get("title") or "").lower().startswith("before you continue"):
+        return PAGE_CONSENT
+    return PAGE_OK
+
+
+def check_page(driver):
+    """State of the open page. A page that cannot be read is not taken as blocked"""
+    try:
+        return classify(driver.execute_script(PAGE_STATE_SCRIPT) or {})
+    except Exception as e:
+        print(f"[DEBUG] Page state not available: {e}")
+        return PAGE_OK
+
+
+def raise_if_blocked(state, url=None, metrics=None):
+    """
+    Report a blocked page to the frontend and raise BlockedError, so the job stops at once.
+    metrics: the job's metrics.Metrics the blocked page is counted in
+    """
+    if state not in BLOCKED_PAGES:
+        return
+    if metrics is not None:
+        metrics.increment("blocked_pages")
+    RateController.blocked()
+    Communicator.report_block(state)
+    raise BlockedError(state, url)
@@ -12,4 +12,9 @@ class Common:
     @classmethod
     def close_thread_is_set(cls):
         return cls.closeThread.is_set()
+
+    @classmethod
+    def sleep(cls, seconds):
+        """Sleep, waking as soon as the scraping is stopped. True if it was stopped"""
+        return cls.closeThread.wait(max(0, seconds))
     
\ No newline at end of file
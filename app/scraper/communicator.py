@@ -1,4 +1,9 @@
 
+try:
+    from scraper.progress import ProgressEvent
+except ImportError:
+    from app.scraper.progress import ProgressEvent
+
 
 class Communicator:
 
@@ -31,6 +36,35 @@ class Communicator:
         if hasattr(cls.__frontend_object, 'add_extracted_row'):
             cls.__frontend_object.add_extracted_row(business_data)
 
+    @classmethod
+    def emit_progress(cls, phase, found=0, parsed=0, total=0):
+        """Send a typed progress event to frontend, if it can handle them"""
+        if cls.__frontend_object is None:
+            return
+
+        if hasattr(cls.__frontend_object, 'on_progress'):
+            cls.__frontend_object.on_progress(
+                ProgressEvent(phase=phase, found=found, parsed=parsed, total=total)
+            )
+
+    @classmethod
+    def report_block(cls, kind):
+        """Tell the frontend that Google blocks the job (see blocking.BLOCKED_PAGES), if it can handle it"""
+        if cls.__frontend_object is None:
+            return
+
+        if hasattr(cls.__frontend_object, 'on_blocked'):
+            cls.__frontend_object.on_blocked(kind)
+
+    @classmethod
+    def report_dead_letters(cls, deadLetters):
+        """Tell the frontend the places given up (url, error, attempts), if it can handle them"""
+        if cls.__frontend_object is None:
+            return
+
+        if hasattr(cls.__frontend_object, 'on_dead_letters'):
+            cls.__frontend_object.on_dead_letters(list(deadLetters))
+
     @classmethod
     def suppress_error_message(cls, message):
         """Suppress error messages that shouldn't be shown to users"""
@@ -68,4 +102,11 @@ class Communicator:
     
     @classmethod
     def get_search_query(cls):
-        return cls.__backend_object.searchquery
\ No newline at end of file
+        return cls.__backend_object.searchquery
+
+    @classmethod
+    def relaunch_driver(cls):
+        """A new driver from the backend in place of its dead one, None if there is no backend"""
+        if cls.__backend_object is None:
+            return None
+        return cls.__backend_object.relaunch_driver()
\ No newline at end of file
@@ -7,10 +7,14 @@ import pandas as pd
 try:
     from scraper.communicator import Communicator
     from scraper.error_codes import ERROR_CODES
+    from scraper import exporter
+    from scraper.progress import PHASE_SAVING
     from settings import OUTPUT_PATH
 except ImportError:
     from app.scraper.communicator import Communicator
     from app.scraper.error_codes import ERROR_CODES
+    from app.scraper import exporter
+    from app.scraper.progress import PHASE_SAVING
     from app.settings import OUTPUT_PATH
 import os
 import json
@@ -30,8 +34,8 @@ class DataSaver:
         if len(datalist) > 0:
             Communicator.show_message("Saving the scraped data")
 
-            dataFrame = pd.DataFrame(datalist)
-            totalRecords = dataFrame.shape[0]
+            totalRecords = len(datalist)
+            Communicator.emit_progress(PHASE_SAVING, parsed=totalRecords, total=totalRecords)
 
             searchQuery = Communicator.get_search_query()
             filename = f"{searchQuery} - GMS output"
@@ -61,12 +65,15 @@ class DataSaver:
                     else:
                         break
             if self.outputFormat == "excel":
-                dataFrame.to_excel(joinedPath, index=False)
+                # Written row by row, the workbook is never held in memory
+                exporter.write_xlsx(datalist, joinedPath, exporter.collect_columns(datalist))
             elif self.outputFormat == "csv":
-                dataFrame.to_csv(joinedPath, index=False)
+                with open(joinedPath, "wb") as csvFile:
+                    for chunk in exporter.iter_csv(datalist, exporter.collect_columns(datalist)):
+                        csvFile.write(chunk)
 
             elif self.outputFormat == "json":
-                dataFrame.to_json(joinedPath, indent=4, orient="records")
+                pd.DataFrame(datalist).to_json(joinedPath, indent=4, orient="records")
 
             Communicator.show_message(f"Hurrah! Scraped data successfully saved! Total records saved: {totalRecords}. If you're loving this free tool, consider fueling us with a coffee! Your support helps us keep democratizing automation. ☕️ Support us here: https://www.buymeacoffee.com/zubdata")
             
@@ -0,0 +1,98 @@
+"""
+This module contain the code for the job deadline.
+A job with a deadline splits it in stage budgets. A stage that runs out of time
+ends early and the job goes on with the next one, so it returns what it has
+in time, marked as partial
+"""
+
+import threading
+import time
+try:
+    from scraper.metrics import Metrics
+    from settings import STAGE_BUDGETS, EMAIL_BUDGET
+except ImportError:
+    from app.scraper.metrics import Metrics
+    from app.settings import STAGE_BUDGETS, EMAIL_BUDGET
+
+
+# Sequential stages of a job, in order
+STAGES = ("driver", "scroll", "parse")
+
+
+class Deadline:
+    """Per job, owned by its Backend. Without a deadline nothing ever runs out"""
+
+    def __init__(self, seconds=None, metrics=None):
+        """
+        seconds: the job may take, None for a job without a deadline
+        metrics: the job's metrics.Metrics, None for counters of its own
+        """
+        self.lock = threading.Lock()
+        self.metrics = metrics or Metrics()
+        self.total = seconds
+        self.jobEnd = time.time() + seconds if seconds else None
+        self.stage = None
+        self.stageEnd = None
+        self.emailSpent = 0  # seconds spent looking up emails
+        self.cutStages = []  # stages that ran out of time
+
+    def enter(self, stage):
+        """
+        Start the budget of a stage: its share of the time left for it and the stages
+        after it, so time an earlier stage did not use goes to the later ones
+        """
+        with self.lock:
+            if stage == self.stage:
+                return
+            self.stage = stage
+            if self.jobEnd is None:
+                return
+            later = STAGES[STAGES.index(stage):]
+            share = STAGE_BUDGETS[stage] / sum(STAGE_BUDGETS[name] for name in later)
+            self.stageEnd = time.time() + max(0, self.jobEnd - time.time()) * share
+
+    def remaining(self):
+        """Seconds left in the current stage, None without a deadline"""
+        if self.jobEnd is None:
+            return None
+        return max(0.0, min(self.jobEnd, self.stageEnd or self.jobEnd) - time.time())
+
+    def clamp(self, seconds):
+        """seconds, or what is left of the stage if that is less. For timeouts and sleeps"""
+        remaining = self.remaining()
+        return seconds if remaining is None else min(seconds, remaining)
+
+    def cut(self, stage):
+        with self.lock:
+            if stage in self.cutStages:
+                return
+            self.cutStages.append(stage)
+        self.metrics.increment("stages_cut")
+
+    def expired(self):
+        """True once the current stage is out of time. The stage is recorded as cut short"""
+        remaining = self.remaining()
+        if remaining is None or remaining > 0:
+            return False
+        self.cut(self.stage)
+        return True
+
+    def email_allowed(self):
+        """True while email lookups, which run within parsing, have time left of their share of the deadline"""
+        if self.jobEnd is None:
+            return True
+        if self.emailSpent < EMAIL_BUDGET * self.total and not self.expired():
+            return True
+        self.cut("email")
+        return False
+
+    def spend_email(self, seconds):
+        with self.lock:
+            self.emailSpent += seconds
+
+    def partial(self):
+        """True if a stage was cut short, so the results of the job are incomplete"""
+        return bool(self.cutStages)
+
+    def cut_stages(self):
+        return list(self.cutStages)
@@ -0,0 +1,118 @@
+"""
+This module contain the code for talking to Chrome through the DevTools protocol.
+It blocks heavy resources and counts the network traffic and driver round trips of a job
+"""
+
+import json
+try:
+    from settings import BLOCKED_URL_PATTERNS
+except ImportError:
+    from app.settings import BLOCKED_URL_PATTERNS
+
+
+def enable_performance_log(options):
+    """Make chromedriver record network events, so drain_network_events can read them"""
+    options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    options.add_experimental_option("perfLoggingPrefs", {"enableNetwork": True, "enablePage": False})
+
+
+def count_round_trips(driver, metrics):
+    """
+    Count every command sent to the driver (scripts, element reads, urls, logs...)
+    in the round_trips metric of the job's metrics.Metrics. Each one is a request to chromedriver, which costs
+    tens of milliseconds or more on a remote driver.
+    """
+    execute = driver.execute
+
+    def counted(driver_command, params=None):
+        metrics.increment("round_trips")
+        return execute(driver_command, params)
+
+    driver.execute = counted
+
+
+def block_requests(driver, patterns=None):
+    """
+    Block requests matching the patterns (default BLOCKED_URL_PATTERNS).
+    Blocked requests are never sent, so they cost no bandwidth or load time.
+    Returns False if the driver has no DevTools access, e.g. a remote driver.
+    """
+    patterns = BLOCKED_URL_PATTERNS if patterns is None else patterns
+    if not patterns:
+        return False
+
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(patterns)})
+    except Exception as e:
+        print(f"[DEBUG] Request blocking is not available: {e}")
+        return False
+
+    print(f"[DEBUG] Blocking {len(patterns)} URL patterns")
+    return True
+
+
+def drain_network_events(driver, metrics):
+    """
+    Read the network events recorded since the last call and add them to the
+    job's metrics.Metrics. The events are returned for callers that need them.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return []  # performance logging is not enabled for this driver
+
+    events = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, TypeError, ValueError):
+            continue
+
+        method = message.get("method", "")
+        if not method.startswith("Network."):
+            continue
+        params = message.get("params", {})
+
+        if method == "Network.loadingFailed":
+            if params.get("blockedReason"):
+                metrics.increment("blocked_requests")
+            else:
+                metrics.increment("failed_requests")
+        elif method == "Network.loadingFinished":
+            metrics.increment("loaded_requests")
+            metrics.increment("loaded_bytes", int(params.get("encodedDataLength", 0)))
+
+        events.append(message)
+
+    return events
+
+
+class ResponseWatcher:
+    """Collects the bodies of responses whose url contains one of the markers"""
+
+    def __init__(self, driver, markers):
+        self.driver = driver
+        self.markers = markers
+        self.pending = {}  # requestId -> url of a matching response still loading
+
+    def collect(self, events):
+        """Bodies of the matching responses that finished loading, as (url, body)"""
+        bodies = []
+        for event in events:
+            params = event.get("params", {})
+            if event.get("method") == "Network.responseReceived":
+                url = params.get("response", {}).get("url", "")
+                if any(marker in url for marker in self.markers):
+                    self.pending[params.get("requestId")] = url
+            elif event.get("method") == "Network.loadingFinished" and params.get("requestId") in self.pending:
+                url = self.pending.pop(params["requestId"])
+                try:
+                    body = self.driver.execute_cdp_cmd(
+                        "Network.getResponseBody", {"requestId": params["requestId"]}
+                    )
+                except Exception as e:
+                    print(f"[DEBUG] Could not read response of {url[:100]}: {e}")
+                    continue
+                bodies.append((url, body.get("body", "")))
+        return bodies
@@ -12,12 +12,19 @@ import time
 import random
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import json
 from dataclasses import dataclass
 from typing import List, Dict, Set, Optional
+try:
+    from scraper.navigation import is_retryable
+    from scraper.proxies import ProxyPool, chrome_argument, is_proxy_error
+except ImportError:
+    from app.scraper.navigation import is_retryable
+    from app.scraper.proxies import ProxyPool, chrome_argument, is_proxy_error
 
 
 @dataclass
@@ -42,6 +49,7 @@ class EmailScraper:
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        ProxyPool.route(self.session)
         
         # Common email patterns for different roles
         self.email_patterns = {
@@ -79,6 +87,10 @@ class EmailScraper:
             chrome_options.add_argument("--disable-blink-features=AutomationControlled")
             chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
             chrome_options.add_experimental_option('useAutomationExtension', False)
+            # A proxy of its own: Chrome cannot use the credentials the session's proxy may have
+            proxy = ProxyPool.choose(driver=True)
+            if proxy:
+                chrome_options.add_argument(chrome_argument(proxy))
 
             # Find Chrome executable
             chrome_path = self._find_chrome_executable()
@@ -97,6 +109,7 @@ class EmailScraper:
                 try:
                     print(f"[DEBUG] Email scraper trying {method_name}...")
                     self.driver = method(chrome_options)
+                    ProxyPool.assign(self.driver, proxy)
                     print(f"[DEBUG] Email scraper successfully initialized with {method_name}")
                     break
                 except Exception as e:
@@ -188,6 +201,17 @@ class EmailScraper:
         """Try to initialize without explicit service"""
         return webdriver.Chrome(options=options)
 
+    def open_url(self, url):
+        """Load the url in the driver, scoring the driver's proxy with the outcome"""
+        start_time = time.time()
+        try:
+            self.driver.get(url)
+        except WebDriverException as e:
+            if is_retryable(e):
+                ProxyPool.failure(self.driver)
+            raise
+        ProxyPool.success(self.driver, time.time() - start_time)
+
     def close_driver(self):
         """Close Selenium WebDriver"""
         if self.driver:
@@ -290,7 +314,7 @@ class EmailScraper:
             for i, query in enumerate(search_queries[:12]):  # Process first 12 queries
                 try:
                     print(f"🔍 Searching Google with query {i+1}/{min(12, len(search_queries))}: {query}")
-                    self.driver.get(f"https://www.google.com/search?q={query}")
+                    self.open_url(f"https://www.google.com/search?q={query}")
                     time.sleep(random.uniform(3, 6))
                     
                     # Get page source and extract emails directly from search results
@@ -526,7 +550,7 @@ class EmailScraper:
             for query in press_queries:
                 try:
                     print(f"🔍 Press search: {query}")
-                    self.driver.get(f"https://www.google.com/search?q={query}")
+                    self.open_url(f"https://www.google.com/search?q={query}")
                     time.sleep(random.uniform(2, 4))
                     
                     # Extract emails from search results
@@ -602,7 +626,10 @@ class EmailScraper:
             
             # Try with requests first (faster)
             try:
+                ProxyPool.route(self.session)
+                start_time = time.time()
                 response = self.session.get(url, timeout=15, allow_redirects=True)
+                ProxyPool.success(self.session, time.time() - start_time)
                 if response.status_code == 200:
                     content = response.text
                     print(f"Successfully fetched {url} with requests (status: {response.status_code})")
@@ -612,12 +639,14 @@ class EmailScraper:
                     
             except Exception as requests_error:
                 print(f"Requests failed for {url}: {requests_error}")
+                if is_proxy_error(requests_error):
+                    ProxyPool.failure(self.session)
                 # Fallback to Selenium if requests fails
                 try:
                     if not self.driver:
                         self.setup_driver()
                         
-                    self.driver.get(url)
+                    self.open_url(url)
                     time.sleep(3)  # Give time for page to load
                     content = self.driver.page_source
                     print(f"Successfully fetched {url} with Selenium")
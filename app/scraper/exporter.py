@@ -0,0 +1,122 @@
+"""
+This module contain the code for exporting scraped rows.
+Rows are written one by one, so an export never needs a full copy of the data
+"""
+
+import csv
+import io
+import json
+import zlib
+from itertools import islice
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+
+
+# Number of rows encoded before a chunk is handed to the caller
+CHUNK_ROWS = 500
+
+
+def snapshot(rows, length=None):
+    """
+    Freeze the current length of a row list that the scraper may still be appending to.
+    Only the first `length` (default len(rows)) rows are iterated, without copying them.
+    """
+    return islice(rows, len(rows) if length is None else length)
+
+
+def collect_columns(rows):
+    """Ordered union of keys over all rows (rows can have different keys)"""
+    columns = {}
+    for row in rows:
+        for key in row:
+            columns.setdefault(key, None)
+    return list(columns)
+
+
+def iter_csv(rows, columns):
+    """Yield a csv document as utf-8 chunks, header first"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+
+    for index, row in enumerate(rows, start=1):
+        writer.writerow(["" if row.get(column) is None else row.get(column) for column in columns])
+        if index % CHUNK_ROWS == 0:
+            yield buffer.getvalue().encode("utf-8")
+            buffer.seek(0)
+            buffer.truncate()
+
+    yield buffer.getvalue().encode("utf-8")
+
+
+def iter_jsonl(rows):
+    """Yield one json object per line as utf-8 chunks"""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row, ensure_ascii=False, default=str))
+        if len(lines) == CHUNK_ROWS:
+            yield ("\n".join(lines) + "\n").encode("utf-8")
+            lines = []
+
+    if lines:
+        yield ("\n".join(lines) + "\n").encode("utf-8")
+
+
+def iter_export(rows, file_format, length=None):
+    """Chunks of a csv or jsonl export of the first `length` rows of a row list"""
+    if file_format == "csv":
+        # The header needs every column, so take one cheap pass over the keys first
+        columns = collect_columns(snapshot(rows, length))
+        return iter_csv(snapshot(rows, length), columns)
+    return iter_jsonl(snapshot(rows, length))
+
+
+def gzip_chunks(chunks, level=6):
+    """Compress a stream of byte chunks into a gzip stream"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31 = gzip container
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def xlsx_value(value):
+    """Convert a row value to something openpyxl can store in a cell"""
+    if value is None or isinstance(value, (int, float, bool)):
+        return value
+    if not isinstance(value, str):
+        value = str(value)
+    return ILLEGAL_CHARACTERS_RE.sub("", value)
+
+
+def column_widths(rows, columns, max_width=50):
+    """Width of each column fitted to its longest value, capped at max_width"""
+    widths = [len(str(column)) for column in columns]
+    for row in rows:
+        for index, column in enumerate(columns):
+            value = row.get(column)
+            if value is not None:
+                widths[index] = max(widths[index], len(str(value)))
+    return [min(width + 2, max_width) for width in widths]
+
+
+def write_xlsx(rows, target, columns, sheet_name="Sheet1", widths=None):
+    """
+    Write rows to an xlsx file or file object.
+    openpyxl's write-only mode streams each row to disk, so memory stays
+    constant no matter how many rows are written.
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet(title=sheet_name)
+
+    if widths:
+        for index, width in enumerate(widths, start=1):
+            sheet.column_dimensions[get_column_letter(index)].width = width
+
+    sheet.append(columns)
+    for row in rows:
+        sheet.append([xlsx_value(row.get(column)) for column in columns])
+
+    workbook.save(target)
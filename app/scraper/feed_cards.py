@@ -0,0 +1,144 @@
+"""
+This module contain the code for reading search results from the feed cards.
+In list mode a job keeps what the cards show, so the fields of every card loaded
+by a scroll are read with one script call and no place is opened
+"""
+
+import re
+try:
+    from scraper.metrics import Metrics
+    from scraper.place_state import coordinates_from_url
+    from scraper.placekey import place_key
+except ImportError:
+    from app.scraper.metrics import Metrics
+    from app.scraper.place_state import coordinates_from_url
+    from app.scraper.placekey import place_key
+
+
+# Returns the cards of the feed from index arguments[1] on, as plain objects.
+# Cards are only appended while scrolling, so earlier ones are not read again
+CARDS_SCRIPT = """
+var feed = arguments[0];
+var start = arguments[1];
+var anchors = feed ? feed.querySelectorAll('a.hfpxzc') : [];
+var cards = [];
+for (var i = start; i < anchors.length; i++) {
+    var anchor = anchors[i];
+    var card = anchor.closest('.Nv2PK') || anchor.parentElement;
+    var rating = card.querySelector('.MW4etd');
+    var reviews = card.querySelector('.UY7F9');
+    var website = card.querySelector('a[data-value="Website"]');
+    var lines = [];
+    card.querySelectorAll('.W4Efsd').forEach(function (line) {
+        if (!line.querySelector('.W4Efsd') && !line.querySelector('.MW4etd')) {
+            lines.push(line.innerText);
+        }
+    });
+    cards.push({
+        name: anchor.getAttribute('aria-label'),
+        url: anchor.href,
+        rating: rating ? rating.innerText : null,
+        reviews: reviews ? reviews.innerText : null,
+        website: website ? website.href : null,
+        lines: lines
+    });
+}
+return cards;
+"""
+
+# Icons of the card (e.g. wheelchair access) are private use characters
+ICON_PATTERN = r"[\ue000-\uf8ff]"
+
+PHONE_PATTERN = r"^\+?[\d\s()-]{7,}$"
+
+
+def to_number(text, kind):
+    """4.5 from '4.5', 1234 from '(1,234)'. None if the text is not a number"""
+    try:
+        return kind(re.sub(r"[(),\s]", "", text or ""))
+    except ValueError:
+        return None
+
+
+def line_parts(line):
+    """Parts of a card line, which are separated by '·'"""
+    line = re.sub(ICON_PATTERN, "", line or "")
+    return [part.strip() for part in line.split("·") if part.strip()]
+
+
+def card_row(card):
+    """Map a card of CARDS_SCRIPT to the output columns. Missing values are None"""
+    lines = [line_parts(line) for line in card.get("lines") or []]
+    lines = [parts for parts in lines if parts]
+
+    # The first line is "Category · Address", the next "Open · Closes 11 PM · Phone"
+    category = lines[0][0] if lines else None
+    address = lines[0][-1] if lines and len(lines[0]) > 1 else None
+    phone = None
+    for parts in lines[1:]:
+        if re.match(PHONE_PATTERN, parts[-1]):
+            phone = parts[-1]
+            break
+
+    # Open and closing times are not kept, only closures
+    status = None
+    for parts in lines[1:]:
+        if "closed" in parts[0].lower() and parts[0].lower() != "closed":
+            status = parts[0]
+            break
+
+    latitude, longitude = coordinates_from_url(card.get("url"))
+    return {
+        "Category": category,
+        "Name": card.get("name"),
+        "Phone": phone,
+        "Website": card.get("website"),
+        "Business Status": status,
+        "Address": address,
+        "Total Reviews": to_number(card.get("reviews"), int),
+        "Rating": to_number(card.get("rating"), float),
+        "Google Maps URL": card.get("url"),
+        "Latitude": latitude,
+        "Longitude": longitude,
+        "Place Key": place_key(card.get("url")),
+    }
+
+
+class FeedCards:
+    def __init__(self, driver, metrics=None):
+        """metrics: the job's metrics.Metrics, None for counters of its own"""
+        self.driver = driver
+        self.metrics = metrics or Metrics()
+        self.count = 0  # cards read so far
+        self.rows = {}  # place key (or url) -> columns of a card, in feed order
+
+    def collect(self, feed):
+        """Read the cards loaded since the last call. Returns the number of new cards"""
+        try:
+            cards = self.driver.execute_script(CARDS_SCRIPT, feed, self.count) or []
+        except Exception as e:
+            print(f"[DEBUG] Reading feed cards failed: {e}")
+            return 0
+
+        self.count += len(cards)
+        for card in cards:
+            row = card_row(card)
+            key = row["Place Key"] or row["Google Maps URL"]
+            if key and row["Name"]:
+                self.rows.setdefault(key, row)
+
+        self.metrics.set("card_results", len(self.rows))
+        return len(cards)
+
+    def merge(self, capturedRows):
+        """
+        One row per result: captured search rows (keyed by place key) completed
+        with the card fields they miss, then the cards that were not captured
+        """
+        merged = []
+        for key, captured in capturedRows.items():
+            row = dict(self.rows.get(key, {}))
+            row.update({key: value for key, value in captured.items() if value is not None})
+            merged.append(row)
+        merged.extend(row for key, row in self.rows.items() if key not in capturedRows)
+        return merged
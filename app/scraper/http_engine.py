@@ -0,0 +1,312 @@
+"""
+This module contain the code for the http engine.
+It gets search results and place details from plain HTTP responses of Maps urls,
+without a browser. Places it cannot complete are handed back for the browser
+"""
+
+import html
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import quote_plus
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+try:
+    from scraper.communicator import Communicator
+    from scraper.common import Common
+    from scraper.metrics import Metrics
+    from scraper.deadline import Deadline
+    from scraper import blocking
+    from scraper.rate import RateController
+    from scraper.proxies import ProxyPool
+    from scraper.parser import OUTPUT_COLUMNS
+    from scraper.progress import PHASE_NAVIGATING, PHASE_SCROLLING, PHASE_PARSING
+    from scraper import place_state
+    from scraper.search_capture import SearchCapture
+    from scraper import tiling
+    from scraper.place_cache import PlaceCache, plan_refresh
+    from settings import HTTP_ENGINE_WORKERS, HTTP_ENGINE_MAX_PAGES, DEFAULT_MODE, LIST_MODE_DETAIL_MISSING
+    from settings import INCREMENTAL_REFRESH
+except ImportError:
+    from app.scraper.communicator import Communicator
+    from app.scraper.common import Common
+    from app.scraper.metrics import Metrics
+    from app.scraper.deadline import Deadline
+    from app.scraper import blocking
+    from app.scraper.rate import RateController
+    from app.scraper.proxies import ProxyPool
+    from app.scraper.parser import OUTPUT_COLUMNS
+    from app.scraper.progress import PHASE_NAVIGATING, PHASE_SCROLLING, PHASE_PARSING
+    from app.scraper import place_state
+    from app.scraper.search_capture import SearchCapture
+    from app.scraper import tiling
+    from app.scraper.place_cache import PlaceCache, plan_refresh
+    from app.settings import HTTP_ENGINE_WORKERS, HTTP_ENGINE_MAX_PAGES, DEFAULT_MODE, LIST_MODE_DETAIL_MISSING
+    from app.settings import INCREMENTAL_REFRESH
+
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Cookie of an answered consent dialog, so EU requests are not sent to consent.google.com
+CONSENT_COOKIE = ("SOCS", "CAESEwgDEgk0ODE3Nzk3MjQaAmVuIAEaBgiA_LyaBg")
+
+# The search page preloads its first results request, which is paged with !8i<offset>
+SEARCH_PRELOAD_PATTERN = r'<link[^>]+href="(/search\?tbm=map[^"]+)"'
+
+EMAIL_PATTERN = r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9-]+\.[a-zA-Z]{2,}"
+
+REQUEST_TIMEOUT = 15
+
+
+def page_url(preloadPath, offset):
+    """Url of the search results page starting at offset, or None if the request cannot be paged"""
+    if re.search(r"!8i\d+", preloadPath):
+        path = re.sub(r"!8i\d+", f"!8i{offset}", preloadPath)
+    elif re.search(r"!7i\d+", preloadPath):
+        path = re.sub(r"(!7i\d+)", rf"\g<1>!8i{offset}", preloadPath, count=1)
+    else:
+        return None
+    return "https://www.google.com" + path
+
+
+class HttpEngine:
+    def __init__(self, searchquery, workers=HTTP_ENGINE_WORKERS, mode=DEFAULT_MODE, bbox=None, deadline=None,
+                 cache=None, metrics=None):
+        """
+        bbox: tiling.Tile of an area to search tile by tile, or None for one search
+        deadline: the job's deadline.Deadline, None for no deadline
+        cache: place_cache.PlaceCache parsed places are reused from and kept in, None for no cache
+        metrics: the job's metrics.Metrics, None for counters of its own
+        """
+        self.searchquery = searchquery
+        self.deadline = deadline or Deadline()
+        self.metrics = metrics or Metrics()
+        self.workers = workers
+        self.mode = mode
+        self.bbox = bbox
+        self.cache = cache
+        if self.cache is None and INCREMENTAL_REFRESH:
+            self.cache = PlaceCache(metrics=self.metrics)  # a refresh reads and fills the cache
+
+        # One pooled session, with a connection per worker
+        self.session = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=workers,
+            pool_maxsize=workers,
+            max_retries=Retry(total=2, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504)),
+        )
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers.update(HEADERS)
+        self.session.cookies.set(*CONSENT_COOKIE, domain=".google.com")
+        ProxyPool.route(self.session)
+
+    def get(self, url):
+        """Response of a Maps url, paced with the browser's navigations"""
+        RateController.acquire(self.deadline)
+        ProxyPool.route(self.session)  # another proxy if the session's one was evicted
+        self.metrics.increment("http_requests")
+        startTime = time.time()
+        try:
+            response = self.session.get(url, timeout=REQUEST_TIMEOUT)
+        except requests.RequestException:
+            RateController.failure()
+            ProxyPool.failure(self.session)
+            raise
+        try:
+            if response.status_code == 429:
+                blocking.raise_if_blocked(blocking.PAGE_UNUSUAL_TRAFFIC, url, self.metrics)
+            blocking.raise_if_blocked(blocking.classify_url(response.url), response.url, self.metrics)
+        except blocking.BlockedError:
+            ProxyPool.blocked(self.session)
+            raise
+        if response.status_code >= 500:
+            RateController.failure()
+            ProxyPool.failure(self.session)
+        response.raise_for_status()
+        RateController.success(time.time() - startTime)
+        ProxyPool.success(self.session, time.time() - startTime)
+        self.metrics.increment("http_bytes", len(response.content))
+        return response
+
+    def search(self, tile=None):
+        """
+        Rows of all search results (within the tile's viewport if one is given), in result order.
+        Returns None if the search page could not be read without a browser.
+        """
+        if tile is None:
+            url = f"https://www.google.com/maps/search/{quote_plus(self.searchquery)}?hl=en&gl=US"
+        else:
+            url = tiling.search_url(self.searchquery, tile)
+        try:
+            page = self.get(url).text
+        except blocking.BlockedError:
+            raise
+        except Exception as e:
+            Communicator.show_message(f"[DEBUG] HTTP search failed: {e}")
+            return None
+
+        capture = SearchCapture(driver=None, metrics=self.metrics)
+        firstPage = place_state.dig(place_state.state_from_html(page), 3, 2)
+        if not isinstance(firstPage, str) or not capture.add_payload(firstPage):
+            Communicator.show_message("[DEBUG] HTTP search page has no results payload")
+            return None
+        if tile is None:  # tiles are reported by the planner
+            Communicator.emit_progress(PHASE_SCROLLING, found=len(capture.rows))
+
+        preload = re.search(SEARCH_PRELOAD_PATTERN, page)
+        preloadPath = html.unescape(preload.group(1)) if preload else None
+
+        for pageIndex in range(1, HTTP_ENGINE_MAX_PAGES):
+            if preloadPath is None or Common.close_thread_is_set() or self.deadline.expired():
+                break
+            nextUrl = page_url(preloadPath, len(capture.rows))
+            if nextUrl is None:
+                break
+            try:
+                added = capture.add_payload(self.get(nextUrl).text)
+            except blocking.BlockedError:
+                raise
+            except Exception as e:
+                Communicator.show_message(f"[DEBUG] HTTP results page {pageIndex + 1} failed: {e}")
+                break
+            if not added:
+                break  # end of the results
+            if tile is None:
+                Communicator.show_message(f"Total locations found: {len(capture.rows)}")
+                Communicator.emit_progress(PHASE_SCROLLING, found=len(capture.rows))
+
+        return list(capture.rows.values())
+
+    def fetch_place(self, row):
+        """
+        Complete a search result row from its place page.
+        Returns the completed row, or None if the place needs the browser.
+        """
+        cached = self.cache.get(row.get("Place Key")) if self.cache else None
+        if cached is not None:
+            return {column: cached.get(column) for column in OUTPUT_COLUMNS}
+
+        url = row["Google Maps URL"]
+        try:
+            record = place_state.record_from_response(self.get(url + "?hl=en&gl=US").text)
+        except blocking.BlockedError:
+            raise
+        except Exception as e:
+            print(f"[DEBUG] HTTP place request failed: {e}")
+            return None
+        if record is None or not place_state.matches_url(record, url):
+            return None
+
+        data = dict(row)
+        for key, value in place_state.map_record(record).items():
+            if value is not None:
+                data[key] = value
+        if not all(data.get(field) for field in place_state.REQUIRED_FIELDS):
+            return None
+
+        if data.get("Website"):
+            data["Email"] = self.find_mail(data["Website"])
+        data = {column: data.get(column) for column in OUTPUT_COLUMNS}
+        if self.cache:
+            self.cache.put(data)
+        return data
+
+    def find_mail(self, url):
+        """Emails on a website's home or contact page, or "" once email lookups are out of time"""
+        if not self.deadline.email_allowed():
+            return ""
+        startTime = time.time()
+        try:
+            return self.search_mail(url)
+        finally:
+            self.deadline.spend_email(time.time() - startTime)
+
+    def search_mail(self, url):
+        for pageUrl in (url, url.rstrip("/") + "/contact/"):
+            try:
+                self.metrics.increment("http_requests")
+                text = self.session.get(pageUrl, timeout=REQUEST_TIMEOUT).text
+            except Exception:
+                continue
+            emails = set(re.findall(EMAIL_PATTERN, text))
+            if emails:
+                return ", ".join(sorted(emails))
+        return ""
+
+    def run(self):
+        """
+        Scrape the search query.
+        Returns (rows, links of places that need the browser), or (None, None)
+        if the search itself needs the browser.
+        """
+        Communicator.emit_progress(PHASE_NAVIGATING)
+        Communicator.show_message("Fetching search results over HTTP...")
+        self.deadline.enter("scroll")
+        if self.bbox is not None:
+            results = tiling.TilePlanner(self.bbox, self.search, deadline=self.deadline, metrics=self.metrics).run()
+        else:
+            results = self.search()
+        if results is None:
+            return None, None
+
+        total = len(results)
+        rows, fallbackLinks = [], []
+
+        # List mode keeps the search rows, and only fetches the ones missing a required field
+        if self.mode == "list":
+            toFetch = []
+            for row in results:
+                if LIST_MODE_DETAIL_MISSING and not all(row.get(field) for field in place_state.REQUIRED_FIELDS):
+                    toFetch.append(row)
+                    continue
+                rows.append({column: row.get(column) for column in OUTPUT_COLUMNS})
+                Communicator.add_extracted_row(rows[-1])
+            Communicator.show_message(f"Collected {len(rows)} places from the search results")
+            if not toFetch:
+                return rows, fallbackLinks
+            results = toFetch
+
+        # A refresh carries forward the places whose card did not change, and only fetches the others
+        elif INCREMENTAL_REFRESH:
+            carried, links = plan_refresh(results, self.cache)
+            Communicator.show_message(f"{len(carried)} places are unchanged since the last run, {len(links)} will be fetched")
+            for row in carried:
+                rows.append({column: row.get(column) for column in OUTPUT_COLUMNS})
+                Communicator.add_extracted_row(rows[-1])
+            links = set(links)
+            results = [row for row in results if row["Google Maps URL"] in links]
+
+        self.deadline.enter("parse")
+        Communicator.show_message(f"Found {total} results. Fetching details of {len(results)} places...")
+        Communicator.emit_progress(PHASE_PARSING, found=total, parsed=len(rows), total=total)
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            futures = {pool.submit(self.fetch_place, row): row for row in results}
+            for future in as_completed(futures):
+                if Common.close_thread_is_set() or self.deadline.expired():
+                    for pending in futures:
+                        pending.cancel()
+                    break
+
+                try:
+                    row = future.result()
+                except blocking.BlockedError:
+                    for pending in futures:
+                        pending.cancel()
+                    raise
+                if row is None:
+                    fallbackLinks.append(futures[future]["Google Maps URL"])
+                    self.metrics.increment("http_fallback_places")
+                    continue
+
+                rows.append(row)
+                self.metrics.increment("http_places")
+                Communicator.add_extracted_row(row)
+                Communicator.emit_progress(PHASE_PARSING, found=total, parsed=len(rows), total=total)
+
+        return rows, fallbackLinks
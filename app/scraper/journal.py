@@ -0,0 +1,100 @@
+"""
+This module contain the code for the job journal.
+A job appends the links it is going to open and every parsed row to a local
+file as it goes, so a job cut short by a crash or a restart can be resumed
+without opening the places it already parsed
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+try:
+    from scraper.placekey import place_key
+    from settings import JOURNAL_DIR
+except ImportError:
+    from app.scraper.placekey import place_key
+    from app.settings import JOURNAL_DIR
+
+
+def row_key(row):
+    """Key a journaled row is recognized by: its place key, else its url"""
+    return row.get("Place Key") or place_key(row.get("Google Maps URL")) or row.get("Google Maps URL")
+
+
+class Journal:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.file = None  # opened on the first record, so jobs with nothing to journal leave no file
+        self.keys = set()  # keys of the journaled rows
+
+    @classmethod
+    def for_job(cls, searchquery, engine, mode, bbox=None, folder=JOURNAL_DIR):
+        """Journal of a job. The same query, engine, mode and area always get the same file"""
+        job = json.dumps([searchquery.strip().lower(), engine, mode, str(bbox or "")])
+        digest = hashlib.sha1(job.encode("utf-8")).hexdigest()[:12]
+        name = re.sub(r"\W+", "_", searchquery.strip().lower())[:40].strip("_")
+        return cls(os.path.join(folder, f"{name}-{digest}.jsonl"))
+
+    def load(self):
+        """
+        (rows, links) recorded by an earlier run of the job. The last line of a run
+        that was killed while writing it is skipped
+        """
+        rows, links = {}, []
+        if not os.path.exists(self.path):
+            return [], []
+
+        with open(self.path, encoding="utf-8") as journal:
+            for line in journal:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                if record.get("links"):
+                    links.extend(record["links"])
+                if record.get("row"):
+                    rows[row_key(record["row"])] = record["row"]
+
+        self.keys.update(rows)
+        return list(rows.values()), list(dict.fromkeys(links))
+
+    def __write(self, record):
+        if self.file is None:
+            folder = os.path.dirname(self.path)
+            if folder and not os.path.exists(folder):
+                os.makedirs(folder)
+            self.file = open(self.path, "a", encoding="utf-8")
+        self.file.write(json.dumps(record, default=str) + "\n")
+        self.file.flush()
+        os.fsync(self.file.fileno())  # a record must survive the container going away
+
+    def add_links(self, links):
+        with self.lock:
+            if links:
+                self.__write({"links": list(links)})
+
+    def add_rows(self, rows):
+        """Record the rows that are not journaled yet"""
+        with self.lock:
+            for row in rows:
+                key = row_key(row)
+                if key in self.keys:
+                    continue
+                self.keys.add(key)
+                self.__write({"row": row})
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def clear(self):
+        """Delete the journal: the job completed, or starts over"""
+        self.close()
+        self.keys = set()
+        if os.path.exists(self.path):
+            os.remove(self.path)
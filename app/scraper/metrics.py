@@ -0,0 +1,36 @@
+"""
+This module contain the code for job metrics.
+Every Backend owns the counters of its job and passes them to the parts working
+for it, like its deadline, so jobs running at the same time keep their own.
+The parts shared by all jobs (rate controller, circuit breaker, proxy pool)
+count in PROCESS_METRICS, which is never reset
+"""
+
+import threading
+
+
+class Metrics:
+    def __init__(self):
+        self.counters = {}
+        self.lock = threading.Lock()
+
+    def increment(self, name, amount=1):
+        with self.lock:
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set(self, name, value):
+        with self.lock:
+            self.counters[name] = value
+
+    def get(self, name, default=0):
+        with self.lock:
+            return self.counters.get(name, default)
+
+    def snapshot(self):
+        """Copy of all counters, safe to serialize while the job keeps running"""
+        with self.lock:
+            return dict(self.counters)
+
+
+# Counters of the parts shared by all jobs of the process
+PROCESS_METRICS = Metrics()
@@ -0,0 +1,106 @@
+"""
+This module contain the code for bounded navigation retries.
+Navigation errors are classified as retryable or fatal, retryable ones are tried
+again with exponential backoff and jitter, and a circuit breaker shared by every
+job of the process pauses navigation while most of the recent ones fail (e.g. during a block)
+"""
+
+import random
+import threading
+import time
+from collections import deque
+try:
+    from scraper.common import Common
+    from scraper.metrics import PROCESS_METRICS
+    from scraper.supervisor import is_driver_failure
+    from settings import NAVIGATION_BACKOFF, NAVIGATION_BACKOFF_MAX
+    from settings import BREAKER_WINDOW, BREAKER_FAILURE_RATE, BREAKER_COOLDOWN, BREAKER_COOLDOWN_MAX
+except ImportError:
+    from app.scraper.common import Common
+    from app.scraper.metrics import PROCESS_METRICS
+    from app.scraper.supervisor import is_driver_failure
+    from app.settings import NAVIGATION_BACKOFF, NAVIGATION_BACKOFF_MAX
+    from app.settings import BREAKER_WINDOW, BREAKER_FAILURE_RATE, BREAKER_COOLDOWN, BREAKER_COOLDOWN_MAX
+
+
+# Errors retrying cannot fix: the url itself is wrong
+FATAL_ERRORS = (
+    "invalid argument",
+    "unsupported protocol",
+    "err_invalid_url",
+    "err_unsafe_port",
+)
+
+
+def is_retryable(error):
+    """False for errors of a dead driver or a bad url, True for the transient ones (timeouts, network)"""
+    text = str(error).lower()
+    return not is_driver_failure(error) and not any(fatal in text for fatal in FATAL_ERRORS)
+
+
+def backoff_delay(attempt, base=NAVIGATION_BACKOFF, cap=NAVIGATION_BACKOFF_MAX):
+    """Seconds to wait after the attempt-th failure (from 0): exponential, half of it random"""
+    delay = min(cap, base * 2 ** attempt)
+    return delay / 2 + random.uniform(0, delay / 2)
+
+
+class CircuitBreaker:
+    """
+    Per process, like RateController: the jobs share the IP Google judges. Opens when
+    at least BREAKER_FAILURE_RATE of the last BREAKER_WINDOW navigations failed. While
+    open, navigations wait for the cooldown, which doubles each time a trial navigation
+    after it fails again
+    """
+
+    lock = threading.Lock()
+    outcomes = deque(maxlen=BREAKER_WINDOW)  # True for a successful navigation
+    openUntil = 0
+    cooldown = BREAKER_COOLDOWN
+
+    @classmethod
+    def reset(cls):
+        with cls.lock:
+            cls.outcomes = deque(maxlen=BREAKER_WINDOW)
+            cls.openUntil = 0
+            cls.cooldown = BREAKER_COOLDOWN
+
+    @classmethod
+    def wait(cls, deadline=None):
+        """
+        Block while the breaker is open, at most until the stage of the job's deadline
+        runs out or the scraping is stopped. Returns the seconds waited
+        """
+        with cls.lock:
+            delay = cls.openUntil - time.time()
+        if deadline is not None:
+            delay = deadline.clamp(delay)
+        if delay <= 0:
+            return 0
+        print(f"[DEBUG] Too many navigations failed, pausing navigation for {delay:.0f} seconds")
+        startTime = time.time()
+        Common.sleep(delay)
+        waited = time.time() - startTime
+        PROCESS_METRICS.increment("breaker_wait_seconds", round(waited, 1))
+        return waited
+
+    @classmethod
+    def record(cls, success):
+        with cls.lock:
+            trial = cls.openUntil > 0  # first navigations after a cooldown
+            if success:
+                if trial:
+                    # The trial went through: close the breaker
+                    cls.outcomes.clear()
+                    cls.openUntil = 0
+                    cls.cooldown = BREAKER_COOLDOWN
+                cls.outcomes.append(True)
+                return
+
+            cls.outcomes.append(False)
+            failures = cls.outcomes.count(False)
+            if trial:
+                cls.cooldown = min(cls.cooldown * 2, BREAKER_COOLDOWN_MAX)
+            elif len(cls.outcomes) < cls.outcomes.maxlen or failures < BREAKER_FAILURE_RATE * len(cls.outcomes):
+                return
+            cls.openUntil = time.time() + cls.cooldown
+        PROCESS_METRICS.increment("breaker_trips")
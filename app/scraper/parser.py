@@ -5,21 +5,127 @@ try:
     from scraper.datasaver import DataSaver
     from scraper.base import Base
     from scraper.common import Common
+    from scraper.progress import PHASE_PARSING
+    from scraper.metrics import Metrics
+    from scraper import devtools
+    from scraper import place_state
+    from scraper.placekey import data_id_from_url, place_key, unique_links
+    from scraper.supervisor import DriverSupervisor
+    from scraper.deadline import Deadline
+    from scraper import blocking
+    from scraper.rate import RateController
+    from scraper.proxies import ProxyPool, is_proxy_error
+    from settings import CAPTURE_PLACE_RESPONSES, PLACE_CAPTURE_TIMEOUT
+    from settings import PLACE_NAVIGATION, CLICK_NAVIGATION_TIMEOUT, CLICK_NAVIGATION_MAX_FAILURES
 except ImportError:
     from app.scraper.error_codes import ERROR_CODES
     from app.scraper.communicator import Communicator
     from app.scraper.datasaver import DataSaver
     from app.scraper.base import Base
     from app.scraper.common import Common
+    from app.scraper.progress import PHASE_PARSING
+    from app.scraper.metrics import Metrics
+    from app.scraper import devtools
+    from app.scraper import place_state
+    from app.scraper.placekey import data_id_from_url, place_key, unique_links
+    from app.scraper.supervisor import DriverSupervisor
+    from app.scraper.deadline import Deadline
+    from app.scraper import blocking
+    from app.scraper.rate import RateController
+    from app.scraper.proxies import ProxyPool, is_proxy_error
+    from app.settings import CAPTURE_PLACE_RESPONSES, PLACE_CAPTURE_TIMEOUT
+    from app.settings import PLACE_NAVIGATION, CLICK_NAVIGATION_TIMEOUT, CLICK_NAVIGATION_MAX_FAILURES
 import requests
 import re
+import time
+from collections import deque
+
+
+# Columns of a parsed place, in output order
+OUTPUT_COLUMNS = [
+    "Category",
+    "Name",
+    "Phone",
+    "Website",
+    "Email",
+    "Business Status",
+    "Address",
+    "Total Reviews",
+    "Booking Links",
+    "Rating",
+    "Hours",
+    "Google Maps URL",
+    "Latitude",
+    "Longitude",
+    "Place ID",
+    "Place Key",
+]
+
+# Responses that carry a place record: the place page itself and the preview
+# request Maps makes when a place is opened from within the app
+PLACE_URL_MARKERS = ("/maps/place/", "/maps/preview/place")
+
+# Clicks the result card whose link contains arguments[0] and returns its name,
+# or null if the card is not in the results
+CLICK_CARD_SCRIPT = """
+var anchors = document.querySelectorAll('a.hfpxzc');
+for (var i = 0; i < anchors.length; i++) {
+    if (anchors[i].href.indexOf(arguments[0]) >= 0) {
+        anchors[i].scrollIntoView({block: 'center'});
+        anchors[i].click();
+        return anchors[i].getAttribute('aria-label') || '';
+    }
+}
+return null;
+"""
+
+# Routes the loaded app to the url through its own history, like its back button does
+HISTORY_SCRIPT = """
+history.pushState(null, '', arguments[0]);
+window.dispatchEvent(new PopStateEvent('popstate', {state: null}));
+"""
+
+# Name of the place shown in the details pane (null while it renders) and the current url
+PANE_SCRIPT = """
+var pane = document.querySelector('div[role="main"][aria-label]');
+var title = pane && pane.querySelector('h1');
+return [title ? pane.getAttribute('aria-label') : null, location.href];
+"""
+
+
+def same_place(data, url, currentUrl):
+    """
+    For a link without a data id, whether the place the app opened is the link's: the
+    record's coordinates are the link's, or the app still shows the link itself
+    """
+    latitude, longitude = place_state.coordinates_from_url(url)
+    if latitude is not None and data.get("Latitude") is not None:
+        return abs(data["Latitude"] - latitude) < 1e-4 and abs(data["Longitude"] - longitude) < 1e-4
+    return (currentUrl or "").split("?")[0].rstrip("/") == url.split("?")[0].rstrip("/")
 
 
 class Parser(Base):
 
-    def __init__(self, driver) -> None:
+    def __init__(self, driver, deadline=None, cache=None, journal=None, metrics=None) -> None:
+        """
+        deadline: the job's deadline.Deadline, None for no deadline
+        cache: place_cache.PlaceCache parsed places are reused from and kept in, None for no cache
+        journal: the job's journal.Journal links and parsed rows are recorded in, None for no journal
+        metrics: the job's metrics.Metrics, None for counters of its own
+        """
         self.driver = driver
+        self.metrics = metrics or Metrics()
+        self.deadline = deadline or Deadline(metrics=self.metrics)
         self.finalData = []
+        self.clickNavigation = PLACE_NAVIGATION == "click"
+        self.clickFailures = 0  # in a row
+        self.resultsUrl = None  # search results places are clicked from
+        self.onResults = False  # the driver shows them, no place was loaded in their place
+        self.cache = cache
+        self.journal = journal
+        self.checkpointed = 0  # rows of finalData already in the journal
+        self.deadLetters = []  # places given up by the last main()
+        self.session = requests.Session()  # for email lookups, through a proxy of the pool
         self.comparing_tool_tips = {
             "location": "Copy address",
             "phone": "Copy phone number", 
@@ -74,16 +180,193 @@ class Parser(Base):
     def init_data_saver(self):
         self.data_saver = DataSaver()
 
-    def parse(self):
-        """Our function to parse the html"""
+    def capture_place(self, url):
+        """
+        Start loading a place and return its columns as soon as a response with
+        its record arrives, without waiting for the page to render.
+        Returns None if no usable response arrived within PLACE_CAPTURE_TIMEOUT.
+        """
+        watcher = devtools.ResponseWatcher(self.driver, PLACE_URL_MARKERS)
+        devtools.drain_network_events(self.driver, self.metrics)  # leftovers of the previous place
+
+        try:
+            # Unlike driver.get, Page.navigate returns as soon as the navigation starts
+            self.driver.execute_cdp_cmd("Page.navigate", {"url": url})
+        except Exception as e:
+            print(f"[DEBUG] Place capture is not available: {e}")
+            return None
+
+        deadline = time.time() + PLACE_CAPTURE_TIMEOUT
+        while time.time() < deadline:
+            if Common.close_thread_is_set():
+                return None
+
+            for responseUrl, body in watcher.collect(devtools.drain_network_events(self.driver, self.metrics)):
+                record = place_state.record_from_response(body)
+                if record is None or not place_state.matches_url(record, url):
+                    continue
+
+                try:
+                    # Tiles, scripts and the rest of the page are not needed anymore
+                    self.driver.execute_cdp_cmd("Page.stopLoading", {})
+                except Exception:
+                    pass
+
+                data = place_state.map_record(record)
+                data["Google Maps URL"] = url
+                if data["Latitude"] is None:
+                    data["Latitude"], data["Longitude"] = place_state.coordinates_from_url(url)
+                return data
+
+            time.sleep(0.05)
+
+        return None
+
+    def open_in_app(self, url):
+        """
+        Open a place within the loaded Maps app: click its result card, or route the
+        app's history to it, and wait for the details pane to show it.
+        Returns the place record's columns from the response Maps fetched (empty if
+        none was usable), or None if the place did not open.
+        """
+        dataId = data_id_from_url(url)
+        watcher = devtools.ResponseWatcher(self.driver, PLACE_URL_MARKERS)
+        try:
+            devtools.drain_network_events(self.driver, self.metrics)  # leftovers of the previous place
+            previousName = self.driver.execute_script(PANE_SCRIPT)[0]
+            name = self.driver.execute_script(CLICK_CARD_SCRIPT, dataId) if dataId else None
+            if name is None:
+                self.driver.execute_script(HISTORY_SCRIPT, url)
+        except Exception as e:
+            print(f"[DEBUG] In-app navigation failed: {e}")
+            return None
+
+        # The page's embedded state still belongs to the search, so the record
+        # can only come from the response of the place
+        data = {}
+        deadline = time.time() + CLICK_NAVIGATION_TIMEOUT
+        while time.time() < deadline:
+            if Common.close_thread_is_set():
+                return None
+
+            try:
+                for responseUrl, body in watcher.collect(devtools.drain_network_events(self.driver, self.metrics)):
+                    record = place_state.record_from_response(body)
+                    if record is not None and place_state.matches_url(record, url):
+                        data = place_state.map_record(record)
+                paneName, currentUrl = self.driver.execute_script(PANE_SCRIPT)
+            except Exception as e:
+                print(f"[DEBUG] In-app navigation failed: {e}")
+                return None
+
+            opened = paneName and (paneName == name or paneName != previousName)
+            if dataId is None:
+                # Places may share a name, only the record or the url tells them apart
+                opened = opened and same_place(data, url, currentUrl)
+            if opened and (dataId is None or dataId in currentUrl):
+                data["Google Maps URL"] = url
+                if data.get("Latitude") is None:
+                    data["Latitude"], data["Longitude"] = place_state.coordinates_from_url(url)
+                return data
+
+            time.sleep(0.05)
+
+        return None
+
+    def restore_results(self):
+        """Load the search results again after a place was loaded in their place, so places open from them"""
+        try:
+            self.openingurl(url=self.resultsUrl)
+            self.onResults = True
+        except Exception as e:
+            print(f"[DEBUG] Search results could not be loaded again: {e}")
+            Communicator.show_message("[DEBUG] The search results are gone, loading each place instead")
+            self.clickNavigation = False
+
+    def click_failed(self):
+        """Count a place that did not open in the app, and stop clicking after too many in a row"""
+        self.metrics.increment("click_navigation_fallbacks")
+        self.clickFailures += 1
+        if self.clickFailures >= CLICK_NAVIGATION_MAX_FAILURES:
+            Communicator.show_message("[DEBUG] Places do not open from the results, loading each place instead")
+            self.clickNavigation = False
+
+    def parse(self, data=None):
+        """
+        Parse the open place. The page's structured data (or the captured record
+        passed as data) is used first and the details sheet html is only parsed
+        for the fields the record lacks (see place_state.DOM_FIELDS).
+        """
+        page = {"html": None, "url": None}
+        if data is None:
+            page = place_state.snapshot(self.driver)
+            data = page["data"]
+            if not data:
+                # Known from the url the snapshot returns, without another round trip
+                blocking.raise_if_blocked(blocking.classify_url(page["url"]), page["url"], self.metrics)
+        domWebsite = None
+
+        trusted = all(data.get(field) for field in place_state.REQUIRED_FIELDS)
+        self.metrics.increment("structured_places" if trusted else "dom_fallback_places")
+        missing = [field for field in place_state.DOM_FIELDS if not data.get(field)]
+        if missing:
+            # Fall back to the html for every field the record did not have
+            domData = self.parse_dom(sheetHtml=page["html"], url=page["url"])
+            if domData is None and not trusted:
+                return
+            domData = domData or {}
+            domWebsite = domData.get("Website")
+            for key, value in domData.items():
+                if not data.get(key) and value:
+                    data[key] = value
+                    if key in missing:
+                        self.metrics.increment("dom_fallback_fields")
+
+        # parse_dom already searched the website it found for emails
+        if not data.get("Email") and data.get("Website") and not domWebsite:
+            data["Email"] = self.find_mail(data["Website"])
+
+        if not data.get("Google Maps URL"):
+            try:
+                data["Google Maps URL"] = page["url"] or self.driver.current_url
+            except:
+                pass
+
+        if not data.get("Place Key"):
+            data["Place Key"] = place_key(data.get("Google Maps URL"), placeId=data.get("Place ID"))
+
+        data = {column: data.get(column) for column in OUTPUT_COLUMNS}
+
+        # Debug logging to help identify extraction issues
+        print(f"Debug - Extracted data for {data['Name']}:")
+        for key, value in data.items():
+            if value:
+                print(f"  {key}: {value}")
+            else:
+                print(f"  {key}: [NOT FOUND]")
+        print("-" * 50)
+
+        self.finalData.append(data)
+        if self.cache:
+            self.cache.put(data)
+
+        # Send extracted data to web interface for real-time display
+        Communicator.add_extracted_row(data)
+
+    def parse_dom(self, sheetHtml=None, url=None):
+        """
+        Parse the details sheet html. Returns the extracted columns, or None on error.
+        sheetHtml and url save their round trips when the caller already read them.
+        """
 
         """This block will get element details sheet of a business. 
         Details sheet means that business details card when you click on a business in 
         serach results in google maps"""
 
-        infoSheet = self.driver.execute_script(
-            """return document.querySelector("[role='main']")"""
-        )
+        if sheetHtml is None:
+            infoSheet = self.driver.execute_script(
+                """return document.querySelector("[role='main']")"""
+            )
         try:
             # Initialize data points
             (
@@ -100,7 +383,7 @@ class Parser(Base):
                 businessStatus,
             ) = (None, None, None, None, None, None, None, None, None, None, None)
 
-            html = infoSheet.get_attribute("outerHTML")
+            html = sheetHtml if sheetHtml is not None else infoSheet.get_attribute("outerHTML")
             soup = BeautifulSoup(html, "html.parser")
 
             # Extract rating
@@ -474,7 +757,7 @@ class Parser(Base):
 
             # Extract Google Maps URL
             try:
-                gmapsUrl = self.driver.current_url
+                gmapsUrl = url or self.driver.current_url
             except:
                 gmapsUrl = None
 
@@ -524,14 +807,6 @@ class Parser(Base):
                 "Google Maps URL": gmapsUrl,
             }
 
-            # Debug logging to help identify extraction issues
-            print(f"Debug - Extracted data for {name}:")
-            for key, value in data.items():
-                if value:
-                    print(f"  {key}: {value}")
-                else:
-                    print(f"  {key}: [NOT FOUND]")
-            
             # Special debug for phone extraction
             if not phone:
                 print("  Phone Debug: Searching for phone patterns in page...")
@@ -539,13 +814,8 @@ class Parser(Base):
                 import re
                 all_numbers = re.findall(r'\b\d+[\d\s\-]*\d+\b', page_text)
                 print(f"  All numbers found: {all_numbers[:10]}")  # Show first 10 numbers
-                
-            print("-" * 50)
 
-            self.finalData.append(data)
-            
-            # Send extracted data to web interface for real-time display
-            Communicator.add_extracted_row(data)
+            return data
 
         except Exception as e:
             Communicator.show_error_message(
@@ -555,11 +825,24 @@ class Parser(Base):
 
     # find email
     def find_mail(self, url):
+        """Emails of the website, or "" once email lookups are out of time"""
+        if not self.deadline.email_allowed():
+            return ""
+        startTime = time.time()
+        try:
+            return self.search_mail(url)
+        finally:
+            self.deadline.spend_email(time.time() - startTime)
+
+    def search_mail(self, url):
         try:
             headers = {
                 "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/130.0.0.0 Safari/537.36"
             }
-            source_code = requests.get(url, headers=headers, timeout=(10))
+            ProxyPool.route(self.session)
+            startTime = time.time()
+            source_code = self.session.get(url, headers=headers, timeout=(10))
+            ProxyPool.success(self.session, time.time() - startTime)
             curr = source_code.url
 
             original_curr = curr
@@ -572,7 +855,7 @@ class Parser(Base):
                 urls = [original_curr + "/contact/", original_curr + "/Contact/"]
                 for cu in urls:
                     curr = cu
-                    source_code = requests.get(url, headers=headers, timeout=(10))
+                    source_code = self.session.get(url, headers=headers, timeout=(10))
                     plain_text = source_code.text
                     match = re.findall(
                         r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}", plain_text
@@ -622,86 +905,161 @@ class Parser(Base):
             return email
 
         except Exception as e:
+            if is_proxy_error(e):
+                ProxyPool.failure(self.session)
             error_msg = f"Error in find_mail: {e}"
             # Only show error if it's not a connection/network issue
             if not Communicator.suppress_error_message(error_msg):
                 Communicator.show_message(error_msg)
         return ""
 
+    def checkpoint(self):
+        """Journal the rows added to finalData since the last checkpoint"""
+        if self.journal:
+            self.journal.add_rows(self.finalData[self.checkpointed:])
+            self.checkpointed = len(self.finalData)
+
+    def open_place(self, resultLink):
+        """Parse the place of the link, reusing the cached row if there is one"""
+        # Places parsed recently, by this or any other job, are not opened again
+        cached = self.cache.get(place_key(resultLink)) if self.cache else None
+        if cached is not None:
+            cached = {column: cached.get(column) for column in OUTPUT_COLUMNS}
+            self.finalData.append(cached)
+            self.checkpoint()
+            Communicator.add_extracted_row(cached)
+            return
+
+        if self.clickNavigation or CAPTURE_PLACE_RESPONSES:
+            RateController.acquire(self.deadline)  # loading the place paces itself in openingurl
+        startTime = time.time()
+        roundTrips = self.metrics.get("round_trips")
+        if self.clickNavigation and not self.onResults:
+            self.restore_results()
+        clicked = self.open_in_app(resultLink) if self.clickNavigation else None
+        if clicked is None and self.clickNavigation:
+            self.click_failed()
+        if clicked is None:
+            self.onResults = False  # the place is loaded in place of the results
+        data = self.capture_place(resultLink) if clicked is None and CAPTURE_PLACE_RESPONSES else None
+
+        if clicked is not None:
+            self.metrics.increment("click_navigations")
+            self.metrics.increment("place_load_seconds", round(time.time() - startTime, 3))
+            RateController.success(time.time() - startTime)
+            self.clickFailures = 0
+            self.parse(clicked)
+        elif data and all(data.get(field) for field in place_state.REQUIRED_FIELDS):
+            self.metrics.increment("captured_places")
+            self.metrics.increment("place_load_seconds", round(time.time() - startTime, 3))
+            RateController.success(time.time() - startTime)
+            self.parse(data)
+        else:
+            self.openingurl(url=resultLink)
+            self.metrics.increment("place_load_seconds", round(time.time() - startTime, 3))
+            self.parse()
+        self.checkpoint()
+        devtools.drain_network_events(self.driver, self.metrics)
+        self.metrics.set("last_place_round_trips", self.metrics.get("round_trips") - roundTrips)
+        self.metrics.increment("place_round_trips", self.metrics.get("last_place_round_trips"))
+
     def main(self, allResultsLinks):
         Communicator.show_message(
             "Scrolling is done. Now going to scrape each location"
         )
+
+        # A place reached by several links, or already parsed, is only opened once
+        seen = {row.get("Place Key") for row in self.finalData if row.get("Place Key")}
+        linkCount = len(allResultsLinks)
+        allResultsLinks = unique_links(allResultsLinks, seen)
+        self.metrics.increment("duplicate_links", linkCount - len(allResultsLinks))
+
+        totalLinks = len(allResultsLinks)
+        self.deadline.enter("parse")
+
+        # Places are clicked from the search results the driver shows, if it shows them
+        if self.clickNavigation:
+            try:
+                currentUrl = self.driver.current_url
+            except Exception:
+                currentUrl = ""
+            self.resultsUrl = currentUrl if "/maps/search/" in currentUrl else None
+            self.onResults = self.clickNavigation = self.resultsUrl is not None
+        Communicator.emit_progress(PHASE_PARSING, found=totalLinks, total=totalLinks)
+
+        # Rows given with the links (carried forward, or from the http engine) are journaled too
+        if self.journal:
+            self.journal.add_links(allResultsLinks)
+            self.checkpoint()
+
+        # Failed places go back to the end of the queue, and a dead driver is replaced
+        supervisor = DriverSupervisor(lambda: self.driver, Communicator.relaunch_driver, deadline=self.deadline,
+                                      metrics=self.metrics)
+        pending = deque(allResultsLinks)
+        completed = False
+        supervisor.start()
         try:
-            for resultLink in allResultsLinks:
+            while pending:
                 if Common.close_thread_is_set():
                     self.driver.quit()
                     return
+                if self.deadline.expired():
+                    Communicator.show_message(f"Out of time, {len(pending)} places are left unparsed")
+                    break
+
+                if ProxyPool.evicted(self.driver):
+                    # Chrome cannot change its proxy: a relaunched driver goes out through another one
+                    newDriver = supervisor.replace()
+                    if newDriver is not None:
+                        Communicator.show_message("[DEBUG] The browser's proxy was evicted, started a new browser")
+                        self.driver = newDriver
+                        self.onResults = False
+
+                resultLink = pending.popleft()
+                supervisor.wait(resultLink)
+                supervisor.beat()
+                try:
+                    self.open_place(resultLink)
+                except blocking.BlockedError:
+                    raise  # every other place would be blocked too
+                except Exception as e:
+                    print(f"[DEBUG] Parsing {resultLink} failed: {e}")
+                    if supervisor.failed(resultLink, e):
+                        pending.append(resultLink)
+                    driver = supervisor.recover(self.driver, e)
+                    if driver is not self.driver:
+                        self.onResults = False  # a relaunched driver starts blank
+                    self.driver = driver
+                    continue
+
+                Communicator.emit_progress(
+                    PHASE_PARSING, found=totalLinks, parsed=len(self.finalData), total=totalLinks
+                )
+            completed = not pending
 
-                self.openingurl(url=resultLink)
-                self.parse()
+        except blocking.BlockedError:
+            raise
 
         except Exception as e:
-            error_msg = str(e)
             Communicator.show_message(
-                f"Error occurred while parsing the locations. Error: {error_msg}"
+                f"Error occurred while parsing the locations. Error: {str(e)}"
             )
-            
-            # Railway fallback - if DevTools disconnected, try HTML source extraction
-            if "disconnected: not connected to DevTools" in error_msg:
-                Communicator.show_message("[DEBUG] DevTools disconnected during parsing - attempting HTML source extraction...")
-                try:
-                    # Try to get the current page source
-                    page_source = self.driver.page_source
-                    Communicator.show_message(f"[DEBUG] Page source length: {len(page_source)} characters")
-                    
-                    # Extract business data from HTML source using regex
-                    import re
-                    business_data = []
-                    
-                    # Look for business name patterns in the HTML
-                    name_patterns = [
-                        r'"([^"]+)","[^"]*","[^"]*",\d+,\d+,\d+',  # Google Maps data format
-                        r'aria-label="([^"]+)"[^>]*role="button"',  # Aria-label buttons
-                        r'<h1[^>]*>([^<]+)</h1>',  # H1 titles
-                        r'<h2[^>]*>([^<]+)</h2>',  # H2 titles
-                    ]
-                    
-                    for pattern in name_patterns:
-                        matches = re.findall(pattern, page_source)
-                        for match in matches[:10]:  # Limit to first 10
-                            if len(match) > 3 and len(match) < 100:  # Reasonable business name length
-                                business_data.append({
-                                    'name': match.strip(),
-                                    'address': 'Not available (HTML extraction)',
-                                    'phone': 'Not available',
-                                    'website': 'Not available',
-                                    'rating': 'Not available',
-                                    'reviews': 'Not available'
-                                })
-                    
-                    if business_data:
-                        Communicator.show_message(f"[DEBUG] Extracted {len(business_data)} businesses from HTML source")
-                        for i, biz in enumerate(business_data[:3]):
-                            Communicator.show_message(f"[DEBUG] Business {i+1}: {biz['name']}")
-                        
-                        # Add to final data
-                        self.finalData.extend(business_data)
-                        Communicator.show_message(f"[DEBUG] Added {len(business_data)} businesses to final data")
-                        
-                        # Force save the data immediately
-                        try:
-                            self.init_data_saver()
-                            self.data_saver.save(datalist=self.finalData)
-                            Communicator.show_message(f"[DEBUG] Force-saved {len(self.finalData)} businesses to file")
-                        except Exception as save_error:
-                            Communicator.show_message(f"[DEBUG] Force save failed: {save_error}")
-                    else:
-                        Communicator.show_message("[DEBUG] No business data found in HTML source")
-                        
-                except Exception as html_error:
-                    Communicator.show_message(f"[DEBUG] HTML source extraction failed: {html_error}")
 
         finally:
+            supervisor.stop()
+            self.deadLetters = supervisor.deadLetters
+            if self.deadLetters:
+                Communicator.report_dead_letters(self.deadLetters)
+                Communicator.show_message(
+                    f"{len(self.deadLetters)} places could not be parsed after "
+                    f"{supervisor.maxAttempts} attempts, resume the job to try them again"
+                )
+            if self.cache:
+                Communicator.show_message(
+                    f"Place cache: {self.metrics.get('cache_hits')} reused, "
+                    f"{self.metrics.get('cache_misses') + self.metrics.get('cache_stale')} opened"
+                )
             self.init_data_saver()
             self.data_saver.save(datalist=self.finalData)
+            if self.journal and completed and not self.deadLetters:
+                self.journal.clear()  # nothing to resume
@@ -0,0 +1,148 @@
+"""
+This module contain the code for the place cache.
+Parsed places are kept in a SQLite file across jobs, so a place scraped
+recently by any query is reused instead of being opened again.
+The same rows are the snapshots an incremental refresh compares result cards with
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+try:
+    from scraper.metrics import Metrics
+    from scraper.place_state import REQUIRED_FIELDS
+    from scraper.placekey import place_key
+    from settings import PLACE_CACHE_PATH, PLACE_CACHE_TTL_HOURS, REFRESH_MAX_AGE_HOURS
+except ImportError:
+    from app.scraper.metrics import Metrics
+    from app.scraper.place_state import REQUIRED_FIELDS
+    from app.scraper.placekey import place_key
+    from app.settings import PLACE_CACHE_PATH, PLACE_CACHE_TTL_HOURS, REFRESH_MAX_AGE_HOURS
+
+
+def summary(row):
+    """
+    (name, rating, reviews, closure) of a row: what a result card shows of a place,
+    normalized so a card and a parsed row compare equal. Unknown values are None
+    """
+    name = str(row.get("Name") or "").strip().lower() or None
+
+    try:
+        rating = round(float(str(row.get("Rating")).replace(",", ".")), 1)
+    except ValueError:
+        rating = None
+
+    reviews = re.sub(r"\D", "", str(row.get("Total Reviews") or ""))
+    reviews = int(reviews) if reviews else None
+
+    # Opening hours text changes during the day, only closures are compared
+    status = str(row.get("Business Status") or "").lower()
+    if "permanently" in status:
+        closure = "permanently closed"
+    elif "temporarily" in status:
+        closure = "temporarily closed"
+    else:
+        closure = None
+
+    return name, rating, reviews, closure
+
+
+def changed(card, stored):
+    """True if a value the card shows differs from the stored row"""
+    return any(
+        value is not None and value != storedValue
+        for value, storedValue in zip(summary(card), summary(stored))
+    )
+
+
+class PlaceCache:
+    def __init__(self, path=PLACE_CACHE_PATH, ttlHours=PLACE_CACHE_TTL_HOURS, metrics=None):
+        """metrics: the job's metrics.Metrics, None for counters of its own"""
+        self.ttl = ttlHours * 3600
+        self.metrics = metrics or Metrics()
+        self.lock = threading.Lock()
+
+        folder = os.path.dirname(path)
+        if folder and not os.path.exists(folder):
+            os.makedirs(folder)
+        # Shared by the worker threads of the http engine
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute(
+            "CREATE TABLE IF NOT EXISTS places (key TEXT PRIMARY KEY, row TEXT NOT NULL, saved_at REAL NOT NULL)"
+        )
+        self.db.commit()
+
+    def get(self, key):
+        """The cached row of the place, or None if it is missing or older than the TTL"""
+        if not key:
+            return None
+
+        with self.lock:
+            found = self.db.execute("SELECT row, saved_at FROM places WHERE key = ?", (key,)).fetchone()
+
+        if found is None:
+            self.metrics.increment("cache_misses")
+            return None
+        if time.time() - found[1] > self.ttl:
+            self.metrics.increment("cache_stale")
+            return None
+
+        self.metrics.increment("cache_hits")
+        return json.loads(found[0])
+
+    def snapshot(self, key):
+        """(last parsed row, its age in seconds) of the place, whatever its age, or None"""
+        if not key:
+            return None
+        with self.lock:
+            found = self.db.execute("SELECT row, saved_at FROM places WHERE key = ?", (key,)).fetchone()
+        return (json.loads(found[0]), time.time() - found[1]) if found else None
+
+    def forget(self, key):
+        with self.lock:
+            self.db.execute("DELETE FROM places WHERE key = ?", (key,))
+            self.db.commit()
+
+    def put(self, row):
+        """Keep a parsed row. Rows without a place key or a required field are not kept"""
+        key = row.get("Place Key")
+        if not key or not all(row.get(field) for field in REQUIRED_FIELDS):
+            return
+
+        with self.lock:
+            self.db.execute(
+                "INSERT OR REPLACE INTO places (key, row, saved_at) VALUES (?, ?, ?)",
+                (key, json.dumps(row, default=str), time.time()),
+            )
+            self.db.commit()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
+
+
+def plan_refresh(rows, cache, maxAgeHours=REFRESH_MAX_AGE_HOURS):
+    """
+    Split search result rows for an incremental refresh. Returns the stored rows of
+    places whose card is unchanged and that were parsed within maxAgeHours (carried
+    forward), and the links of the places to open again. The snapshots of those are
+    dropped, so the parser does not reuse them from the cache.
+    """
+    carried, links = [], []
+    for row in rows:
+        key = row.get("Place Key") or place_key(row.get("Google Maps URL"))
+        snapshot = cache.snapshot(key)
+        if snapshot is not None:
+            stored, age = snapshot
+            if age <= maxAgeHours * 3600 and not changed(row, stored):
+                carried.append(stored)
+                continue
+            cache.forget(key)
+        links.append(row["Google Maps URL"])
+
+    cache.metrics.set("refresh_carried", len(carried))
+    cache.metrics.set("refresh_opened", len(links))
+    return carried, links
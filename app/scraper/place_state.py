@@ -0,0 +1,191 @@
+"""
+This module contain the code for reading a place from the structured data
+that Google Maps embeds in the page (window.APP_INITIALIZATION_STATE).
+One small json transfer replaces serializing and parsing the whole details sheet
+"""
+
+import json
+import re
+
+
+# Everything parse needs from the open place in one round trip: the serialized
+# place payload, the url and the load state. The details sheet html is only sent
+# when the payload cannot be used (the checks mirror REQUIRED_FIELDS and matches_url).
+# Search pages keep their results at [3][2], so the place slot [3][6] is read
+PLACE_SCRIPT = """
+var state = window.APP_INITIALIZATION_STATE;
+var payload = state && state[3] && state[3][6];
+if (typeof payload !== 'string' || payload.indexOf(")]}'") !== 0) payload = null;
+var usable = false;
+if (payload) {
+    try {
+        var record = JSON.parse(payload.slice(payload.indexOf('\\n') + 1))[6];
+        var samePlace = !(typeof record[10] === 'string' && location.href.indexOf('!1s0x') >= 0
+            && location.href.indexOf(record[10]) < 0);
+        usable = !!(record[11] && (record[39] || record[18]) && record[13] && record[13].length && samePlace);
+    } catch (e) {}
+}
+var sheet = usable ? null : document.querySelector("[role='main']");
+return {
+    payload: payload,
+    url: location.href,
+    status: document.readyState,
+    html: sheet ? sheet.outerHTML : null
+};
+"""
+
+# Without these the record is not trusted and the DOM is parsed for every field
+REQUIRED_FIELDS = ("Name", "Address", "Category")
+
+# Columns of the record the details sheet shows too. Any of them the record lacks
+# is looked up in the sheet, so a field Google moved within the record is not lost
+DOM_FIELDS = REQUIRED_FIELDS + ("Phone", "Website", "Business Status", "Total Reviews", "Booking Links", "Rating",
+                                "Hours")
+
+
+def dig(data, *path):
+    """data[path[0]][path[1]]..., or None if any step is missing"""
+    for index in path:
+        try:
+            data = data[index]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return data
+
+
+def load_place_record(payload):
+    """The place record inside the serialized payload, or None"""
+    if not payload:
+        return None
+    try:
+        # The payload starts with the )]}' guard line
+        state = json.loads(payload[payload.index("\n") + 1:])
+    except ValueError:
+        return None
+    record = dig(state, 6)
+    return record if isinstance(record, list) else None
+
+
+def record_from_response(body):
+    """
+    The place record of a captured response: either a /maps/preview/place
+    payload or the html of a place page, which embeds the same payload
+    """
+    if not body:
+        return None
+    if body.startswith(")]}'"):
+        return load_place_record(body)
+
+    payload = dig(state_from_html(body), 3, 6)
+    return load_place_record(payload) if isinstance(payload, str) else None
+
+
+def state_from_html(html):
+    """window.APP_INITIALIZATION_STATE of a Maps page's html, or None"""
+    match = re.search(r"window\.APP_INITIALIZATION_STATE\s*=\s*(\[.*?\]);window\.", html or "", re.DOTALL)
+    if not match:
+        return None
+    try:
+        return json.loads(match.group(1))
+    except ValueError:
+        return None
+
+
+def matches_url(record, url):
+    """False if the record is of another place than the url (compared by data id)"""
+    dataId = dig(record, 10)
+    return not (isinstance(dataId, str) and "!1s0x" in url and dataId not in url)
+
+
+def format_hours(record):
+    """'Monday: 8 AM-11 PM; Tuesday: ...' from the opening hours table"""
+    days = dig(record, 34, 1)
+    if not isinstance(days, list):
+        return None
+    hours = []
+    for day in days:
+        name = dig(day, 0)
+        times = dig(day, 1)
+        if not name:
+            continue
+        if isinstance(times, list):
+            times = ", ".join(str(time) for time in times)
+        hours.append(f"{name}: {times}")
+    return "; ".join(hours) or None
+
+
+def booking_links(record):
+    links = [dig(reservation, 0) for reservation in dig(record, 46) or []]
+    links = [link for link in links if isinstance(link, str) and link.startswith("http")]
+    return ", ".join(links) or None
+
+
+def coordinates_from_url(url):
+    """(latitude, longitude) from the !3d...!4d... part of a place url"""
+    match = re.search(r"!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)", url or "")
+    if match:
+        return float(match.group(1)), float(match.group(2))
+    return None, None
+
+
+def map_record(record):
+    """Map a place record to the output columns. Missing values are None"""
+    name = dig(record, 11)
+    categories = dig(record, 13)
+    address = dig(record, 39) or dig(record, 18)
+    if isinstance(address, str) and name and address.startswith(f"{name}, "):
+        address = address[len(name) + 2:]
+
+    return {
+        "Category": ", ".join(categories) if isinstance(categories, list) else None,
+        "Name": name,
+        "Phone": dig(record, 178, 0, 0),
+        "Website": dig(record, 7, 0),
+        "Business Status": dig(record, 34, 4, 4),
+        "Address": address,
+        "Total Reviews": dig(record, 4, 8),
+        "Booking Links": booking_links(record),
+        "Rating": dig(record, 4, 7),
+        "Hours": format_hours(record),
+        "Latitude": dig(record, 9, 2),
+        "Longitude": dig(record, 9, 3),
+        "Place ID": dig(record, 78),
+    }
+
+
+def from_payload(payload, url):
+    """Mapped columns of a serialized place payload, or an empty dict if it has no usable record"""
+    record = load_place_record(payload)
+    if record is None:
+        return {}
+
+    # The state belongs to the page that was loaded, which is not the current
+    # place if the page navigated in place since then
+    if not matches_url(record, url):
+        return {}
+
+    data = map_record(record)
+    if data["Latitude"] is None:
+        data["Latitude"], data["Longitude"] = coordinates_from_url(url)
+    return data
+
+
+def snapshot(driver):
+    """
+    Read the open place with one script call.
+    Returns {"data": mapped columns (empty if the page has no usable record),
+    "html": details sheet html (None when data is complete), "url", "status"}.
+    """
+    try:
+        page = driver.execute_script(PLACE_SCRIPT) or {}
+    except Exception as e:
+        print(f"[DEBUG] Place snapshot not available: {e}")
+        page = {}
+
+    url = page.get("url") or ""
+    return {
+        "data": from_payload(page.get("payload"), url),
+        "html": page.get("html"),
+        "url": url or None,
+        "status": page.get("status"),
+    }
@@ -0,0 +1,81 @@
+"""
+This module contain the code for canonical place keys.
+Links to the same place differ in volatile parameters (authuser, hl, rclk, !19s...),
+so places are identified by a key parsed from the link instead of the raw href
+"""
+
+import re
+from urllib.parse import parse_qsl, quote, unquote, urlencode
+
+
+PLACE_ID_PATTERN = r"(?:!19s|place_id[:=]|query_place_id=)(ChIJ[\w-]+)"
+COORDINATES_PATTERN = r"!3d(-?\d+(?:\.\d+)?)!4d(-?\d+(?:\.\d+)?)"
+
+# Query parameters that say which place a link without a feature id opens
+IDENTIFYING_PARAMETERS = ("api", "q", "query", "query_place_id", "cid")
+
+
+def data_id_from_url(url):
+    """The 0x...:0x... id of a place url, used to match links from any source"""
+    match = re.search(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)", url or "")
+    return match.group(1) if match else None
+
+
+def place_url(name, dataId):
+    return f"https://www.google.com/maps/place/{quote(name)}/data=!4m2!3m1!1s{dataId}"
+
+
+def place_key(url=None, placeId=None, dataId=None):
+    """
+    Stable key of a place: its 0x...:0x... feature id, else its ChIJ place id,
+    else the coordinates of its link. None if the link identifies no place.
+    """
+    dataId = dataId or data_id_from_url(url)
+    if dataId:
+        return dataId.lower()
+
+    match = re.search(PLACE_ID_PATTERN, url or "")
+    placeId = placeId or (match.group(1) if match else None)
+    if placeId:
+        return placeId
+
+    match = re.search(COORDINATES_PATTERN, url or "")
+    if match:
+        return f"{float(match.group(1)):.6f},{float(match.group(2)):.6f}"
+    return None
+
+
+def canonical_url(url):
+    """The link without its volatile parameters. Its coordinates, or the query naming its place, are kept"""
+    dataId = data_id_from_url(url)
+    if dataId is None:
+        if not url or "?" not in url:
+            return url
+        path, query = url.split("?", 1)
+        kept = [(name, value) for name, value in parse_qsl(query) if name in IDENTIFYING_PARAMETERS]
+        return f"{path}?{urlencode(kept)}" if kept else path
+
+    match = re.search(r"/maps/place/([^/?]+)", url)
+    name = unquote(match.group(1)).replace("+", " ") if match else ""
+    coordinates = re.search(COORDINATES_PATTERN, url)
+    if coordinates is None:
+        return place_url(name, dataId)
+    return place_url(name, dataId).replace(
+        "data=!4m2!3m1!1s", "data=!4m5!3m4!1s"
+    ) + f"!8m2!3d{coordinates.group(1)}!4d{coordinates.group(2)}"
+
+
+def unique_links(links, seen=None):
+    """
+    Canonical links of the places not seen yet, in order. seen is the set of known
+    place keys, and is updated with the returned ones.
+    """
+    seen = set() if seen is None else seen
+    unique = []
+    for link in links:
+        key = place_key(link) or link
+        if key in seen:
+            continue
+        seen.add(key)
+        unique.append(canonical_url(link))
+    return unique
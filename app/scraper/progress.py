@@ -0,0 +1,37 @@
+"""
+This module contain the typed progress events that the scraper emits,
+so frontends can follow a job without parsing the message text
+"""
+
+import time
+from dataclasses import dataclass, field, asdict
+
+
+PHASE_DRIVER = "driver"
+PHASE_NAVIGATING = "navigating"
+PHASE_SCROLLING = "scrolling"
+PHASE_PARSING = "parsing"
+PHASE_SAVING = "saving"
+PHASE_DONE = "done"
+
+PHASES = (
+    PHASE_DRIVER,
+    PHASE_NAVIGATING,
+    PHASE_SCROLLING,
+    PHASE_PARSING,
+    PHASE_SAVING,
+    PHASE_DONE,
+)
+
+
+@dataclass
+class ProgressEvent:
+    """One progress update of a scraping job"""
+    phase: str
+    found: int = 0  # locations discovered while scrolling
+    parsed: int = 0  # locations parsed so far
+    total: int = 0  # locations queued for parsing
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self):
+        return asdict(self)
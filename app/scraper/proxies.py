@@ -0,0 +1,182 @@
+"""
+This module contain the code for the proxy pool.
+Drivers and requests sessions go out through proxies of PROXIES. Each proxy has a
+health score and a latency learned from the requests through it, a driver or session
+keeps its proxy while it is healthy, and a proxy that keeps failing or gets blocked
+is evicted for a while
+"""
+
+import threading
+import time
+from urllib.parse import urlsplit
+from weakref import WeakKeyDictionary
+import requests
+try:
+    from scraper.metrics import PROCESS_METRICS
+    from settings import PROXIES, PROXY_SCORE_WEIGHT, PROXY_MAX_FAILURES, PROXY_MIN_HEALTH, PROXY_MIN_SAMPLES
+    from settings import PROXY_EVICTION_SECONDS
+except ImportError:
+    from app.scraper.metrics import PROCESS_METRICS
+    from app.settings import PROXIES, PROXY_SCORE_WEIGHT, PROXY_MAX_FAILURES, PROXY_MIN_HEALTH, PROXY_MIN_SAMPLES
+    from app.settings import PROXY_EVICTION_SECONDS
+
+
+def is_proxy_error(error):
+    """True for errors of the proxy itself rather than of the site behind it"""
+    return isinstance(error, (requests.exceptions.ProxyError, requests.exceptions.ConnectTimeout))
+
+
+def chrome_argument(proxy):
+    """Chrome switch for the proxy"""
+    parts = urlsplit(proxy)
+    return f"--proxy-server={parts.scheme}://{parts.hostname}:{parts.port}"
+
+
+def has_credentials(proxy):
+    """Chrome takes no credentials in --proxy-server, so drivers cannot use such a proxy"""
+    return bool(urlsplit(proxy).username)
+
+
+def fresh_stats():
+    """Record of a proxy nothing went through yet"""
+    return {"health": 1.0, "latency": None, "samples": 0, "failures": 0, "evictedUntil": 0}
+
+
+def requests_proxies(proxy):
+    """proxies argument of requests for the proxy, empty to connect directly"""
+    return {"http": proxy, "https": proxy} if proxy else {}
+
+
+class ProxyPool:
+    """Per process, like RateController. Without proxies everything connects directly"""
+
+    lock = threading.Lock()
+    stats = {proxy: fresh_stats() for proxy in PROXIES}  # proxy -> health, latency, samples, failures in a row, evictedUntil
+    owners = WeakKeyDictionary()  # driver or session -> its proxy
+
+    @classmethod
+    def reset(cls, proxies=PROXIES):
+        with cls.lock:
+            cls.stats = {proxy: fresh_stats() for proxy in proxies}
+            cls.owners = WeakKeyDictionary()
+
+    @classmethod
+    def __usable(cls, proxy, now):
+        stats = cls.stats.get(proxy)
+        if stats is None:
+            return False
+        if stats["evictedUntil"] and stats["evictedUntil"] <= now:
+            # Back from eviction on probation, with a clean record
+            cls.stats[proxy] = stats = fresh_stats()
+        return not stats["evictedUntil"]
+
+    @classmethod
+    def score(cls, proxy):
+        """Health discounted by latency: a proxy answering in one second scores half of an instant one"""
+        stats = cls.stats[proxy]
+        return stats["health"] / (1 + (stats["latency"] or 0))
+
+    @classmethod
+    def choose(cls, current=None, driver=False):
+        """
+        current if it is still usable, so a job keeps its proxy. Else the usable proxy with
+        the fewest drivers and sessions on it, the best scored first. None to connect directly.
+        driver: the proxy is for Chrome, which cannot use proxies with credentials
+        """
+        with cls.lock:
+            now = time.time()
+            if current is not None and cls.__usable(current, now):
+                return current
+            usable = [proxy for proxy in cls.stats if cls.__usable(proxy, now)]
+            PROCESS_METRICS.set("proxies_healthy", len(usable))
+            if driver:
+                usable = [proxy for proxy in usable if not has_credentials(proxy)]
+            if not usable:
+                if cls.stats:
+                    print("[DEBUG] No usable proxy, connecting directly")
+                return None
+            load = {proxy: 0 for proxy in usable}
+            for proxy in cls.owners.values():
+                if proxy in load:
+                    load[proxy] += 1
+            return min(usable, key=lambda proxy: (load[proxy], -cls.score(proxy)))
+
+    @classmethod
+    def assign(cls, owner, proxy):
+        """Record that the driver or session goes out through the proxy, so its outcomes score it"""
+        with cls.lock:
+            if proxy is None:
+                cls.owners.pop(owner, None)
+            else:
+                cls.owners[owner] = proxy
+
+    @classmethod
+    def proxy_of(cls, owner):
+        if owner is None:
+            return None
+        with cls.lock:
+            return cls.owners.get(owner)
+
+    @classmethod
+    def evicted(cls, owner):
+        """True if the proxy the driver or session goes out through was evicted since it got it"""
+        with cls.lock:
+            proxy = cls.owners.get(owner) if owner is not None else None
+            return proxy is not None and not cls.__usable(proxy, time.time())
+
+    @classmethod
+    def route(cls, session):
+        """Point the requests session at its proxy, a new one if its proxy was evicted. Returns the proxy"""
+        current = cls.proxy_of(session)
+        proxy = cls.choose(current)
+        if proxy != current or current is None:
+            cls.assign(session, proxy)
+            session.proxies.clear()
+            session.proxies.update(requests_proxies(proxy))
+        return proxy
+
+    @classmethod
+    def success(cls, owner, seconds=0):
+        cls.__record(cls.proxy_of(owner), True, seconds)
+
+    @classmethod
+    def failure(cls, owner):
+        cls.__record(cls.proxy_of(owner), False)
+
+    @classmethod
+    def blocked(cls, owner):
+        """Google blocked a request through the proxy: evict it whatever its record"""
+        proxy = cls.proxy_of(owner)
+        if proxy is not None:
+            cls.__evict(proxy, "blocked")
+
+    @classmethod
+    def __record(cls, proxy, ok, seconds=0):
+        if proxy is None:
+            return
+        with cls.lock:
+            stats = cls.stats.get(proxy)
+            if stats is None or stats["evictedUntil"]:
+                return
+            stats["samples"] += 1
+            stats["health"] += PROXY_SCORE_WEIGHT * ((1.0 if ok else 0.0) - stats["health"])
+            if ok:
+                stats["failures"] = 0
+                latency = stats["latency"]
+                stats["latency"] = seconds if latency is None else latency + PROXY_SCORE_WEIGHT * (seconds - latency)
+                return
+            stats["failures"] += 1
+            if stats["failures"] < PROXY_MAX_FAILURES and (
+                    stats["samples"] < PROXY_MIN_SAMPLES or stats["health"] >= PROXY_MIN_HEALTH):
+                return
+        cls.__evict(proxy, "failing")
+
+    @classmethod
+    def __evict(cls, proxy, reason):
+        with cls.lock:
+            stats = cls.stats.get(proxy)
+            if stats is None or stats["evictedUntil"]:
+                return
+            stats["evictedUntil"] = time.time() + PROXY_EVICTION_SECONDS
+        print(f"[DEBUG] Proxy {urlsplit(proxy).hostname} is {reason}, evicted for {PROXY_EVICTION_SECONDS} seconds")
+        PROCESS_METRICS.increment("proxy_evictions")
@@ -0,0 +1,88 @@
+"""
+This module contain the code for pacing the requests made to Google Maps.
+An AIMD controller shared by every worker of the process spaces navigations out:
+the rate grows a little after each fast success and is cut sharply on failures,
+slow loads and blocks. The current rate is the navigation_rate metric
+"""
+
+import threading
+import time
+try:
+    from scraper.metrics import PROCESS_METRICS
+    from settings import RATE_INITIAL, RATE_MIN, RATE_MAX, RATE_INCREASE, RATE_DECREASE
+    from settings import RATE_BLOCK_DECREASE, RATE_SLOW_LOAD
+except ImportError:
+    from app.scraper.metrics import PROCESS_METRICS
+    from app.settings import RATE_INITIAL, RATE_MIN, RATE_MAX, RATE_INCREASE, RATE_DECREASE
+    from app.settings import RATE_BLOCK_DECREASE, RATE_SLOW_LOAD
+
+
+# Failures within this many seconds of a cut are part of the same spike, and cut once
+CUT_INTERVAL = 2
+
+
+class RateController:
+    """Per process, so what one job learns about Google's limits holds for the next ones"""
+
+    lock = threading.Lock()
+    rate = RATE_INITIAL  # navigations per second
+    nextSlot = 0  # time the next navigation may start
+    lastCut = 0
+
+    @classmethod
+    def reset(cls, rate=RATE_INITIAL):
+        with cls.lock:
+            cls.rate = rate
+            cls.nextSlot = 0
+            cls.lastCut = 0
+
+    @classmethod
+    def acquire(cls, deadline=None):
+        """
+        Wait for the turn of the next navigation, at most until the stage of the job's
+        deadline runs out. Returns the seconds waited
+        """
+        with cls.lock:
+            now = time.time()
+            slot = max(now, cls.nextSlot)
+            cls.nextSlot = slot + 1 / cls.rate
+            PROCESS_METRICS.set("navigation_rate", round(cls.rate, 3))
+
+        delay = slot - now if deadline is None else deadline.clamp(slot - now)
+        if delay > 0:
+            PROCESS_METRICS.increment("rate_wait_seconds", round(delay, 3))
+            time.sleep(delay)
+        return max(delay, 0)
+
+    @classmethod
+    def success(cls, seconds=0):
+        """A navigation went through in seconds. A slow one counts as a failure"""
+        if seconds > RATE_SLOW_LOAD:
+            PROCESS_METRICS.increment("slow_navigations")
+            cls.__cut(RATE_DECREASE)
+            return
+        with cls.lock:
+            cls.rate = min(RATE_MAX, cls.rate + RATE_INCREASE)
+            PROCESS_METRICS.set("navigation_rate", round(cls.rate, 3))
+
+    @classmethod
+    def failure(cls):
+        cls.__cut(RATE_DECREASE)
+
+    @classmethod
+    def blocked(cls):
+        """Google blocked a request: slow down the most, whatever the last cut was"""
+        cls.__cut(RATE_BLOCK_DECREASE, force=True)
+
+    @classmethod
+    def __cut(cls, factor, force=False):
+        with cls.lock:
+            now = time.time()
+            if not force and now - cls.lastCut < CUT_INTERVAL:
+                return
+            cls.lastCut = now
+            cls.rate = max(RATE_MIN, cls.rate * factor)
+            # Navigations already given a slot wait for the new pace too
+            cls.nextSlot = max(cls.nextSlot, now + 1 / cls.rate)
+            PROCESS_METRICS.set("navigation_rate", round(cls.rate, 3))
+        PROCESS_METRICS.increment("rate_cuts")
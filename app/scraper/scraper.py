@@ -8,18 +8,50 @@ from time import sleep
 try:
     from scraper.base import Base
     from scraper.scroller import Scroller
-    from settings import DRIVER_EXECUTABLE_PATH
+    from settings import DRIVER_EXECUTABLE_PATH, DEFAULT_ENGINE, ENGINES, DEFAULT_MODE, MODES
+    from settings import INCREMENTAL_REFRESH, JOURNAL_ENABLED, NAVIGATION_PAGE_LOAD_TIMEOUT, JOB_DEADLINE
+    from settings import CONSENT_REDIRECT_TIMEOUT, PLACE_CACHE_ENABLED
     from scraper.communicator import Communicator
+    from scraper.progress import PHASE_DRIVER, PHASE_NAVIGATING, PHASE_DONE
+    from scraper.metrics import Metrics
+    from scraper import devtools
+    from scraper.common import Common
+    from scraper.http_engine import HttpEngine
+    from scraper.parser import Parser
+    from scraper.datasaver import DataSaver
+    from scraper import tiling
+    from scraper.journal import Journal
+    from scraper.place_cache import PlaceCache
+    from scraper.deadline import Deadline
+    from scraper import blocking
+    from scraper.proxies import ProxyPool, chrome_argument
 except ImportError:
     from app.scraper.base import Base
     from app.scraper.scroller import Scroller
-    from app.settings import DRIVER_EXECUTABLE_PATH
+    from app.settings import DRIVER_EXECUTABLE_PATH, DEFAULT_ENGINE, ENGINES, DEFAULT_MODE, MODES
+    from app.settings import INCREMENTAL_REFRESH, JOURNAL_ENABLED, NAVIGATION_PAGE_LOAD_TIMEOUT, JOB_DEADLINE
+    from app.settings import CONSENT_REDIRECT_TIMEOUT, PLACE_CACHE_ENABLED
     from app.scraper.communicator import Communicator
+    from app.scraper.progress import PHASE_DRIVER, PHASE_NAVIGATING, PHASE_DONE
+    from app.scraper.metrics import Metrics
+    from app.scraper import devtools
+    from app.scraper.common import Common
+    from app.scraper.http_engine import HttpEngine
+    from app.scraper.parser import Parser
+    from app.scraper.datasaver import DataSaver
+    from app.scraper import tiling
+    from app.scraper.journal import Journal
+    from app.scraper.place_cache import PlaceCache
+    from app.scraper.deadline import Deadline
+    from app.scraper import blocking
+    from app.scraper.proxies import ProxyPool, chrome_argument
 import os
 import subprocess
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 import requests
 
@@ -47,7 +79,8 @@ except ImportError:
 
 class Backend(Base):
     
-    def __init__(self, searchquery, outputformat, healdessmode):
+    def __init__(self, searchquery, outputformat, healdessmode, engine=None, mode=None, bbox=None, resume=False,
+                 deadline=None, fresh=False, cache=None):
         """
         params:
 
@@ -55,13 +88,55 @@ class Backend(Base):
         outputformat: output format of file , selected by user
         outputpath: directory path where file will be stored after scraping
         headlessmode: it's value can be 0 and 1, 0 means unchecked box and 1 means checked
+        engine: "browser" or "http", see DEFAULT_ENGINE in settings
+        mode: "full" or "list", see DEFAULT_MODE in settings
+        bbox: "south,west,north,east" of an area to search tile by tile, see TILE_GRID in settings
+        resume: continue the interrupted run of the same job from its journal, see JOURNAL_ENABLED in settings
+        deadline: seconds the job may take, see JOB_DEADLINE in settings
+        fresh: discard the journal of an interrupted run instead of keeping it for a later resume
+        cache: reuse places parsed by earlier jobs, None for PLACE_CACHE_ENABLED, see settings
         """
 
         self.searchquery = searchquery  # search query that user will enter
         self.headlessMode = healdessmode
+        self.engine = engine or DEFAULT_ENGINE
+        if self.engine not in ENGINES:
+            raise ValueError(f"Unknown engine {self.engine}. Use one of: {', '.join(ENGINES)}")
+        self.mode = mode or DEFAULT_MODE
+        if self.mode not in MODES:
+            raise ValueError(f"Unknown mode {self.mode}. Use one of: {', '.join(MODES)}")
+        self.bbox = tiling.parse_bbox(bbox) if bbox else None
+
+        self.metrics = Metrics()  # the job's counters, passed to every part working for it
+        self.deadline = Deadline(deadline or JOB_DEADLINE, self.metrics)
+        if cache is None:
+            cache = PLACE_CACHE_ENABLED or INCREMENTAL_REFRESH
+        self.cache = PlaceCache(metrics=self.metrics) if cache else None
+
+        # An interrupted run of the job left the places it parsed and the links it was opening
+        self.journal = Journal.for_job(searchquery, self.engine, self.mode, bbox) if JOURNAL_ENABLED else None
+        self.resumed = None  # (rows, links) of that run
+        if self.journal is not None:
+            if fresh:
+                self.journal.clear()
+            rows, links = self.journal.load()
+            if resume and links:
+                self.resumed = (rows, links)
+            elif links:
+                # Kept for a later resume, this run adds to it and deletes it if it completes
+                Communicator.show_message(
+                    f"An interrupted run of this search parsed {len(rows)} of {len(links)} places. "
+                    f"Start the search with resume to continue it, or with fresh to discard it"
+                )
 
-        self.init_driver()
-        self.scroller = Scroller(driver=self.driver)
+        self.driver = None
+        self.proxy = None  # the job's proxy, kept by relaunched drivers unless it is evicted
+        self.blocked = None  # kind of page Google blocked the job with, see blocking.BLOCKED_PAGES
+        if self.engine == "browser":
+            self.deadline.enter("driver")
+            self.init_driver()
+            self.scroller = Scroller(driver=self.driver, mode=self.mode, deadline=self.deadline, cache=self.cache,
+                                     journal=self.journal, metrics=self.metrics)
         self.init_communicator()
 
     def init_communicator(self):
@@ -128,9 +203,15 @@ class Backend(Base):
         print("[DEBUG] Chrome executable not found")
         return None
 
-    def init_driver(self):
-        """Initialize Chrome driver with multiple fallback options"""
+    def init_driver(self, relaunch=False):
+        """
+        Initialize Chrome driver with multiple fallback options.
+        relaunch: the driver replaces a dead one while the job is past the driver phase
+        """
         
+        if not relaunch:
+            Communicator.emit_progress(PHASE_DRIVER)
+
         # First priority: Try remote Chrome connection (user's local Chrome)
         if REMOTE_CHROME_AVAILABLE and os.getenv('REMOTE_CHROME_URL'):
             try:
@@ -141,23 +222,49 @@ class Backend(Base):
                 
                 # Set up driver properties
                 self.driver.implicitly_wait(self.timeout)
+                self.driver.set_page_load_timeout(NAVIGATION_PAGE_LOAD_TIMEOUT)
                 Communicator.show_message("Opening browser...")
                 if not self.headlessMode:
                     try:
                         self.driver.maximize_window()
                     except:
                         pass
+                devtools.count_round_trips(self.driver, self.metrics)
+                devtools.block_requests(self.driver)
                 return
             except Exception as e:
                 print(f"[DEBUG] Remote Chrome connection failed: {e}")
+                self.raise_if_out_of_time(e)
         
         # Second priority: Local Chrome initialization
         chrome_path = self.find_chrome_executable()
+        self.proxy = ProxyPool.choose(self.proxy, driver=True)
         
         if UC_AVAILABLE:
             self._init_undetected_chrome(chrome_path)
         else:
             self._init_regular_chrome(chrome_path)
+        ProxyPool.assign(self.driver, self.proxy)
+
+        devtools.count_round_trips(self.driver, self.metrics)
+
+        # Map tiles, photos, fonts and beacons are not needed for the data
+        devtools.block_requests(self.driver)
+
+    def raise_if_out_of_time(self, error):
+        """A way of starting the browser failed: give up on the others once the stage is out of time"""
+        if self.deadline.expired():
+            raise RuntimeError(f"Out of time starting the browser. Last error: {error}")
+
+    def relaunch_driver(self):
+        """Replace a dead or hung driver with a new one. Returns the new driver"""
+        Communicator.show_message("The browser stopped responding, starting a new one...")
+        try:
+            self.driver.quit()
+        except Exception:
+            pass
+        self.init_driver(relaunch=True)
+        return self.driver
 
     def _init_undetected_chrome(self, chrome_path):
         """Initialize undetected chrome driver"""
@@ -235,6 +342,9 @@ class Backend(Base):
             "profile.managed_default_content_settings.media_stream": 2,
         }
         options.add_experimental_option("prefs", prefs)
+        devtools.enable_performance_log(options)
+        if self.proxy:
+            options.add_argument(chrome_argument(self.proxy))
 
         if chrome_path:
             options.binary_location = chrome_path
@@ -267,6 +377,7 @@ class Backend(Base):
                     print(f"[DEBUG] Undetected Chrome retry failed: {e2}")
             
             # Fallback to regular Chrome
+            self.raise_if_out_of_time(e)
             print("[DEBUG] Falling back to regular Chrome driver")
             self._init_regular_chrome(chrome_path)
 
@@ -369,6 +480,9 @@ class Backend(Base):
             "profile.managed_default_content_settings.media_stream": 2,
         }
         options.add_experimental_option("prefs", prefs)
+        devtools.enable_performance_log(options)
+        if self.proxy:
+            options.add_argument(chrome_argument(self.proxy))
 
         if chrome_path:
             options.binary_location = chrome_path
@@ -392,6 +506,7 @@ class Backend(Base):
             except Exception as e:
                 print(f"[DEBUG] {method_name} failed: {e}")
                 last_error = e
+                self.raise_if_out_of_time(e)
                 continue
         else:
             # If all methods failed
@@ -406,6 +521,7 @@ class Backend(Base):
             pass  # In headless mode, maximize might fail
             
         self.driver.implicitly_wait(self.timeout)
+        self.driver.set_page_load_timeout(NAVIGATION_PAGE_LOAD_TIMEOUT)
 
     def _try_webdriver_manager(self, options):
         """Try to initialize using webdriver-manager"""
@@ -491,16 +607,14 @@ class Backend(Base):
         return error_msg
 
     def handle_consent_page(self):
-        """Handle Google's consent page if it appears"""
+        """
+        Check the page right after a navigation. Google's consent page is accepted, and a
+        page that still blocks Maps (captcha, unusual traffic) raises blocking.BlockedError
+        """
+        state = blocking.check_page(self.driver)
+        Communicator.show_message(f"[DEBUG] Page after navigation: {state}")
         try:
-            # Check if we're on a consent page
-            current_url = self.driver.current_url
-            page_title = self.driver.title
-            
-            Communicator.show_message(f"[DEBUG] Current URL: {current_url}")
-            Communicator.show_message(f"[DEBUG] Page Title: {page_title}")
-            
-            if "consent.google.com" in current_url or "consent" in page_title.lower():
+            if state == blocking.PAGE_CONSENT:
                 Communicator.show_message("[DEBUG] Detected Google consent page, attempting to handle...")
                 
                 # Add timeout for consent handling to prevent hanging
@@ -617,70 +731,38 @@ class Backend(Base):
                     
                     Communicator.show_message(f"[DEBUG] Alternative consent result: {alternative_result}")
                 
-                # Wait a moment for the redirect
-                sleep(5)
-                
-                # Check if we're now on Google Maps
-                new_url = self.driver.current_url
-                new_title = self.driver.title
+                # Wait for the redirect, only as long as it takes
+                try:
+                    WebDriverWait(self.driver, CONSENT_REDIRECT_TIMEOUT, poll_frequency=0.25).until(
+                        lambda driver: "consent." not in driver.current_url
+                    )
+                except TimeoutException:
+                    pass
                 
-                Communicator.show_message(f"[DEBUG] After consent - URL: {new_url}")
-                Communicator.show_message(f"[DEBUG] After consent - Title: {new_title}")
-                
-                if "google.com/maps" in new_url:
-                    Communicator.show_message("[DEBUG] Successfully redirected to Google Maps!")
-                else:
-                    Communicator.show_message("[DEBUG] Still not on Google Maps, may need manual intervention")
-                    
-            else:
-                Communicator.show_message("[DEBUG] No consent page detected, proceeding normally")
+                state = blocking.check_page(self.driver)
+                Communicator.show_message(f"[DEBUG] Page after consent: {state}")
                 
         except Exception as e:
             Communicator.show_message(f"[DEBUG] Error handling consent page: {str(e)}")
 
+        blocking.raise_if_blocked(state, metrics=self.metrics)
+
     def mainscraping(self):
         try:
-            querywithplus = "+".join(self.searchquery.split())
-            
-            # Railway debugging - log the search query
-            if os.environ.get('RAILWAY_ENVIRONMENT'):
-                Communicator.show_message(f"[DEBUG] Railway search query: '{self.searchquery}'")
-                Communicator.show_message(f"[DEBUG] Query with plus: '{querywithplus}'")
-
-            """
-            link of page variable contains the link of page of google maps that user wants to scrape.
-            We have make it by inserting search query in it
-            """
-
-            # Use URL parameters to bypass consent page on Railway
-            if os.environ.get('RAILWAY_ENVIRONMENT'):
-                # Try different URL format for Railway that might work better
-                link_of_page = f"https://www.google.com/maps/search/{querywithplus}?hl=en&gl=US"
-                Communicator.show_message(f"[DEBUG] Railway URL: {link_of_page}")
+            if self.resumed is not None:
+                self.resumescraping()
+            elif self.engine == "http":
+                self.httpscraping()
+            elif self.bbox is not None:
+                self.tiledscraping()
             else:
-                link_of_page = f"https://www.google.com/maps/search/{querywithplus}/?hl=en&gl=US&consent=PENDING&continue=https://www.google.com/maps"
-
-            # ==========================================
-
-            Communicator.show_message(f"[DEBUG] Opening URL: {link_of_page}")
-            self.openingurl(url=link_of_page)
-
-            # Check if we're on a consent page and handle it
-            Communicator.show_message("[DEBUG] Checking for consent page...")
-            self.handle_consent_page()
-            Communicator.show_message("[DEBUG] Consent page handling completed")
-
-            Communicator.show_message("Working start...")
-            Communicator.show_message("[DEBUG] About to start scrolling...")
-
-            # Add Railway-specific timeout and progress reporting
-            if os.environ.get('RAILWAY_ENVIRONMENT'):
-                Communicator.show_message("[DEBUG] Railway environment detected - using optimized scrolling...")
-                
-            self.scroller.scroll()
-            
-            Communicator.show_message("[DEBUG] Scrolling completed")
+                self.browserscraping()
             
+        except blocking.BlockedError as e:
+            self.blocked = e.kind
+            ProxyPool.blocked(self.driver)
+            Communicator.show_message(f"❌ {e}. Stopping the job, try again later or from another network.")
+
         except Exception as e:
             """
             Handling all errors.If any error occurs like user has closed the self.driver and if 'no such window' error occurs
@@ -696,12 +778,133 @@ class Backend(Base):
 
         finally:
             try:
-                Communicator.show_message("Closing the driver")
-                if hasattr(self, 'driver'):
+                if self.driver is not None:
+                    Communicator.show_message("Closing the driver")
                     self.driver.close()
                     self.driver.quit()
             except:  # if browser is always closed due to error
                 pass
 
+            if self.journal is not None:
+                self.journal.close()
+            if self.deadline.partial():
+                Communicator.show_message(
+                    f"Partial results: the time budget ran out during {', '.join(self.deadline.cut_stages())}"
+                )
+            # Also when nothing was saved or the job failed, so frontends always see it end
+            Communicator.emit_progress(PHASE_DONE)
             Communicator.end_processing()
-            Communicator.show_message("Now you can start another session")
\ No newline at end of file
+            Communicator.show_message("Now you can start another session")
+
+    def resumescraping(self):
+        """Open the places the interrupted run of the job had not parsed yet"""
+        rows, links = self.resumed
+        Communicator.show_message(f"Resuming the interrupted run: {len(rows)} places are already parsed")
+        for row in rows:
+            Communicator.add_extracted_row(row)
+
+        if self.driver is None:
+            self.init_driver()
+        parser = Parser(self.driver, self.deadline, self.cache, self.journal, self.metrics)
+        parser.finalData = rows  # saved together with the remaining places
+        parser.main(links)
+
+    def httpscraping(self):
+        """Scrape over plain HTTP, starting Chrome only for the places that need it"""
+        rows, fallbackLinks = HttpEngine(self.searchquery, mode=self.mode, bbox=self.bbox, deadline=self.deadline,
+                                            cache=self.cache, metrics=self.metrics).run()
+
+        if rows is None:
+            Communicator.show_message("Search results are not available over HTTP, using the browser instead")
+            self.init_driver()
+            self.scroller = Scroller(driver=self.driver, mode=self.mode, deadline=self.deadline, cache=self.cache,
+                                     journal=self.journal, metrics=self.metrics)
+            if self.bbox is not None:
+                self.tiledscraping()
+            else:
+                self.browserscraping()
+            return
+
+        if fallbackLinks and not Common.close_thread_is_set() and not self.deadline.expired():
+            Communicator.show_message(f"Opening {len(fallbackLinks)} places that need the browser...")
+            self.init_driver()
+            parser = Parser(self.driver, self.deadline, self.cache, self.journal, self.metrics)
+            parser.finalData = rows  # saved together with the browser rows
+            parser.main(fallbackLinks)
+        else:
+            DataSaver().save(datalist=rows)
+
+    def tiledscraping(self):
+        """Search the area tile by tile in the browser, then handle the merged results once"""
+        self.deadline.enter("scroll")
+        Communicator.emit_progress(PHASE_NAVIGATING)
+        rows = tiling.TilePlanner(self.bbox, self.search_tile, workers=1, deadline=self.deadline,
+                                  maxFailureRate=1, metrics=self.metrics).run()
+        if rows is None:
+            Communicator.show_message("The search failed in every area, nothing was found")
+            return
+        Communicator.show_message(f"Total locations found in the area: {len(rows)}")
+
+        if Common.close_thread_is_set():
+            return
+        if self.mode == "list":
+            self.scroller.save_list(rows)
+        elif INCREMENTAL_REFRESH:
+            self.scroller.refresh(rows)
+        else:
+            parser = Parser(self.driver, self.deadline, self.cache, self.journal, self.metrics)
+            parser.main([row["Google Maps URL"] for row in rows])
+
+    def search_tile(self, tile):
+        """Result rows of the search query within the tile's viewport"""
+        self.openingurl(url=tiling.search_url(self.searchquery, tile))
+        self.handle_consent_page()
+        scroller = Scroller(driver=self.driver, mode=self.mode, collectOnly=True, deadline=self.deadline,
+                            metrics=self.metrics)
+        scroller.scroll()
+        return scroller.results()
+
+    def browserscraping(self):
+        """Scrape by driving Chrome through the search results and every place"""
+        querywithplus = "+".join(self.searchquery.split())
+        
+        # Railway debugging - log the search query
+        if os.environ.get('RAILWAY_ENVIRONMENT'):
+            Communicator.show_message(f"[DEBUG] Railway search query: '{self.searchquery}'")
+            Communicator.show_message(f"[DEBUG] Query with plus: '{querywithplus}'")
+
+        """
+        link of page variable contains the link of page of google maps that user wants to scrape.
+        We have make it by inserting search query in it
+        """
+
+        # Use URL parameters to bypass consent page on Railway
+        if os.environ.get('RAILWAY_ENVIRONMENT'):
+            # Try different URL format for Railway that might work better
+            link_of_page = f"https://www.google.com/maps/search/{querywithplus}?hl=en&gl=US"
+            Communicator.show_message(f"[DEBUG] Railway URL: {link_of_page}")
+        else:
+            link_of_page = f"https://www.google.com/maps/search/{querywithplus}/?hl=en&gl=US&consent=PENDING&continue=https://www.google.com/maps"
+
+        # ==========================================
+
+        self.deadline.enter("scroll")
+        Communicator.emit_progress(PHASE_NAVIGATING)
+        Communicator.show_message(f"[DEBUG] Opening URL: {link_of_page}")
+        self.openingurl(url=link_of_page)
+
+        # Check if we're on a consent page and handle it
+        Communicator.show_message("[DEBUG] Checking for consent page...")
+        self.handle_consent_page()
+        Communicator.show_message("[DEBUG] Consent page handling completed")
+
+        Communicator.show_message("Working start...")
+        Communicator.show_message("[DEBUG] About to start scrolling...")
+
+        # Add Railway-specific timeout and progress reporting
+        if os.environ.get('RAILWAY_ENVIRONMENT'):
+            Communicator.show_message("[DEBUG] Railway environment detected - using optimized scrolling...")
+            
+        self.scroller.scroll()
+        
+        Communicator.show_message("[DEBUG] Scrolling completed")
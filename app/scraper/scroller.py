@@ -4,10 +4,38 @@ try:
     from scraper.communicator import Communicator
     from scraper.common import Common
     from scraper.parser import Parser
+    from scraper.progress import PHASE_SCROLLING
+    from scraper.deadline import Deadline
+    from scraper.metrics import Metrics
+    from scraper import blocking
+    from scraper import devtools
+    from scraper.search_capture import SearchCapture
+    from scraper.placekey import place_key, unique_links
+    from scraper.place_cache import PlaceCache, plan_refresh
+    from scraper.feed_cards import FeedCards
+    from scraper.datasaver import DataSaver
+    from scraper.parser import OUTPUT_COLUMNS
+    from scraper.place_state import REQUIRED_FIELDS
+    from settings import CAPTURE_SEARCH_RESULTS, DEFAULT_MODE, LIST_MODE_DETAIL_MISSING, DEBUG_SCRIPTS
+    from settings import INCREMENTAL_REFRESH
 except ImportError:
     from app.scraper.communicator import Communicator
     from app.scraper.common import Common
     from app.scraper.parser import Parser
+    from app.scraper.progress import PHASE_SCROLLING
+    from app.scraper.deadline import Deadline
+    from app.scraper.metrics import Metrics
+    from app.scraper import blocking
+    from app.scraper import devtools
+    from app.scraper.search_capture import SearchCapture
+    from app.scraper.placekey import place_key, unique_links
+    from app.scraper.place_cache import PlaceCache, plan_refresh
+    from app.scraper.feed_cards import FeedCards
+    from app.scraper.datasaver import DataSaver
+    from app.scraper.parser import OUTPUT_COLUMNS
+    from app.scraper.place_state import REQUIRED_FIELDS
+    from app.settings import CAPTURE_SEARCH_RESULTS, DEFAULT_MODE, LIST_MODE_DETAIL_MISSING, DEBUG_SCRIPTS
+    from app.settings import INCREMENTAL_REFRESH
 from bs4 import BeautifulSoup
 from selenium.common.exceptions import JavascriptException
 from selenium.webdriver.support.ui import WebDriverWait
@@ -16,17 +44,117 @@ from selenium.webdriver.common.by import By
 
 class Scroller:
 
-    def __init__(self, driver) -> None:
+    def __init__(self, driver, mode=DEFAULT_MODE, collectOnly=False, deadline=None, cache=None, journal=None,
+                 metrics=None) -> None:
+        """
+        collectOnly: only scroll, the caller reads the results from results()
+        deadline: the job's deadline.Deadline, None for no deadline
+        cache: place_cache.PlaceCache of the job's parser, None for no cache
+        journal: journal.Journal of the job's parser, None for no journal
+        metrics: the job's metrics.Metrics, None for counters of its own
+        """
         self.driver = driver
+        self.metrics = metrics or Metrics()
+        self.deadline = deadline or Deadline(metrics=self.metrics)
+        self.cache = cache
+        self.journal = journal
+        self.mode = mode
+        self.collectOnly = collectOnly
+        self.searchCapture = None
+        self.feedCards = None
+        self.__allResultsLinks = []
     
     def __init_parser(self):
-        self.parser = Parser(self.driver)
+        self.parser = Parser(self.driver, self.deadline, self.cache, self.journal, self.metrics)
 
 
     def start_parsing(self):
+        if self.collectOnly:
+            return
+
+        if INCREMENTAL_REFRESH:
+            self.refresh()
+            return
+
         self.__init_parser() # init parser object on fly
 
         self.parser.main(self.__allResultsLinks)
+
+    def handle_results(self):
+        """Save the scrolled results in list mode, else parse their places"""
+        if self.collectOnly:
+            return
+        if self.mode == "list":
+            self.save_list()
+        else:
+            self.start_parsing()
+
+    def refresh(self, rows=None):
+        """
+        Incremental refresh of the result rows (default results()): carry forward the
+        places whose card did not change since they were last parsed, and only open the others
+        """
+        self.__init_parser()
+        cache = self.cache or PlaceCache(metrics=self.metrics)
+        carried, links = plan_refresh(self.results() if rows is None else rows, cache)
+        Communicator.show_message(f"{len(carried)} places are unchanged since the last run, {len(links)} will be opened")
+
+        carried = [{column: row.get(column) for column in OUTPUT_COLUMNS} for row in carried]
+        for row in carried:
+            Communicator.add_extracted_row(row)
+        self.parser.finalData = carried  # saved together with the parsed rows
+        self.parser.main(links)
+
+    def results(self):
+        """
+        Rows of the scrolled results: the captured and card fields that were read,
+        or only the "Google Maps URL" of results that were just linked in the feed
+        """
+        capturedRows = self.searchCapture.rows if self.searchCapture else {}
+        rows = self.feedCards.merge(capturedRows) if self.feedCards else list(capturedRows.values())
+        known = {place_key(row["Google Maps URL"]) or row["Google Maps URL"] for row in rows}
+        for link in self.__allResultsLinks:
+            if (place_key(link) or link) not in known:
+                rows.append({"Google Maps URL": link})
+        return rows
+
+    def save_list(self, rows=None):
+        """
+        List mode: save the rows of the search results (default results()) without
+        opening the places. With LIST_MODE_DETAIL_MISSING, places missing a required
+        field are parsed in full
+        """
+        rows = self.results() if rows is None else rows
+        rows = [{column: row.get(column) for column in OUTPUT_COLUMNS} for row in rows]
+
+        complete, incomplete = [], []
+        for row in rows:
+            if LIST_MODE_DETAIL_MISSING and not all(row.get(field) for field in REQUIRED_FIELDS):
+                incomplete.append(row)
+            else:
+                complete.append(row)
+
+        Communicator.show_message(f"Collected {len(complete)} places from the search results")
+        for row in complete:
+            Communicator.add_extracted_row(row)
+
+        if incomplete and not Common.close_thread_is_set():
+            Communicator.show_message(f"Opening {len(incomplete)} places with missing details...")
+            self.__init_parser()
+            self.parser.finalData = complete  # saved together with the parsed rows
+            self.parser.main([row["Google Maps URL"] for row in incomplete])
+        else:
+            DataSaver().save(datalist=complete)
+
+    def __feed_links(self, scrollAbleElement):
+        """Canonical links of all results rendered in the feed, one per place"""
+        allResultsListSoup = BeautifulSoup(
+            scrollAbleElement.get_attribute('outerHTML'), 'html.parser')
+
+        allResultsAnchorTags = allResultsListSoup.find_all(
+            'a', class_='hfpxzc')
+
+        return unique_links(anchorTag.get('href') for anchorTag in allResultsAnchorTags)
         
 
     
@@ -34,6 +162,7 @@ class Scroller:
         """In case search results are not available"""
 
         Communicator.show_message(message="[DEBUG] Starting scroll method...")
+        Communicator.emit_progress(PHASE_SCROLLING)
         
         # Railway-specific optimizations
         is_railway = os.environ.get('RAILWAY_ENVIRONMENT')
@@ -49,11 +178,14 @@ class Scroller:
         scrollAbleElement = None
         
         for attempt in range(max_attempts):
+            if self.deadline.expired():
+                Communicator.show_message(message="[DEBUG] Out of time while waiting for the search results")
+                break
             try:
                 Communicator.show_message(message=f"[DEBUG] Attempt {attempt + 1}/{max_attempts} - Checking for feed element...")
                 
                 # Wait a bit for the page to load (longer for Railway)
-                time.sleep(base_wait_time)
+                time.sleep(self.deadline.clamp(base_wait_time))
                 
                 # Try multiple selectors for the scrollable search results area
                 scrollAbleElement = self.driver.execute_script(
@@ -89,150 +221,154 @@ class Scroller:
                 else:
                     Communicator.show_message(message=f"[DEBUG] No scrollable element found on attempt {attempt + 1}")
                     
+                    # A blocked page has no feed: stop now instead of waiting out the attempts
+                    blocking.raise_if_blocked(blocking.check_page(self.driver), metrics=self.metrics)
+                    
                     # Comprehensive page analysis
-                    page_analysis = self.driver.execute_script(
-                        """
-                        var analysis = {
-                            title: document.title,
-                            url: window.location.href,
-                            hasResults: false,
-                            elements: [],
-                            possibleContainers: []
-                        };
+                    if DEBUG_SCRIPTS:
+                        page_analysis = self.driver.execute_script(
+                            """
+                            var analysis = {
+                                title: document.title,
+                                url: window.location.href,
+                                hasResults: false,
+                                elements: [],
+                                possibleContainers: []
+                            };
                         
-                        // Check for common Google Maps elements
-                        var commonSelectors = [
-                            "[role='main']", ".m6QErb", "[data-value='Directions']", 
-                            ".section-layout", ".section-result", ".section-listbox",
-                            "[role='region']", "[role='feed']", ".section-scrollbox"
-                        ];
+                            // Check for common Google Maps elements
+                            var commonSelectors = [
+                                "[role='main']", ".m6QErb", "[data-value='Directions']", 
+                                ".section-layout", ".section-result", ".section-listbox",
+                                "[role='region']", "[role='feed']", ".section-scrollbox"
+                            ];
                         
-                        commonSelectors.forEach(function(selector) {
-                            var elements = document.querySelectorAll(selector);
-                            if (elements.length > 0) {
-                                analysis.elements.push(selector + ": " + elements.length);
-                            }
-                        });
+                            commonSelectors.forEach(function(selector) {
+                                var elements = document.querySelectorAll(selector);
+                                if (elements.length > 0) {
+                                    analysis.elements.push(selector + ": " + elements.length);
+                                }
+                            });
                         
-                        // Look for any scrollable divs
-                        var allDivs = document.querySelectorAll('div');
-                        for (var i = 0; i < Math.min(allDivs.length, 50); i++) {
-                            var div = allDivs[i];
-                            if (div.scrollHeight > div.clientHeight && div.clientHeight > 100) {
-                                var classes = div.className || 'no-class';
-                                var id = div.id || 'no-id';
-                                analysis.possibleContainers.push('scrollable-div: ' + classes.substring(0, 50) + ' id:' + id);
+                            // Look for any scrollable divs
+                            var allDivs = document.querySelectorAll('div');
+                            for (var i = 0; i < Math.min(allDivs.length, 50); i++) {
+                                var div = allDivs[i];
+                                if (div.scrollHeight > div.clientHeight && div.clientHeight > 100) {
+                                    var classes = div.className || 'no-class';
+                                    var id = div.id || 'no-id';
+                                    analysis.possibleContainers.push('scrollable-div: ' + classes.substring(0, 50) + ' id:' + id);
+                                }
                             }
-                        }
                         
-                        // Check if there are any search results indicators
-                        var resultIndicators = document.querySelectorAll('[data-result-index], .section-result, [aria-label*="result"]');
-                        analysis.hasResults = resultIndicators.length > 0;
+                            // Check if there are any search results indicators
+                            var resultIndicators = document.querySelectorAll('[data-result-index], .section-result, [aria-label*="result"]');
+                            analysis.hasResults = resultIndicators.length > 0;
                         
-                        return analysis;
-                        """
-                    )
+                            return analysis;
+                            """
+                        )
                     
-                    if page_analysis:
-                          Communicator.show_message(message=f"[DEBUG] Page Analysis:")
-                          Communicator.show_message(message=f"[DEBUG] Title: {page_analysis.get('title', 'Unknown')}")
-                          Communicator.show_message(message=f"[DEBUG] URL: {page_analysis.get('url', 'Unknown')}")
-                          Communicator.show_message(message=f"[DEBUG] Has Results: {page_analysis.get('hasResults', False)}")
-                          Communicator.show_message(message=f"[DEBUG] Elements found: {page_analysis.get('elements', [])}")
-                          Communicator.show_message(message=f"[DEBUG] Scrollable containers: {page_analysis.get('possibleContainers', [])}")
+                        if page_analysis:
+                              Communicator.show_message(message=f"[DEBUG] Page Analysis:")
+                              Communicator.show_message(message=f"[DEBUG] Title: {page_analysis.get('title', 'Unknown')}")
+                              Communicator.show_message(message=f"[DEBUG] URL: {page_analysis.get('url', 'Unknown')}")
+                              Communicator.show_message(message=f"[DEBUG] Has Results: {page_analysis.get('hasResults', False)}")
+                              Communicator.show_message(message=f"[DEBUG] Elements found: {page_analysis.get('elements', [])}")
+                              Communicator.show_message(message=f"[DEBUG] Scrollable containers: {page_analysis.get('possibleContainers', [])}")
                           
-                          # Add comprehensive HTML structure debugging
-                          html_debug = self.driver.execute_script(
-                              """
-                              var debug = {
-                                  feedElement: null,
-                                  gaBwheElement: null,
-                                  allLinks: [],
-                                  bodyStructure: '',
-                                  feedHTML: '',
-                                  gaBwheHTML: ''
-                              };
-                              
-                              // Check feed element
-                              var feed = document.querySelector("[role='feed']");
-                              if (feed) {
-                                  debug.feedElement = {
-                                      className: feed.className,
-                                      innerHTML: feed.innerHTML.substring(0, 500),
-                                      childrenCount: feed.children.length,
-                                      scrollHeight: feed.scrollHeight,
-                                      clientHeight: feed.clientHeight
+                              # Add comprehensive HTML structure debugging
+                              html_debug = self.driver.execute_script(
+                                  """
+                                  var debug = {
+                                      feedElement: null,
+                                      gaBwheElement: null,
+                                      allLinks: [],
+                                      bodyStructure: '',
+                                      feedHTML: '',
+                                      gaBwheHTML: ''
                                   };
-                                  debug.feedHTML = feed.outerHTML.substring(0, 1000);
-                              }
                               
-                              // Check gaBwhe element
-                              var gaBwhe = document.querySelector(".gaBwhe");
-                              if (gaBwhe) {
-                                  debug.gaBwheElement = {
-                                      className: gaBwhe.className,
-                                      innerHTML: gaBwhe.innerHTML.substring(0, 500),
-                                      childrenCount: gaBwhe.children.length,
-                                      scrollHeight: gaBwhe.scrollHeight,
-                                      clientHeight: gaBwhe.clientHeight,
-                                      parentClassName: gaBwhe.parentElement ? gaBwhe.parentElement.className : 'no-parent'
-                                  };
-                                  debug.gaBwheHTML = gaBwhe.outerHTML.substring(0, 1000);
-                              }
+                                  // Check feed element
+                                  var feed = document.querySelector("[role='feed']");
+                                  if (feed) {
+                                      debug.feedElement = {
+                                          className: feed.className,
+                                          innerHTML: feed.innerHTML.substring(0, 500),
+                                          childrenCount: feed.children.length,
+                                          scrollHeight: feed.scrollHeight,
+                                          clientHeight: feed.clientHeight
+                                      };
+                                      debug.feedHTML = feed.outerHTML.substring(0, 1000);
+                                  }
                               
-                              // Find all links
-                              var allLinks = document.querySelectorAll('a');
-                              debug.allLinks = Array.from(allLinks).slice(0, 10).map(function(link) {
-                                  return {
-                                      href: link.href,
-                                      text: link.textContent.substring(0, 50),
-                                      className: link.className
-                                  };
-                              });
+                                  // Check gaBwhe element
+                                  var gaBwhe = document.querySelector(".gaBwhe");
+                                  if (gaBwhe) {
+                                      debug.gaBwheElement = {
+                                          className: gaBwhe.className,
+                                          innerHTML: gaBwhe.innerHTML.substring(0, 500),
+                                          childrenCount: gaBwhe.children.length,
+                                          scrollHeight: gaBwhe.scrollHeight,
+                                          clientHeight: gaBwhe.clientHeight,
+                                          parentClassName: gaBwhe.parentElement ? gaBwhe.parentElement.className : 'no-parent'
+                                      };
+                                      debug.gaBwheHTML = gaBwhe.outerHTML.substring(0, 1000);
+                                  }
+                              
+                                  // Find all links
+                                  var allLinks = document.querySelectorAll('a');
+                                  debug.allLinks = Array.from(allLinks).slice(0, 10).map(function(link) {
+                                      return {
+                                          href: link.href,
+                                          text: link.textContent.substring(0, 50),
+                                          className: link.className
+                                      };
+                                  });
                               
-                              // Get body structure overview
-                              var bodyChildren = Array.from(document.body.children).map(function(child) {
-                                  return child.tagName + '.' + child.className.split(' ').join('.');
-                              });
-                              debug.bodyStructure = bodyChildren.join(', ');
+                                  // Get body structure overview
+                                  var bodyChildren = Array.from(document.body.children).map(function(child) {
+                                      return child.tagName + '.' + child.className.split(' ').join('.');
+                                  });
+                                  debug.bodyStructure = bodyChildren.join(', ');
                               
-                              return debug;
-                              """
-                          )
+                                  return debug;
+                                  """
+                              )
                           
-                          Communicator.show_message(message=f"[DEBUG] === DETAILED HTML ANALYSIS ===")
-                          if html_debug.get('feedElement'):
-                              Communicator.show_message(message=f"[DEBUG] Feed Element: {html_debug['feedElement']}")
-                          else:
-                              Communicator.show_message(message=f"[DEBUG] Feed Element: NOT FOUND")
+                              Communicator.show_message(message=f"[DEBUG] === DETAILED HTML ANALYSIS ===")
+                              if html_debug.get('feedElement'):
+                                  Communicator.show_message(message=f"[DEBUG] Feed Element: {html_debug['feedElement']}")
+                              else:
+                                  Communicator.show_message(message=f"[DEBUG] Feed Element: NOT FOUND")
                               
-                          if html_debug.get('gaBwheElement'):
-                              Communicator.show_message(message=f"[DEBUG] GaBwhe Element: {html_debug['gaBwheElement']}")
-                          else:
-                              Communicator.show_message(message=f"[DEBUG] GaBwhe Element: NOT FOUND")
+                              if html_debug.get('gaBwheElement'):
+                                  Communicator.show_message(message=f"[DEBUG] GaBwhe Element: {html_debug['gaBwheElement']}")
+                              else:
+                                  Communicator.show_message(message=f"[DEBUG] GaBwhe Element: NOT FOUND")
                               
-                          Communicator.show_message(message=f"[DEBUG] All Links (first 10): {html_debug.get('allLinks', [])}")
-                          Communicator.show_message(message=f"[DEBUG] Body Structure: {html_debug.get('bodyStructure', 'Unknown')}")
+                              Communicator.show_message(message=f"[DEBUG] All Links (first 10): {html_debug.get('allLinks', [])}")
+                              Communicator.show_message(message=f"[DEBUG] Body Structure: {html_debug.get('bodyStructure', 'Unknown')}")
                           
-                          if html_debug.get('feedHTML'):
-                              Communicator.show_message(message=f"[DEBUG] Feed HTML Sample: {html_debug['feedHTML'][:200]}...")
-                          if html_debug.get('gaBwheHTML'):
-                              Communicator.show_message(message=f"[DEBUG] GaBwhe HTML Sample: {html_debug['gaBwheHTML'][:200]}...")
+                              if html_debug.get('feedHTML'):
+                                  Communicator.show_message(message=f"[DEBUG] Feed HTML Sample: {html_debug['feedHTML'][:200]}...")
+                              if html_debug.get('gaBwheHTML'):
+                                  Communicator.show_message(message=f"[DEBUG] GaBwhe HTML Sample: {html_debug['gaBwheHTML'][:200]}...")
                           
-                          # Take a screenshot for debugging (only on first attempt)
-                          if attempt == 0:
-                              try:
-                                  screenshot_path = f"/tmp/railway_debug_screenshot_{attempt + 1}.png"
-                                  self.driver.save_screenshot(screenshot_path)
-                                  Communicator.show_message(message=f"[DEBUG] Screenshot saved to: {screenshot_path}")
+                              # Take a screenshot for debugging (only on first attempt)
+                              if attempt == 0:
+                                  try:
+                                      screenshot_path = f"/tmp/railway_debug_screenshot_{attempt + 1}.png"
+                                      self.driver.save_screenshot(screenshot_path)
+                                      Communicator.show_message(message=f"[DEBUG] Screenshot saved to: {screenshot_path}")
                                   
-                                  # Also get page source sample
-                                  page_source = self.driver.page_source
-                                  source_sample = page_source[:2000] if page_source else "No page source"
-                                  Communicator.show_message(message=f"[DEBUG] Page Source Sample: {source_sample}...")
+                                      # Also get page source sample
+                                      page_source = self.driver.page_source
+                                      source_sample = page_source[:2000] if page_source else "No page source"
+                                      Communicator.show_message(message=f"[DEBUG] Page Source Sample: {source_sample}...")
                                   
-                              except Exception as e:
-                                  Communicator.show_message(message=f"[DEBUG] Screenshot failed: {e}")
+                                  except Exception as e:
+                                      Communicator.show_message(message=f"[DEBUG] Screenshot failed: {e}")
                     
                     # Try to find ANY scrollable element as a last resort
                     if attempt >= 3:  # After 3 attempts, try more aggressive approach
@@ -254,6 +390,8 @@ class Scroller:
                             scrollAbleElement = any_scrollable
                             break
                         
+            except blocking.BlockedError:
+                raise
             except Exception as e:
                 error_msg = str(e)
                 Communicator.show_message(message=f"[DEBUG] Error on attempt {attempt + 1}: {error_msg}")
@@ -348,8 +486,7 @@ class Scroller:
                          if place_links:
                              Communicator.show_message(message=f"[DEBUG] Using {len(place_links)} place links from HTML source")
                              self.__allResultsLinks = place_links
-                             self.__init_parser()
-                             self.start_parsing()
+                             self.handle_results()
                              return
                          
                      except Exception as basic_error:
@@ -546,13 +683,13 @@ class Scroller:
                  if visible_results and len(visible_results) > 0:
                      Communicator.show_message(message=f"[DEBUG] Found {len(visible_results)} visible results without scrolling")
                      self.__allResultsLinks = visible_results
-                     self.__init_parser()
-                     self.start_parsing()
+                     self.handle_results()
                      return
                  else:
                      Communicator.show_message(message="[DEBUG] No visible results found in Railway fallback")
              
              Communicator.show_message(message="We are sorry but, No results found for your search query on googel maps....")
+             return
 
         else:
             Communicator.show_message(message="Starting scrolling")
@@ -711,7 +848,8 @@ class Scroller:
             except Exception as extract_error:
                 Communicator.show_message(message=f"[DEBUG] Search results extraction failed: {extract_error}")
         
-            # Debug the scrollable element we're about to use
+        # Debug the scrollable element we're about to use
+        if DEBUG_SCRIPTS:
             element_debug = self.driver.execute_script(
                 """
                 var element = arguments[0];
@@ -729,69 +867,89 @@ class Scroller:
                 """, 
                 scrollAbleElement
             )
-            
+        
             Communicator.show_message(message=f"[DEBUG] === SCROLLING ELEMENT DEBUG ===")
             Communicator.show_message(message=f"[DEBUG] Element Info: {element_debug}")
 
-            last_height = 0
+        # Results arrive in search responses, so they are decoded instead of re-parsing the feed
+        if CAPTURE_SEARCH_RESULTS:
+            self.searchCapture = SearchCapture(self.driver, self.metrics)
+            self.searchCapture.capture_initial()
 
-            while True:
-                if Common.close_thread_is_set():
-                    self.driver.quit()
-                    return
+        # List mode (and a refresh, to compare them) reads the cards of each scroll batch
+        if self.mode == "list" or INCREMENTAL_REFRESH:
+            self.feedCards = FeedCards(self.driver, self.metrics)
+            self.feedCards.collect(scrollAbleElement)
 
-                """again finding element to avoid StaleElementReferenceException"""
-                scrollAbleElement = self.driver.execute_script(
-                    """return document.querySelector("[role='feed']")"""
-                )
-                self.driver.execute_script(
-                    "arguments[0].scrollTo(0, arguments[0].scrollHeight);",
-                    scrollAbleElement,
-                )
-                time.sleep(2)
+        last_height = 0
 
+        while True:
+            if Common.close_thread_is_set():
+                self.driver.quit()
+                return
+            if self.deadline.expired():
+                Communicator.show_message(f"Out of time for scrolling, going on with {len(self.__allResultsLinks)} results")
+                break
 
-                # get new scroll height and compare with last scroll height.
-                new_height = self.driver.execute_script(
-                    "return arguments[0].scrollHeight", scrollAbleElement
-                )
-                if new_height == last_height:
-                    """checking if we have reached end of the list"""
+            """again finding element to avoid StaleElementReferenceException"""
+            scrollAbleElement = self.driver.execute_script(
+                """return document.querySelector("[role='feed']")"""
+            )
+            self.driver.execute_script(
+                "arguments[0].scrollTo(0, arguments[0].scrollHeight);",
+                scrollAbleElement,
+            )
+            time.sleep(2)
+            events = devtools.drain_network_events(self.driver, self.metrics)
+            if self.searchCapture:
+                self.searchCapture.collect(events)
+            if self.feedCards:
+                self.feedCards.collect(scrollAbleElement)
 
-                    script = f"""
-                    const endingElement = document.querySelector(".PbZDve ");
-                    return endingElement;
-                    """
+            # get new scroll height and compare with last scroll height.
+            new_height = self.driver.execute_script(
+                "return arguments[0].scrollHeight", scrollAbleElement
+            )
+            if new_height == last_height:
+                """checking if we have reached end of the list"""
 
-                    endAlertElement = self.driver.execute_script(
-                        script)  # to know that we are at end of list or not
-
-                    if endAlertElement is None:
-                        """if it returns empty list its mean we are not at the end of list"""
-                        try:  # sometimes google maps load results when a result is clicked
-                            self.driver.execute_script(
-                                "array=document.getElementsByClassName('hfpxzc');array[array.length-1].click();"
-                            )
-                        except JavascriptException:
-                            pass
-                    else:
+                script = f"""
+                const endingElement = document.querySelector(".PbZDve ");
+                return endingElement;
+                """
+
+                endAlertElement = self.driver.execute_script(
+                    script)  # to know that we are at end of list or not
 
-                        break
+                if endAlertElement is None:
+                    """if it returns empty list its mean we are not at the end of list"""
+                    try:  # sometimes google maps load results when a result is clicked
+                        self.driver.execute_script(
+                            "array=document.getElementsByClassName('hfpxzc');array[array.length-1].click();"
+                        )
+                    except JavascriptException:
+                        pass
                 else:
-                    last_height = new_height
-                    allResultsListSoup = BeautifulSoup(
-                    scrollAbleElement.get_attribute('outerHTML'), 'html.parser')
 
-                    allResultsAnchorTags = allResultsListSoup.find_all(
-                        'a', class_='hfpxzc')
+                    break
+            else:
+                last_height = new_height
 
-                    """all the links of results"""
-                    self.__allResultsLinks = [anchorTag.get(
-                        'href') for anchorTag in allResultsAnchorTags]
-                    
-                    Communicator.show_message(f"Total locations scrolled: {len(self.__allResultsLinks)}")
+                """all the links of results"""
+                if self.searchCapture and self.searchCapture.rows:
+                    self.__allResultsLinks = self.searchCapture.links()
+                else:
+                    self.__allResultsLinks = self.__feed_links(scrollAbleElement)
+                
+                Communicator.show_message(f"Total locations scrolled: {len(self.__allResultsLinks)}")
+                Communicator.emit_progress(PHASE_SCROLLING, found=len(self.__allResultsLinks))
 
-            self.start_parsing()
+        if self.searchCapture and self.searchCapture.rows:
+            # One pass over the feed adds any result whose response was missed
+            self.__allResultsLinks = unique_links(self.searchCapture.merge_links(self.__feed_links(scrollAbleElement)))
+            Communicator.show_message(f"Captured {len(self.searchCapture.rows)} results from search responses")
+
+        self.handle_results()
 
 
                     
\ No newline at end of file
@@ -0,0 +1,108 @@
+"""
+This module contain the code for capturing search results from the network.
+Google Maps loads every page of results with a search request whose response
+already holds the place records, so they are decoded instead of scraping the feed
+"""
+
+import json
+try:
+    from scraper.placekey import place_url, place_key
+    from scraper.place_state import dig, map_record
+    from scraper.metrics import Metrics
+    from scraper.devtools import ResponseWatcher
+except ImportError:
+    from app.scraper.placekey import place_url, place_key
+    from app.scraper.place_state import dig, map_record
+    from app.scraper.metrics import Metrics
+    from app.scraper.devtools import ResponseWatcher
+
+
+# Requests that return a page of map search results
+SEARCH_URL_MARKERS = ("/search?tbm=map", "/search?authuser=0&tbm=map")
+
+# First page of results, embedded in the page that was loaded
+INITIAL_RESULTS_SCRIPT = """
+var state = window.APP_INITIALIZATION_STATE;
+var payload = state && state[3] && state[3][2];
+return typeof payload === 'string' ? payload : null;
+"""
+
+GUARD = ")]}'"
+
+
+def decode_payload(body):
+    """Json of a search response, which may be wrapped as {"d": ")]}'..."}"""
+    body = body.strip()
+    if body.endswith('/*""*/'):
+        body = body[:-len('/*""*/')]
+    if body.startswith("{"):
+        body = json.loads(body).get("d", "")
+    if body.startswith(GUARD):
+        body = body[body.index("\n") + 1:] if "\n" in body else body[len(GUARD):]
+    return json.loads(body)
+
+
+def search_records(data):
+    """Place records of a decoded search response"""
+    items = dig(data, 0, 1) or dig(data, 64) or []
+    records = []
+    for item in items:
+        record = dig(item, 14)
+        if isinstance(record, list) and isinstance(dig(record, 11), str):
+            records.append(record)
+    return records
+
+
+class SearchCapture:
+    def __init__(self, driver, metrics=None):
+        """metrics: the job's metrics.Metrics, None for counters of its own"""
+        self.driver = driver
+        self.metrics = metrics or Metrics()
+        self.rows = {}  # place key -> columns of a captured result, in arrival order
+        self.watcher = ResponseWatcher(driver, SEARCH_URL_MARKERS)
+
+    def add_payload(self, body):
+        """Decode one search response and keep its results. Returns the number of new results"""
+        try:
+            records = search_records(decode_payload(body))
+        except (ValueError, TypeError, AttributeError):
+            return 0
+
+        added = 0
+        for record in records:
+            dataId = dig(record, 10)
+            if not isinstance(dataId, str) or place_key(dataId=dataId) in self.rows:
+                continue
+            row = map_record(record)
+            row["Google Maps URL"] = place_url(row["Name"], dataId)
+            row["Place Key"] = place_key(dataId=dataId)
+            self.rows[row["Place Key"]] = row
+            added += 1
+
+        self.metrics.set("captured_results", len(self.rows))
+        return added
+
+    def capture_initial(self):
+        """Take the first page of results from the loaded page itself"""
+        try:
+            payload = self.driver.execute_script(INITIAL_RESULTS_SCRIPT)
+        except Exception:
+            return 0
+        return self.add_payload(payload) if payload else 0
+
+    def collect(self, events):
+        """Decode the search responses among drained network events"""
+        for url, body in self.watcher.collect(events):
+            self.add_payload(body)
+            self.metrics.increment("captured_search_responses")
+
+    def links(self):
+        return [row["Google Maps URL"] for row in self.rows.values()]
+
+    def merge_links(self, links):
+        """Captured links plus the given ones that were not captured"""
+        merged = self.links()
+        for link in links:
+            if place_key(link) not in self.rows:
+                merged.append(link)
+        return merged
@@ -0,0 +1,163 @@
+"""
+This module contain the code for supervising the driver while places are parsed.
+A place that fails is retried later with backoff and dead-lettered after a few
+attempts. A driver that died or hangs is replaced, and the job goes on with the
+next place instead of stopping
+"""
+
+import threading
+import time
+try:
+    from scraper.metrics import Metrics
+    from scraper.deadline import Deadline
+    from settings import PLACE_MAX_ATTEMPTS, PLACE_RETRY_BACKOFF, DRIVER_HANG_TIMEOUT, DRIVER_MAX_RELAUNCHES
+except ImportError:
+    from app.scraper.metrics import Metrics
+    from app.scraper.deadline import Deadline
+    from app.settings import PLACE_MAX_ATTEMPTS, PLACE_RETRY_BACKOFF, DRIVER_HANG_TIMEOUT, DRIVER_MAX_RELAUNCHES
+
+
+# Errors of a driver that will not answer again
+DRIVER_FAILURES = (
+    "not connected to devtools",
+    "disconnected",
+    "invalid session id",
+    "session deleted",
+    "chrome not reachable",
+    "target crashed",
+    "tab crashed",
+    "target window already closed",
+    "no such window",
+    "connection refused",
+    "max retries exceeded",
+)
+
+# Seconds a heartbeat waits for the driver's answer
+HEARTBEAT_TIMEOUT = 10
+
+
+def is_driver_failure(error):
+    text = str(error).lower()
+    return any(failure in text for failure in DRIVER_FAILURES)
+
+
+def alive(driver, timeout=HEARTBEAT_TIMEOUT):
+    """Heartbeat: True if the driver runs a script within timeout seconds"""
+    answers = []
+
+    def ping():
+        try:
+            answers.append(driver.execute_script("return 1") == 1)
+        except Exception:
+            answers.append(False)
+
+    thread = threading.Thread(target=ping, daemon=True)
+    thread.start()
+    thread.join(timeout)
+    return bool(answers and answers[0])
+
+
+class DriverSupervisor:
+    def __init__(self, getDriver, relaunch, maxAttempts=PLACE_MAX_ATTEMPTS, backoff=PLACE_RETRY_BACKOFF,
+                 hangTimeout=DRIVER_HANG_TIMEOUT, maxRelaunches=DRIVER_MAX_RELAUNCHES, deadline=None,
+                 metrics=None):
+        """
+        getDriver: function returning the driver in use
+        relaunch: function returning a new driver in place of the dead one (or None if it cannot)
+        deadline: the job's deadline.Deadline, None for no deadline
+        metrics: the job's metrics.Metrics, None for counters of its own
+        """
+        self.getDriver = getDriver
+        self.relaunch = relaunch
+        self.maxAttempts = maxAttempts
+        self.backoff = backoff
+        self.hangTimeout = hangTimeout
+        self.maxRelaunches = maxRelaunches
+        self.deadline = deadline or Deadline()
+        self.metrics = metrics or Metrics()
+        self.attempts = {}  # link -> failed attempts
+        self.due = {}  # link -> time its next attempt may start
+        self.deadLetters = []  # places given up: url, last error, attempts
+        self.relaunches = 0
+        self.lastBeat = time.time()
+        self.beatTimeout = hangTimeout  # the hang timeout of the place since the last beat
+        self.hung = False  # the watchdog closed a hung driver
+        self.stopped = threading.Event()
+
+    def start(self):
+        """
+        Start the watchdog, which closes a driver that does not finish a place in hangTimeout
+        seconds, or before the parse stage runs out of time
+        """
+        self.beat()
+        threading.Thread(target=self.__watch, daemon=True).start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def beat(self):
+        """A place started or finished: the driver is not hung"""
+        self.beatTimeout = self.deadline.clamp(self.hangTimeout)
+        self.lastBeat = time.time()
+
+    def __watch(self):
+        while not self.stopped.wait(min(10, self.hangTimeout / 4)):
+            timeout = self.beatTimeout
+            if time.time() - self.lastBeat <= timeout:
+                continue
+            # Closing the driver makes the blocked command fail, so the parser recovers
+            print(f"[DEBUG] The driver did not finish a place in {timeout:.0f} seconds, closing it")
+            self.metrics.increment("driver_hangs")
+            self.hung = True
+            self.beat()
+            try:
+                self.getDriver().quit()
+            except Exception:
+                pass
+
+    def failed(self, link, error):
+        """Record a failed attempt. True if the link is tried again later, False if it is dead-lettered"""
+        attempts = self.attempts.get(link, 0) + 1
+        self.attempts[link] = attempts
+        self.metrics.increment("place_failures")
+        if attempts >= self.maxAttempts:
+            self.deadLetters.append({"Google Maps URL": link, "Error": str(error).strip()[:200], "Attempts": attempts})
+            self.metrics.set("dead_letters", len(self.deadLetters))
+            return False
+
+        self.metrics.increment("place_retries")
+        self.due[link] = time.time() + self.backoff * 2 ** (attempts - 1)
+        return True
+
+    def wait(self, link):
+        """Sleep until the next attempt of the link is due"""
+        delay = self.deadline.clamp(self.due.pop(link, 0) - time.time())
+        if delay > 0:
+            time.sleep(delay)
+
+    def recover(self, driver, error):
+        """
+        A working driver after a failed place: the same one if it still answers,
+        else a relaunched one. Raises the error if the driver is dead and cannot be relaunched
+        """
+        hung, self.hung = self.hung, False
+        if not hung and not is_driver_failure(error) and alive(driver):
+            return driver
+        if self.deadline.expired():
+            return driver  # no time left to start a browser, the parser stops at its next place
+
+        newDriver = self.replace()
+        if newDriver is None:
+            raise error
+        return newDriver
+
+    def replace(self):
+        """A relaunched driver, or None if it cannot be relaunched or the relaunches are used up"""
+        if self.relaunches >= self.maxRelaunches:
+            return None
+        self.relaunches += 1
+        self.metrics.increment("driver_relaunches")
+        newDriver = self.relaunch()
+        if newDriver is not None:
+            self.beat()
+        return newDriver
@@ -0,0 +1,199 @@
+"""
+This module contain the code for splitting a search over an area into tiles.
+Google Maps stops a result list after about 120 places, so a query over a big
+area is searched viewport by viewport, splitting the tiles that hit that cap
+"""
+
+import math
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from urllib.parse import quote_plus
+try:
+    from scraper.communicator import Communicator
+    from scraper.common import Common
+    from scraper.metrics import Metrics
+    from scraper.deadline import Deadline
+    from scraper import blocking
+    from scraper.progress import PHASE_SCROLLING
+    from scraper.placekey import place_key
+    from settings import TILE_GRID, TILE_RESULT_CAP, TILE_MAX_DEPTH, TILE_WORKERS, TILE_MAX_FAILURE_RATE
+except ImportError:
+    from app.scraper.communicator import Communicator
+    from app.scraper.common import Common
+    from app.scraper.metrics import Metrics
+    from app.scraper.deadline import Deadline
+    from app.scraper import blocking
+    from app.scraper.progress import PHASE_SCROLLING
+    from app.scraper.placekey import place_key
+    from app.settings import TILE_GRID, TILE_RESULT_CAP, TILE_MAX_DEPTH, TILE_WORKERS, TILE_MAX_FAILURE_RATE
+
+
+Tile = namedtuple("Tile", "south west north east")
+
+# Width in pixels of the viewport a tile is searched with
+VIEWPORT_WIDTH = 1024
+
+
+def parse_bbox(text):
+    """Tile of a "south,west,north,east" string. Raises ValueError if it is not a valid box"""
+    try:
+        south, west, north, east = (float(value) for value in str(text).split(","))
+    except ValueError:
+        raise ValueError("Area must be four numbers: south,west,north,east")
+    if not (-90 <= south < north <= 90 and -180 <= west < east <= 180):
+        raise ValueError("Area must have south < north (within ±90) and west < east (within ±180)")
+    return Tile(south, west, north, east)
+
+
+def center(tile):
+    return (tile.south + tile.north) / 2, (tile.west + tile.east) / 2
+
+
+def contains(tile, latitude, longitude):
+    return tile.south <= latitude <= tile.north and tile.west <= longitude <= tile.east
+
+
+def zoom_for(tile):
+    """Zoom level at which the tile's width fills the viewport"""
+    # At zoom z the whole world (360 degrees) is 256 * 2^z pixels wide
+    span = max(tile.east - tile.west, 1e-6)
+    zoom = math.log2(360 * VIEWPORT_WIDTH / (256 * span))
+    return max(3, min(21, round(zoom, 2)))
+
+
+def search_url(searchquery, tile):
+    """Url of a search for the query within the tile's viewport"""
+    latitude, longitude = center(tile)
+    return (
+        f"https://www.google.com/maps/search/{quote_plus(searchquery)}"
+        f"/@{latitude:.6f},{longitude:.6f},{zoom_for(tile)}z?hl=en&gl=US"
+    )
+
+
+def grid(tile, rows, columns):
+    """The tile cut into rows x columns equal tiles"""
+    height = (tile.north - tile.south) / rows
+    width = (tile.east - tile.west) / columns
+    return [
+        Tile(
+            tile.south + row * height,
+            tile.west + column * width,
+            tile.south + (row + 1) * height,
+            tile.west + (column + 1) * width,
+        )
+        for row in range(rows)
+        for column in range(columns)
+    ]
+
+
+def split(tile):
+    """The four quadrants of the tile"""
+    return grid(tile, 2, 2)
+
+
+def result_key(row):
+    """Key a result is deduplicated by: its place key, else its url"""
+    url = row.get("Google Maps URL")
+    return row.get("Place Key") or place_key(url, placeId=row.get("Place ID")) or url
+
+
+class TilePlanner:
+    def __init__(self, bbox, search, workers=TILE_WORKERS, gridSize=TILE_GRID,
+                 cap=TILE_RESULT_CAP, maxDepth=TILE_MAX_DEPTH, deadline=None, maxFailureRate=TILE_MAX_FAILURE_RATE,
+                 metrics=None):
+        """
+        bbox: Tile of the whole area
+        search: function searching one tile, returning its result rows
+        (each with at least a "Google Maps URL"), or None if the search failed
+        deadline: the job's deadline.Deadline, None for no deadline
+        maxFailureRate: share of failed tile searches at which the area search gives up
+        metrics: the job's metrics.Metrics, None for counters of its own
+        """
+        self.bbox = bbox
+        self.deadline = deadline or Deadline()
+        self.metrics = metrics or Metrics()
+        self.search = search
+        self.workers = workers
+        self.gridSize = gridSize
+        self.cap = cap
+        self.maxDepth = maxDepth
+        self.maxFailureRate = maxFailureRate
+        self.results = {}  # result key -> row, in discovery order
+
+    def add(self, rows):
+        """Merge a tile's rows into the results. Returns the number of new results"""
+        added = 0
+        for row in rows:
+            latitude, longitude = row.get("Latitude"), row.get("Longitude")
+            if latitude is not None and longitude is not None and not contains(self.bbox, latitude, longitude):
+                continue  # viewports show places around the area too
+
+            key = result_key(row)
+            if key is None:
+                continue
+            if key in self.results:
+                known = self.results[key]
+                known.update({column: value for column, value in row.items() if known.get(column) is None})
+                continue
+            self.results[key] = dict(row)
+            added += 1
+        return added
+
+    def search_tile(self, tile):
+        """The tile's rows, None if its search failed"""
+        try:
+            return self.search(tile)
+        except blocking.BlockedError:
+            raise  # every other tile would be blocked too
+        except Exception as e:
+            Communicator.show_message(f"[DEBUG] Tile search failed: {e}")
+            return None
+
+    def run(self):
+        """
+        Search every tile, splitting the capped ones. Returns the merged rows, or None
+        if at least maxFailureRate of the tile searches failed
+        """
+        pending = [(tile, 0) for tile in grid(self.bbox, self.gridSize, self.gridSize)]
+        searched = 0
+        failed = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            running = {}
+            while pending or running:
+                while pending and len(running) < self.workers and not Common.close_thread_is_set():
+                    if self.deadline.expired():
+                        Communicator.show_message(f"Out of time, {len(pending)} areas are left unsearched")
+                        pending.clear()
+                        break
+                    tile, depth = pending.pop(0)
+                    running[pool.submit(self.search_tile, tile)] = (tile, depth)
+                if not running:
+                    break
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    tile, depth = running.pop(future)
+                    rows = future.result()
+                    searched += 1
+                    if rows is None:
+                        failed += 1
+                        self.metrics.increment("tiles_failed")
+                        rows = []
+                    added = self.add(rows)
+                    self.metrics.increment("tiles_searched")
+
+                    if len(rows) >= self.cap and depth < self.maxDepth:
+                        self.metrics.increment("tiles_split")
+                        pending.extend((child, depth + 1) for child in split(tile))
+
+                    Communicator.show_message(
+                        f"Area {searched}/{searched + len(pending) + len(running)}: "
+                        f"{len(rows)} results, {added} new, {len(self.results)} in total"
+                    )
+                    Communicator.emit_progress(PHASE_SCROLLING, found=len(self.results))
+
+        if failed and failed >= self.maxFailureRate * searched:
+            Communicator.show_message(f"The search failed in {failed} of {searched} areas")
+            return None
+        return list(self.results.values())
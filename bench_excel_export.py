@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the Excel export: pandas DataFrame.to_excel (openpyxl, whole
+workbook in memory) against the write-only exporter used by the scraper.
+
+Usage: python bench_excel_export.py [rows ...]   (default: 10000 100000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
+
+import pandas as pd
+from scraper import exporter
+
+
+def make_rows(count):
+    """Rows shaped like the parser output"""
+    return [
+        {
+            "Category": "Coffee shop",
+            "Name": f"Business number {index}",
+            "Phone": f"+20 10 {index:08d}",
+            "Website": f"https://business{index}.example.com/",
+            "Email": f"info@business{index}.example.com",
+            "Business Status": "Open ⋅ Closes 11 PM",
+            "Address": f"{index} Tahrir Street, Downtown, Cairo Governorate, Egypt",
+            "Total Reviews": str(index % 5000),
+            "Booking Links": None,
+            "Rating": f"{3 + (index % 20) / 10:.1f}",
+            "Hours": "Monday 8 AM-11 PM; Tuesday 8 AM-11 PM; Wednesday 8 AM-11 PM",
+            "Google Maps URL": f"https://www.google.com/maps/place/business{index}",
+        }
+        for index in range(count)
+    ]
+
+
+def pandas_export(rows, path):
+    with pd.ExcelWriter(path, engine='openpyxl') as writer:
+        pd.DataFrame(rows).to_excel(writer, sheet_name='Scraped Data', index=False)
+
+
+def exporter_export(rows, path):
+    exporter.write_xlsx(rows, path, exporter.collect_columns(rows), sheet_name='Scraped Data')
+
+
+def measure(function, rows):
+    """Return (seconds, peak MiB of python allocations)"""
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "out.xlsx")
+
+        start = time.perf_counter()
+        function(rows, path)
+        seconds = time.perf_counter() - start
+
+        # A second run under tracemalloc, so tracing does not distort the timing
+        tracemalloc.start()
+        function(rows, path)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return seconds, peak / (1024 * 1024)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [10_000, 100_000]
+
+    print(f"{'rows':>8}  {'implementation':<16} {'seconds':>8}  {'peak MiB':>9}")
+    for size in sizes:
+        rows = make_rows(size)
+        for name, function in (("pandas", pandas_export), ("exporter", exporter_export)):
+            seconds, peak = measure(function, rows)
+            print(f"{size:>8}  {name:<16} {seconds:>8.2f}  {peak:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "app"))
+sys.path.insert(0, os.path.join(ROOT, "web"))
+
+from scraper.communicator import Communicator  # noqa: E402
+from scraper.metrics import PROCESS_METRICS  # noqa: E402
+
+
+class Frontend:
+    """Frontend that keeps the messages and progress events it is sent"""
+
+    def __init__(self):
+        self.messages = []
+        self.events = []
+        self.blocked = None
+
+    def messageshowing(self, message):
+        self.messages.append(message)
+
+    def on_progress(self, event):
+        self.events.append(event)
+
+    def on_blocked(self, kind):
+        self.blocked = kind
+
+    def end_processing(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def frontend():
+    """Every test is a job of its own, and starts with no process-wide counters"""
+    PROCESS_METRICS.counters.clear()
+    frontend = Frontend()
+    Communicator.set_frontend_object(frontend)
+    yield frontend
+    Communicator.set_frontend_object(None)
+    Communicator.set_backend_object(None)
@@ -0,0 +1,24 @@
+from scraper.progress import PHASE_DONE
+from scraper.scraper import Backend
+
+
+def test_failed_job_is_done(tmp_path, monkeypatch, frontend):
+    monkeypatch.chdir(tmp_path)
+    backend = Backend("cafes", "csv", 1, engine="http")
+
+    def fail():
+        raise RuntimeError("no such window")
+
+    monkeypatch.setattr(backend, "httpscraping", fail)
+    backend.mainscraping()
+    assert any("no such window" in message for message in frontend.messages)
+    assert frontend.events[-1].phase == PHASE_DONE
+
+
+def test_jobs_keep_their_own_counters(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cafes = Backend("cafes", "csv", 1, engine="http", cache=True)
+    cafes.metrics.increment("http_places")
+    bars = Backend("bars", "csv", 1, engine="http")  # started while the cafes job runs
+    assert cafes.metrics.get("http_places") == 1 and bars.metrics.get("http_places") == 0
+    assert cafes.deadline.metrics is cafes.metrics and cafes.cache.metrics is cafes.metrics
@@ -0,0 +1,40 @@
+import pytest
+
+from scraper.blocking import (PAGE_CAPTCHA, PAGE_CONSENT, PAGE_OK, PAGE_UNUSUAL_TRAFFIC, BlockedError, check_page,
+                              classify, classify_url, raise_if_blocked)
+from scraper.metrics import Metrics
+
+
+@pytest.mark.parametrize("page, state", [
+    ({"url": "https://www.google.com/maps/search/cafe", "title": "cafe - Google Maps"}, PAGE_OK),
+    ({"url": "https://consent.google.com/ml?continue=x"}, PAGE_CONSENT),
+    ({"url": "https://www.google.com/maps", "title": "Before you continue to Google Maps"}, PAGE_CONSENT),
+    ({"url": "https://www.google.com/sorry/index?continue=x"}, PAGE_UNUSUAL_TRAFFIC),
+    ({"url": "https://www.google.com/sorry/index", "captcha": True, "unusual": True}, PAGE_CAPTCHA),
+    ({"url": "https://www.google.com/search?q=cafe", "interstitial": True}, PAGE_UNUSUAL_TRAFFIC),
+    # A review on a Maps page that mentions the phrase
+    ({"url": "https://www.google.com/maps/search/cafe", "maps": True, "unusual": True}, PAGE_OK),
+])
+def test_classify(page, state):
+    assert classify(page) == state
+
+
+def test_classify_url():
+    assert classify_url("https://www.google.com/maps/place/x") == PAGE_OK
+
+
+def test_unreadable_page_is_not_blocked():
+    class FailingDriver:
+        def execute_script(self, script):
+            raise RuntimeError("no such window")
+
+    assert check_page(FailingDriver()) == PAGE_OK
+
+
+def test_raise_if_blocked(frontend):
+    metrics = Metrics()
+    raise_if_blocked(PAGE_OK, metrics=metrics)
+    with pytest.raises(BlockedError) as error:
+        raise_if_blocked(PAGE_CAPTCHA, "https://www.google.com/sorry/index", metrics)
+    assert error.value.kind == PAGE_CAPTCHA and frontend.blocked == PAGE_CAPTCHA
+    assert metrics.get("blocked_pages") == 1
@@ -0,0 +1,42 @@
+import time
+
+import pytest
+
+from scraper.deadline import STAGES, Deadline
+from settings import EMAIL_BUDGET, STAGE_BUDGETS
+
+
+def test_without_deadline():
+    deadline = Deadline(None)
+    deadline.enter("scroll")
+    assert deadline.remaining() is None and not deadline.expired() and deadline.clamp(120) == 120
+
+
+def test_stage_budgets():
+    deadline = Deadline(10)
+    deadline.enter("driver")
+    driverShare = STAGE_BUDGETS["driver"] / sum(STAGE_BUDGETS[name] for name in STAGES)
+    assert deadline.remaining() == pytest.approx(10 * driverShare, abs=0.1)
+    deadline.enter("parse")  # the last stage has all the time left
+    assert deadline.remaining() == pytest.approx(10, abs=0.1) and deadline.clamp(120) <= 10
+
+    deadline.spend_email(10 * EMAIL_BUDGET)
+    assert not deadline.email_allowed() and deadline.cut_stages() == ["email"]
+
+
+def test_expired_stage_is_cut():
+    deadline = Deadline(0.05)
+    deadline.enter("scroll")
+    time.sleep(0.1)
+    assert deadline.expired() and deadline.expired() and deadline.cut_stages() == ["scroll"]
+    assert deadline.partial() and deadline.metrics.get("stages_cut") == 1
+
+
+def test_jobs_have_their_own_deadline():
+    # A job starting does not touch the deadline of one already running
+    first = Deadline(0.05)
+    first.enter("scroll")
+    time.sleep(0.1)
+    second = Deadline(None)
+    second.enter("driver")
+    assert first.expired() and first.cut_stages() == ["scroll"] and not second.partial()
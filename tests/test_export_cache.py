@@ -0,0 +1,14 @@
+from export_cache import ExportCache
+
+
+def test_served_artifact_survives_eviction():
+    cache = ExportCache(max_jobs=1)
+    artifact = cache.get_or_build("a", "csv", 1, lambda file: file.write(b"Name\nA\n"))
+    cache.get_or_build("b", "csv", 1, lambda file: file.write(b"Name\nB\n")).close()  # evicts job a
+    assert cache.get("a", "csv", 1) is None
+    assert artifact.read() == b"Name\nA\n"
+    artifact.close()
+
+    with cache.get_or_build("b", "csv", 1, lambda file: file.write(b"rebuilt")) as artifact:
+        assert artifact.read() == b"Name\nB\n"  # served from the cache
+    cache.clear()
@@ -0,0 +1,33 @@
+from scraper.feed_cards import FeedCards, card_row
+
+URL = "https://www.google.com/maps/place/Example+Cafe/data=!4m7!3m6!1s0x14:0x5e!8m2!3d30.0444!4d31.2357!16s"
+CARD = {
+    "name": "Example Cafe",
+    "url": URL,
+    "rating": "4.5",
+    "reviews": "(1,234)",
+    "website": "https://example.com/",
+    "lines": ["Cafe · \ue934 1 Tahrir St", "Open · Closes 11 PM · 010 1234 5678"],
+}
+
+
+def test_card_row():
+    row = card_row(CARD)
+    assert (row["Category"], row["Address"], row["Phone"]) == ("Cafe", "1 Tahrir St", "010 1234 5678")
+    assert (row["Rating"], row["Total Reviews"]) == (4.5, 1234)
+    assert (row["Latitude"], row["Longitude"], row["Place Key"]) == (30.0444, 31.2357, "0x14:0x5e")
+    assert card_row({"name": "No Reviews", "lines": []})["Rating"] is None
+    assert row["Business Status"] is None
+    assert card_row(dict(CARD, lines=["Cafe · 1 St", "Permanently closed"]))["Business Status"] == "Permanently closed"
+
+
+def test_collect_and_merge():
+    class FakeDriver:
+        def execute_script(self, script, feed, start):
+            return [CARD, dict(CARD, name="Other", url=URL.replace("0x14:0x5e", "0x99:0x11"))][start:]
+
+    cards = FeedCards(FakeDriver())
+    assert cards.collect(None) == 2 and cards.collect(None) == 0
+    merged = cards.merge({"0x14:0x5e": {"Name": "Example Cafe", "Rating": None, "Place ID": "ChIJExample"}})
+    assert [row["Name"] for row in merged] == ["Example Cafe", "Other"]
+    assert (merged[0]["Rating"], merged[0]["Place ID"]) == (4.5, "ChIJExample")
@@ -0,0 +1,34 @@
+import scraper.http_engine as http_engine
+from scraper.http_engine import HttpEngine, page_url
+from scraper.place_cache import PlaceCache
+from scraper.tiling import parse_bbox
+
+PRELOAD = "/search?tbm=map&authuser=0&hl=en&pb=!4m12!1m3!1d1!2d2!3d3!7i20!10b1&q=cafe"
+
+
+def test_page_url():
+    assert page_url(PRELOAD, 20).endswith("!7i20!8i20!10b1&q=cafe")
+    assert page_url(PRELOAD.replace("!7i20", "!7i20!8i0"), 40).endswith("!7i20!8i40!10b1&q=cafe")
+    assert page_url("/search?tbm=map&q=cafe", 20) is None
+
+
+def test_failed_tiles_fall_back_to_the_browser(monkeypatch):
+    engine = HttpEngine("cafe", bbox=parse_bbox("30.0,31.0,30.2,31.4"))
+    monkeypatch.setattr(engine, "search", lambda tile=None: None)
+    assert engine.run() == (None, None)
+
+
+def test_refresh_fetches_only_changed_places(monkeypatch):
+    monkeypatch.setattr(http_engine, "INCREMENTAL_REFRESH", True)
+    cache = PlaceCache(path=":memory:", ttlHours=1)
+    cache.put({"Place Key": "0x1:0x1", "Name": "Same", "Address": "1 St", "Category": "Cafe", "Rating": 4.5})
+    engine = HttpEngine("cafe", cache=cache)
+    cards = [
+        {"Place Key": "0x1:0x1", "Google Maps URL": "https://www.google.com/maps/place/Same", "Name": "Same", "Rating": 4.5},
+        {"Place Key": "0x2:0x2", "Google Maps URL": "https://www.google.com/maps/place/New", "Name": "New"},
+    ]
+    fetched = []
+    monkeypatch.setattr(engine, "search", lambda tile=None: cards)
+    monkeypatch.setattr(engine, "fetch_place", lambda row: fetched.append(row["Name"]) or dict(row))
+    rows, fallbackLinks = engine.run()
+    assert fetched == ["New"] and sorted(row["Name"] for row in rows) == ["New", "Same"] and not fallbackLinks
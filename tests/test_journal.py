@@ -0,0 +1,61 @@
+import os
+
+from scraper.journal import Journal
+from scraper.parser import Parser
+from scraper.scraper import Backend
+
+LINKS = ["https://www.google.com/maps/place/A/data=!1s0x1:0x1", "https://www.google.com/maps/place/B/data=!1s0x2:0x2"]
+
+
+def test_path_per_job(tmp_path):
+    journal = Journal.for_job(" Cafes in Cairo ", "browser", "full", folder=str(tmp_path))
+    assert journal.path == Journal.for_job("cafes in cairo", "browser", "full", folder=str(tmp_path)).path
+    assert journal.path != Journal.for_job("cafes in cairo", "http", "full", folder=str(tmp_path)).path
+    assert journal.load() == ([], [])
+
+
+def test_resume_after_kill(tmp_path):
+    journal = Journal.for_job("cafes", "browser", "full", folder=str(tmp_path))
+    journal.add_links(LINKS)
+    journal.add_rows([{"Name": "A", "Place Key": "0x1:0x1"}])
+    journal.add_rows([{"Name": "A", "Place Key": "0x1:0x1"}, {"Name": "C", "Google Maps URL": "c"}])
+    journal.close()
+    with open(journal.path, "a", encoding="utf-8") as f:
+        f.write('{"row": {"Name": "cut sh')  # killed while writing
+
+    resumed = Journal(journal.path)
+    rows, links = resumed.load()
+    assert [row["Name"] for row in rows] == ["A", "C"] and links == LINKS
+    resumed.add_rows(rows)  # already journaled, nothing is written
+    resumed.clear()
+    assert not os.path.exists(journal.path)
+
+
+def test_journal_is_kept_unless_fresh(tmp_path, monkeypatch, frontend):
+    monkeypatch.chdir(tmp_path)
+    journal = Journal.for_job("cafes", "http", "full")
+    journal.add_links(LINKS)
+    journal.close()
+
+    # A start without resume keeps the interrupted run, and says it can be resumed
+    backend = Backend("cafes", "csv", 1, engine="http")
+    assert backend.resumed is None and os.path.exists(journal.path)
+    assert any("resume" in message for message in frontend.messages)
+    backend.journal.close()
+
+    assert Backend("cafes", "csv", 1, engine="http", resume=True).resumed == ([], LINKS)
+    Backend("cafes", "csv", 1, engine="http", fresh=True)
+    assert not os.path.exists(journal.path)
+
+
+def test_jobs_running_together_keep_their_own_journal(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cafes = Backend("cafes", "csv", 1, engine="http")
+    bars = Backend("bars", "csv", 1, engine="http")  # started while the cafes job runs
+
+    parser = Parser(None, cafes.deadline, cafes.cache, cafes.journal)
+    parser.finalData = [{"Name": "A", "Place Key": "0x1:0x1"}]
+    parser.checkpoint()
+    cafes.journal.close()
+    assert cafes.journal.load()[0] == parser.finalData
+    assert not os.path.exists(bars.journal.path)
@@ -0,0 +1,64 @@
+import threading
+import time
+
+import pytest
+
+from scraper.common import Common
+from scraper.deadline import Deadline
+from scraper.metrics import PROCESS_METRICS
+from scraper.navigation import CircuitBreaker, backoff_delay, is_retryable
+from settings import BREAKER_COOLDOWN, BREAKER_COOLDOWN_MAX, BREAKER_FAILURE_RATE
+
+
+@pytest.fixture(autouse=True)
+def breaker():
+    CircuitBreaker.reset()
+    yield
+    CircuitBreaker.reset()
+
+
+def test_is_retryable():
+    assert is_retryable(RuntimeError("timeout: Timed out receiving message from renderer"))
+    assert is_retryable(RuntimeError("unknown error: net::ERR_CONNECTION_RESET"))
+    assert not is_retryable(RuntimeError("invalid session id"))
+    assert not is_retryable(RuntimeError("invalid argument: 'url' must be a string"))
+
+
+def test_backoff_delay():
+    assert all(2 <= backoff_delay(2, base=1, cap=4) <= 4 for _ in range(100))
+    assert backoff_delay(10, base=1, cap=30) <= 30
+
+
+def test_breaker_opens_and_closes():
+    window = CircuitBreaker.outcomes.maxlen
+    for _ in range(window):
+        CircuitBreaker.record(True)
+    for _ in range(int(window * BREAKER_FAILURE_RATE) - 1):
+        CircuitBreaker.record(False)
+    assert CircuitBreaker.openUntil == 0  # below the failure rate
+    CircuitBreaker.record(False)
+    assert CircuitBreaker.openUntil > time.time() and PROCESS_METRICS.get("breaker_trips") == 1
+
+    CircuitBreaker.record(False)  # the trial failed: longer cooldown
+    assert CircuitBreaker.cooldown == min(BREAKER_COOLDOWN * 2, BREAKER_COOLDOWN_MAX)
+    CircuitBreaker.record(True)  # the trial went through
+    assert CircuitBreaker.openUntil == 0 and CircuitBreaker.cooldown == BREAKER_COOLDOWN
+
+
+def test_wait():
+    CircuitBreaker.openUntil = time.time() + 0.1
+    assert CircuitBreaker.wait() > 0 and CircuitBreaker.wait() == 0
+
+
+def test_wait_is_bounded():
+    # A long cooldown ends with the stage budget, or as soon as the scraping is stopped
+    CircuitBreaker.openUntil = time.time() + BREAKER_COOLDOWN_MAX
+    deadline = Deadline(0.2)
+    deadline.enter("driver")
+    assert CircuitBreaker.wait(deadline) < 1
+
+    threading.Timer(0.1, Common.set_close_thread).start()
+    try:
+        assert CircuitBreaker.wait() < 1
+    finally:
+        Common.closeThread.clear()
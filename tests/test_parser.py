@@ -0,0 +1,89 @@
+import pytest
+
+import scraper.parser as parser_module
+from scraper.parser import Parser
+
+SHEET = """
+<div role="main" aria-label="Example Cafe">
+  <h1 class="DUwDvf lfPIob">Example Cafe</h1>
+  <button class="CsEnBe" data-tooltip="Copy phone number"><div class="rogA2c">010 1234 5678</div></button>
+  <a data-tooltip="Open website" href="https://example.com/">example.com</a>
+</div>
+"""
+
+
+class Element:
+    def __init__(self, html):
+        self.html = html
+
+    def get_attribute(self, name):
+        return self.html
+
+
+class FakeDriver:
+    current_url = "https://www.google.com/maps/place/Example+Cafe/data=!1s0x14:0x5e"
+
+    def __init__(self, html=SHEET):
+        self.html = html
+
+    def execute_script(self, script, *args):
+        return Element(self.html)
+
+
+@pytest.fixture
+def parser(monkeypatch):
+    parser = Parser(FakeDriver())
+    monkeypatch.setattr(parser, "find_mail", lambda url: "")
+    return parser
+
+
+def record_data(**values):
+    data = {"Name": "Example Cafe", "Address": "1 Tahrir St", "Category": "Cafe", "Rating": 4.5,
+            "Google Maps URL": FakeDriver.current_url}
+    data.update(values)
+    return data
+
+
+def test_fields_missing_from_the_record_come_from_the_sheet(parser):
+    parser.parse(record_data())
+    row = parser.finalData[0]
+    assert (row["Name"], row["Address"], row["Category"], row["Rating"]) == ("Example Cafe", "1 Tahrir St", "Cafe", 4.5)
+    assert row["Phone"] == "010 1234 5678" and row["Website"] == "https://example.com/"
+    assert parser.metrics.get("structured_places") == 1 and parser.metrics.get("dom_fallback_places") == 0
+    assert parser.metrics.get("dom_fallback_fields") >= 2
+
+
+def test_record_values_win_over_the_sheet(parser):
+    parser.parse(record_data(Phone="012 0000 0000"))
+    assert parser.finalData[0]["Phone"] == "012 0000 0000"
+
+
+def test_complete_record_is_kept_when_the_sheet_cannot_be_parsed(parser, monkeypatch):
+    monkeypatch.setattr(parser, "parse_dom", lambda sheetHtml=None, url=None: None)
+    parser.parse(record_data())
+    assert parser.finalData[0]["Name"] == "Example Cafe" and parser.finalData[0]["Phone"] is None
+
+
+def test_same_place_without_data_id():
+    url = "https://www.google.com/maps/place/Example+Cafe/@30.1,31.2,17z/data=!3d30.1!4d31.2"
+    assert parser_module.same_place({"Latitude": 30.1, "Longitude": 31.2}, url, "")
+    assert not parser_module.same_place({"Latitude": 30.2, "Longitude": 31.2}, url, url)  # same name, another place
+    assert parser_module.same_place({}, url, url + "?entry=ttu")
+    assert not parser_module.same_place({}, url, "https://www.google.com/maps/place/Example+Cafe/@30.3,31.2,17z")
+
+
+def test_results_are_restored_after_a_place_is_loaded(parser, monkeypatch):
+    resultsUrl = "https://www.google.com/maps/search/cafe"
+    opened, answers = [], [None, {}]
+    monkeypatch.setattr(parser_module, "CAPTURE_PLACE_RESPONSES", False)
+    monkeypatch.setattr(parser_module.devtools, "drain_network_events", lambda driver, metrics: [])
+    monkeypatch.setattr(parser_module.RateController, "acquire", lambda deadline=None: 0)
+    monkeypatch.setattr(parser, "openingurl", lambda url: opened.append(url))
+    monkeypatch.setattr(parser, "open_in_app", lambda url: answers.pop(0))
+    monkeypatch.setattr(parser, "parse", lambda data=None: None)
+    parser.clickNavigation, parser.resultsUrl, parser.onResults = True, resultsUrl, True
+
+    # The first place does not open from the results and is loaded instead, so they are loaded again
+    parser.open_place("https://www.google.com/maps/place/A/data=!1s0x1:0x1")
+    parser.open_place("https://www.google.com/maps/place/B/data=!1s0x1:0x2")
+    assert opened == ["https://www.google.com/maps/place/A/data=!1s0x1:0x1", resultsUrl] and parser.onResults
@@ -0,0 +1,39 @@
+from scraper.place_cache import PlaceCache, plan_refresh
+from scraper.scraper import Backend
+
+ROW = {"Place Key": "0x1:0x2", "Name": "Example Cafe", "Address": "1 Tahrir St", "Category": "Cafe"}
+
+
+def test_get_and_put():
+    cache = PlaceCache(path=":memory:", ttlHours=1)
+    cache.put(ROW)
+    cache.put({"Place Key": "0x3:0x4", "Name": "No address"})  # incomplete rows are not kept
+    assert cache.get("0x1:0x2") == ROW
+    assert cache.get("0x3:0x4") is None and cache.get(None) is None
+
+    cache.ttl = -1  # everything is stale
+    assert cache.get("0x1:0x2") is None
+    metrics = cache.metrics
+    assert (metrics.get("cache_hits"), metrics.get("cache_misses"), metrics.get("cache_stale")) == (1, 1, 1)
+
+
+def test_plan_refresh():
+    cache = PlaceCache(path=":memory:", ttlHours=1)
+    row = dict(ROW, **{"Rating": 4.5, "Total Reviews": "1,234", "Business Status": "Open ⋅ Closes 11 PM"})
+    cache.put(row)
+    cache.put({"Place Key": "0x5:0x6", "Name": "Other", "Address": "2 St", "Category": "Bar", "Rating": 4.0})
+    cards = [
+        {"Place Key": "0x1:0x2", "Google Maps URL": "u1", "Name": "Example Cafe", "Rating": 4.5, "Total Reviews": 1234},
+        {"Place Key": "0x5:0x6", "Google Maps URL": "u2", "Name": "Other", "Rating": 4.1},
+        {"Place Key": "0x7:0x8", "Google Maps URL": "u3", "Name": "New"},
+    ]
+    carried, links = plan_refresh(cards, cache, maxAgeHours=1)
+    assert carried == [row] and links == ["u2", "u3"]
+    assert cache.snapshot("0x5:0x6") is None  # changed, so parsed again
+    assert plan_refresh(cards[:1], cache, maxAgeHours=0) == ([], ["u1"])  # too old
+
+
+def test_cache_is_opt_in(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert Backend("cafes", "csv", 1, engine="http").cache is None
+    assert isinstance(Backend("cafes", "csv", 1, engine="http", cache=True).cache, PlaceCache)
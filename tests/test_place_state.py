@@ -0,0 +1,59 @@
+import json
+
+from scraper.place_state import (coordinates_from_url, from_payload, load_place_record, map_record, matches_url,
+                                 record_from_response)
+
+URL = "https://www.google.com/maps/place/x/data=!1s0x1458409:0x5e2f"
+OTHER_URL = "https://www.google.com/maps/place/x/data=!1s0x99:0x11"
+
+
+def place_record():
+    """A trimmed record with the shape Google Maps uses"""
+    record = [None] * 179
+    record[4] = [None, None, None, None, None, None, None, 4.6, 1234]
+    record[7] = ["https://example.com/", "example.com"]
+    record[9] = [None, None, 30.0444, 31.2357]
+    record[10] = "0x1458409:0x5e2f"
+    record[11] = "Example Cafe"
+    record[13] = ["Cafe", "Coffee shop"]
+    record[18] = "Example Cafe, 1 Tahrir St, Cairo"
+    record[34] = [None, [["Monday", ["8 AM-11 PM"]], ["Tuesday", ["Closed"]]], None, None, [None] * 4 + ["Open"]]
+    record[46] = [["https://booking.example.com/r/1", "booking.example.com"]]
+    record[78] = "ChIJExample"
+    record[178] = [["010 1234 5678"]]
+    return record
+
+
+def payload(record):
+    return ")]}'\n" + json.dumps([None] * 6 + [record])
+
+
+def test_map_record():
+    data = map_record(load_place_record(payload(place_record())))
+    assert data["Name"] == "Example Cafe"
+    assert data["Address"] == "1 Tahrir St, Cairo"
+    assert data["Category"] == "Cafe, Coffee shop"
+    assert data["Rating"] == 4.6 and data["Total Reviews"] == 1234
+    assert data["Hours"] == "Monday: 8 AM-11 PM; Tuesday: Closed"
+    assert data["Booking Links"] == "https://booking.example.com/r/1"
+    assert (data["Latitude"], data["Longitude"], data["Place ID"]) == (30.0444, 31.2357, "ChIJExample")
+    assert load_place_record("not a payload") is None
+
+
+def test_from_payload():
+    assert from_payload(payload(place_record()), OTHER_URL) == {}
+    assert from_payload(payload(place_record()), URL)["Name"] == "Example Cafe"
+
+
+def test_record_from_response():
+    text = payload(place_record())
+    html = ("<script>window.APP_INITIALIZATION_STATE=" + json.dumps([None, None, None, [None] * 6 + [text]])
+            + ";window.APP_FLAGS=[];</script>")
+    assert record_from_response(html)[11] == "Example Cafe"
+    assert record_from_response(text)[11] == "Example Cafe"
+
+
+def test_urls():
+    assert matches_url(place_record(), URL)
+    assert not matches_url(place_record(), OTHER_URL)
+    assert coordinates_from_url("https://www.google.com/maps/place/x/data=!3d30.1!4d-31.2!16s") == (30.1, -31.2)
@@ -0,0 +1,34 @@
+from scraper.placekey import canonical_url, place_key, unique_links
+
+LINK = ("https://www.google.com/maps/place/Example+Cafe/data=!4m7!3m6!1s0x1458409:0x5e2f!8m2"
+        "!3d30.0444!4d31.2357!16s%2Fg%2F11!19sChIJExample?authuser=0&hl=en&rclk=1")
+
+
+def test_place_key():
+    assert place_key(LINK) == "0x1458409:0x5e2f"
+    assert place_key("https://www.google.com/maps/place/x/data=!19sChIJExample") == "ChIJExample"
+    assert place_key("https://www.google.com/maps/place/x/data=!3d30.0444!4d31.2357") == "30.044400,31.235700"
+    assert place_key("https://www.google.com/maps/search/cafe") is None
+
+
+def test_canonical_url():
+    assert canonical_url(LINK) == ("https://www.google.com/maps/place/Example%20Cafe"
+                                   "/data=!4m5!3m4!1s0x1458409:0x5e2f!8m2!3d30.0444!4d31.2357")
+    assert canonical_url("https://www.google.com/maps/place/x/data=!1s0x1:0x2?hl=en").endswith("/data=!4m2!3m1!1s0x1:0x2")
+    search = "https://www.google.com/maps/search/?api=1&query=cafe&query_place_id=ChIJAAA"
+    assert canonical_url(search + "&hl=en") == search
+    assert canonical_url("https://www.google.com/maps/place/x/@30.1,31.2,17z?entry=ttu") == (
+        "https://www.google.com/maps/place/x/@30.1,31.2,17z")
+
+
+def test_unique_links():
+    seen = {"0xabc:0x1"}
+    other = LINK.replace("authuser=0", "authuser=1")
+    known = "https://www.google.com/maps/place/Known/data=!1s0xabc:0x1"
+    assert unique_links([LINK, other, known], seen) == [canonical_url(LINK)]
+    assert "0x1458409:0x5e2f" in seen
+
+    # Places linked by their place id stay apart
+    first = "https://www.google.com/maps/search/?api=1&query=cafe&query_place_id=ChIJAAA"
+    second = first.replace("ChIJAAA", "ChIJBBB")
+    assert unique_links([first, second]) == [first, second]
@@ -0,0 +1,40 @@
+from query_cache import QueryCache, query_key
+
+
+def test_query_key():
+    key = query_key({'search_query': '  Cafes  in Cairo ', 'engine': 'http'})
+    assert key == query_key({'search_query': 'cafes in cairo', 'engine': 'http'})
+    assert key != query_key({'search_query': 'cafes in cairo'})
+
+
+def test_query_key_defaults():
+    named = query_key({'search_query': 'cafes', 'engine': 'browser', 'mode': 'full'}, 'browser', 'full')
+    assert named == query_key({'search_query': 'cafes', 'engine': None}, 'browser', 'full')
+
+
+def test_start_and_finish():
+    cache = QueryCache(ttl_minutes=1)
+    key = query_key({'search_query': 'cafes'})
+    assert cache.start(key, 'a') is None
+    assert cache.start(key, 'b') == 'a'  # attaches to the running job
+    assert cache.get(key) is None
+    cache.finish(key, 'a', {'rows': [1]})
+    assert cache.get(key) == ('a', {'rows': [1]})
+    assert cache.job('a') == {'rows': [1]} and cache.job('b') is None
+    assert cache.start(key, 'c') is None  # nothing running any more
+    cache.finish(key, 'c')  # failed, the earlier result is kept
+    assert cache.get(key) == ('a', {'rows': [1]})
+
+    cache.ttl = -1
+    assert cache.get(key) is None and not cache.finished
+
+
+def test_oldest_jobs_are_dropped():
+    cache = QueryCache(ttl_minutes=1, max_jobs=2)
+    keys = [query_key({'search_query': query}) for query in ('cafes', 'bars', 'parks')]
+    cache.finish(keys[0], 'a', {'rows': [1]})
+    cache.finish(keys[1], 'b', {'rows': [2]})
+    cache.finish(keys[0], 'c', {'rows': [3]})  # the cafes job is the latest again
+    cache.finish(keys[2], 'd', {'rows': [4]})
+    assert cache.get(keys[1]) is None and cache.job('b') is None
+    assert cache.get(keys[0]) == ('c', {'rows': [3]}) and cache.get(keys[2]) == ('d', {'rows': [4]})
@@ -0,0 +1,43 @@
+import time
+
+import pytest
+
+from scraper.metrics import PROCESS_METRICS
+from scraper.rate import RateController
+from settings import RATE_BLOCK_DECREASE, RATE_DECREASE, RATE_INCREASE, RATE_MAX, RATE_MIN, RATE_SLOW_LOAD
+
+
+@pytest.fixture(autouse=True)
+def controller():
+    yield
+    RateController.reset()
+
+
+def test_acquire_spaces_navigations():
+    RateController.reset(rate=100)
+    start = time.time()
+    for _ in range(5):
+        RateController.acquire()
+    assert 0.03 <= time.time() - start < 0.5  # 5 navigations at 100 per second
+
+
+def test_additive_increase():
+    RateController.reset(rate=1)
+    for _ in range(4):
+        RateController.success(seconds=1)
+    assert RateController.rate == pytest.approx(min(RATE_MAX, 1 + 4 * RATE_INCREASE))
+
+
+def test_multiplicative_decrease():
+    RateController.reset(rate=1)
+    RateController.failure()
+    RateController.failure()  # same spike, cut once
+    assert RateController.rate == pytest.approx(max(RATE_MIN, RATE_DECREASE))
+
+    rate = RateController.rate
+    RateController.blocked()
+    assert RateController.rate == pytest.approx(max(RATE_MIN, rate * RATE_BLOCK_DECREASE))
+    RateController.lastCut = 0
+    RateController.success(seconds=RATE_SLOW_LOAD + 1)
+    assert PROCESS_METRICS.get("slow_navigations") == 1 and PROCESS_METRICS.get("rate_cuts") == 3
+    assert PROCESS_METRICS.get("navigation_rate") == round(RateController.rate, 3)
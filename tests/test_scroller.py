@@ -0,0 +1,12 @@
+from scraper.scroller import Scroller
+
+
+def test_fallback_results_follow_the_mode(monkeypatch):
+    # The fallback paths hand their links over like a finished scroll: saved in list mode, else parsed
+    handled = []
+    for mode in ("list", "full"):
+        scroller = Scroller(driver=None, mode=mode)
+        monkeypatch.setattr(scroller, "save_list", lambda: handled.append("saved"))
+        monkeypatch.setattr(scroller, "start_parsing", lambda: handled.append("parsed"))
+        scroller.handle_results()
+    assert handled == ["saved", "parsed"]
@@ -0,0 +1,23 @@
+import json
+
+from scraper.placekey import data_id_from_url
+from scraper.search_capture import GUARD, SearchCapture
+
+
+def test_add_payload():
+    record = [None] * 79
+    record[10] = "0x14:0x5e"
+    record[11] = "Example Cafe"
+    record[13] = ["Cafe"]
+    record[4] = [None] * 7 + [4.5, 20]
+    record[78] = "ChIJExample"
+    body = json.dumps({"c": 0, "d": GUARD + "\n" + json.dumps([[None, [[None], [None] * 14 + [record]]]])}) + '/*""*/'
+
+    capture = SearchCapture(driver=None)
+    assert capture.add_payload(body) == 1
+    assert capture.add_payload(body) == 0  # duplicates are ignored
+    row = capture.rows["0x14:0x5e"]
+    assert (row["Name"], row["Rating"], row["Place ID"]) == ("Example Cafe", 4.5, "ChIJExample")
+    assert data_id_from_url(row["Google Maps URL"]) == "0x14:0x5e"
+    other = "https://www.google.com/maps/place/Other/data=!4m7!3m6!1s0x99:0x11!8m2"
+    assert capture.merge_links([row["Google Maps URL"], other]) == [row["Google Maps URL"], other]
@@ -0,0 +1,77 @@
+import time
+
+import pytest
+
+from scraper.deadline import Deadline
+from scraper.supervisor import DriverSupervisor, alive, is_driver_failure
+
+
+class FakeDriver:
+    def __init__(self, answers=True):
+        self.answers = answers
+        self.closed = False
+
+    def execute_script(self, script):
+        if not self.answers:
+            raise RuntimeError("disconnected: not connected to DevTools")
+        return 1
+
+    def quit(self):
+        self.closed = True
+
+
+def supervisor_of(drivers, **options):
+    return DriverSupervisor(lambda: drivers[-1], lambda: drivers.append(FakeDriver()) or drivers[-1], **options)
+
+
+def test_heartbeat():
+    assert alive(FakeDriver()) and not alive(FakeDriver(answers=False))
+    assert is_driver_failure(RuntimeError("Message: invalid session id")) and not is_driver_failure(ValueError("x"))
+
+
+def test_dead_letters():
+    supervisor = supervisor_of([FakeDriver()], maxAttempts=2, backoff=0.01)
+    assert supervisor.failed("a", RuntimeError("timeout")) and not supervisor.failed("a", RuntimeError("timeout"))
+    assert supervisor.deadLetters[0]["Attempts"] == 2 and supervisor.metrics.get("dead_letters") == 1
+
+
+def test_recover():
+    # A driver that answers is kept, a dead one is replaced once
+    drivers = [FakeDriver()]
+    supervisor = supervisor_of(drivers, maxRelaunches=1)
+    assert supervisor.recover(drivers[0], RuntimeError("timeout")) is drivers[0]
+    error = RuntimeError("disconnected: not connected to DevTools")
+    assert supervisor.recover(drivers[0], error) is drivers[1]
+    with pytest.raises(RuntimeError) as raised:
+        supervisor.recover(drivers[1], error)
+    assert raised.value is error
+
+
+def test_replace():
+    # A driver is relaunched on demand, within the same relaunch budget as recover
+    drivers = [FakeDriver()]
+    supervisor = supervisor_of(drivers, maxRelaunches=1)
+    assert supervisor.replace() is drivers[1] and supervisor.replace() is None
+    assert supervisor.metrics.get("driver_relaunches") == 1
+
+
+def test_watchdog_closes_hung_driver():
+    drivers = [FakeDriver()]
+    supervisor = supervisor_of(drivers, hangTimeout=0.2)
+    supervisor.start()
+    time.sleep(0.4)
+    supervisor.stop()
+    assert drivers[0].closed and supervisor.hung and supervisor.metrics.get("driver_hangs") >= 1
+
+
+def test_hang_timeout_is_clamped_to_the_deadline():
+    # A place still running when the parse stage runs out of time counts as hung, and is not relaunched
+    drivers = [FakeDriver()]
+    deadline = Deadline(0.2)
+    deadline.enter("parse")
+    supervisor = supervisor_of(drivers, hangTimeout=2, deadline=deadline)
+    supervisor.start()
+    time.sleep(1)
+    supervisor.stop()
+    assert drivers[0].closed and supervisor.hung
+    assert supervisor.recover(drivers[0], RuntimeError("timeout")) is drivers[0] and len(drivers) == 1
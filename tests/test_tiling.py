@@ -0,0 +1,49 @@
+import pytest
+
+from scraper.metrics import Metrics
+from scraper.tiling import Tile, TilePlanner, center, grid, parse_bbox, result_key, search_url, split, zoom_for
+
+BBOX = "30.0,31.0,30.2,31.4"
+
+
+def test_geometry():
+    bbox = parse_bbox(BBOX)
+    assert len(grid(bbox, 2, 2)) == 4 and split(bbox)[3] == Tile(30.1, 31.2, 30.2, 31.4)
+    assert "/maps/search/coffee+shops/@30.100000,31.200000," in search_url("coffee shops", bbox)
+    assert zoom_for(Tile(0, 0, 1, 360 / 4)) == 4 and zoom_for(Tile(0, 0, 1, 1e-9)) == 21
+
+
+@pytest.mark.parametrize("bad", ["1,2,3", "30.2,31,30,31.4", "a,b,c,d"])
+def test_parse_bbox_rejects(bad):
+    with pytest.raises(ValueError):
+        parse_bbox(bad)
+
+
+def test_planner_splits_capped_tiles():
+    # One place per tile and one found everywhere; the north-east corner is dense
+    def search(tile):
+        latitude, longitude = center(tile)
+        rows = [{"Place ID": f"{latitude:.3f},{longitude:.3f}", "Latitude": latitude, "Longitude": longitude}]
+        if tile.north > 30.19 and tile.east > 31.39 and tile.north - tile.south > 0.03:
+            rows *= 3  # a capped tile
+        return rows + [{"Place ID": "everywhere", "Google Maps URL": "https://www.google.com/maps/place/x"}]
+
+    metrics = Metrics()
+    rows = TilePlanner(parse_bbox(BBOX), search, workers=2, gridSize=2, cap=3, maxDepth=2, metrics=metrics).run()
+    assert metrics.get("tiles_searched") == 4 + 4 + 4 and metrics.get("tiles_split") == 2
+    assert len(rows) == len({result_key(row) for row in rows}) == 4 + 4 + 4 + 1
+
+
+def test_planner_gives_up_when_tiles_fail():
+    # Half the tiles fail: the area search gives up, unless only a total failure counts
+    def search(tile):
+        if tile.west < 31.2:
+            raise RuntimeError("HTTP search failed")
+        return [{"Place ID": f"{tile.south},{tile.west}", "Google Maps URL": "https://www.google.com/maps/place/x"}]
+
+    metrics = Metrics()
+    planner = TilePlanner(parse_bbox(BBOX), search, workers=2, gridSize=2, maxFailureRate=0.5, metrics=metrics)
+    assert planner.run() is None
+    assert metrics.get("tiles_failed") == 2
+    rows = TilePlanner(parse_bbox(BBOX), search, workers=2, gridSize=2, maxFailureRate=1).run()
+    assert len(rows) == 2
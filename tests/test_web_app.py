@@ -0,0 +1,105 @@
+import pytest
+
+import app as web_app
+from scraper.communicator import Communicator
+from scraper.deadline import Deadline
+from scraper.metrics import Metrics
+from scraper.progress import PHASE_DONE
+
+
+class FakeBackend:
+    """Backend that finds rows, then is blocked (or not) without a browser"""
+    rows = [{"Name": "A"}, {"Name": "B"}]
+    blocked = None
+    deadLetters = []
+    streamed = None  # rows sent to the frontend as they are found, all of them by default
+
+    def __init__(self, searchquery, **options):
+        self.searchquery = searchquery
+        self.finalData = list(self.rows)
+        self.metrics = Metrics()
+        self.deadline = Deadline(options.get("deadline"), self.metrics)
+
+    def mainscraping(self):
+        for row in self.finalData[:self.streamed]:
+            Communicator.add_extracted_row(row)
+        if self.deadLetters:
+            Communicator.report_dead_letters(self.deadLetters)
+        if self.blocked:
+            Communicator.report_block(self.blocked)
+        Communicator.emit_progress(PHASE_DONE)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(web_app, "Backend", FakeBackend)
+    monkeypatch.setattr(FakeBackend, "blocked", None)
+    monkeypatch.setattr(FakeBackend, "deadLetters", [])
+    monkeypatch.setattr(FakeBackend, "streamed", None)
+    monkeypatch.setattr(web_app, "query_cache", web_app.QueryCache(1))
+    return web_app.app.test_client()
+
+
+def key_of(data):
+    return web_app.query_key(data, web_app.DEFAULT_ENGINE, web_app.DEFAULT_MODE)
+
+
+def run(data, job_id="job"):
+    web_app.run_scraper(data, job_id, key_of(data))
+    return web_app.scraping_progress
+
+
+def test_completed_job(client):
+    progress = run({"search_query": "cafes"})
+    assert progress["status"] == "completed" and progress["results"]["total_results"] == 2
+    assert progress["results"]["cache_hits"] == 0
+    assert client.get("/api/progress").get_json()["status"] == "completed"
+
+    # Downloads are served from the open cached files
+    assert client.get("/api/download/excel").data.startswith(b"PK")
+    assert client.get("/api/download/csv", headers={"Accept-Encoding": "identity"}).data.splitlines()[1:] == [b"A", b"B"]
+
+
+def test_table_shows_the_rows_of_the_downloads(client, monkeypatch):
+    # Rows added to finalData without being streamed (e.g. resumed or cached ones) are in the table too
+    monkeypatch.setattr(FakeBackend, "streamed", 1)
+    run({"search_query": "cafes"})
+    data = client.get("/api/data").get_json()
+    assert data["total"] == 2 and [row["Name"] for row in data["data"]] == ["A", "B"]
+
+
+def test_dead_letters_are_reported(client, monkeypatch):
+    deadLetter = {"Google Maps URL": "https://www.google.com/maps/place/C", "Error": "timeout", "Attempts": 3}
+    monkeypatch.setattr(FakeBackend, "deadLetters", [deadLetter])
+    progress = run({"search_query": "cafes"})
+    assert progress["results"]["dead_letters"] == [deadLetter]
+    assert client.get("/api/progress").get_json()["dead_letters"] == [deadLetter]
+
+
+def test_blocked_job_keeps_its_rows(client, monkeypatch):
+    monkeypatch.setattr(FakeBackend, "blocked", "captcha")
+    progress = run({"search_query": "cafes"})
+    assert progress["status"] == "blocked" and progress["blocked"] == "captcha"
+    assert progress["results"]["total_results"] == 2 and len(progress["extracted_data"]) == 2
+
+    # The done phase of the finished job does not turn it into a completed one
+    payload = client.get("/api/progress").get_json()
+    assert payload["status"] == "blocked" and payload["blocked"] == "captcha"
+    assert client.get("/api/download/csv").status_code == 200
+
+    # Nor is the blocked job served from the query cache
+    assert web_app.query_cache.get(key_of({"search_query": "cafes"})) is None
+
+
+def test_cached_job_is_served_while_another_job_runs(client):
+    run({"search_query": "cafes"}, job_id="cafes-job")
+    web_app.scraping_progress = {"job_id": "other", "status": "running", "progress": 10, "results": None}
+
+    response = client.post("/api/scrape", json={"search_query": "cafes", "engine": web_app.DEFAULT_ENGINE})
+    assert response.get_json()["job_id"] == "cafes-job" and response.get_json()["cached"]
+    assert web_app.scraping_progress["job_id"] == "other"  # the running job is left alone
+
+    progress = client.get("/api/progress?job_id=cafes-job").get_json()
+    assert progress["status"] == "completed" and progress["results"]["total_results"] == 2
+    assert client.get("/api/data?job_id=cafes-job").get_json()["total"] == 2
+    assert client.get(progress["results"]["csv_file"]).status_code == 200
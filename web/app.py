@@ -5,8 +5,7 @@ import os
 import json
 import threading
 import time
-import pandas as pd
-from io import BytesIO
+import uuid
 from datetime import datetime
 
 # Add the app directory to the path to import scraper modules
@@ -51,15 +50,25 @@ try:
     from scraper.communicator import Communicator
     from scraper.common import Common
     from scraper.email_scraper import EmailScraper
+    from scraper import exporter
+    from scraper.metrics import PROCESS_METRICS
+    from scraper import tiling
+    from settings import ENGINES, MODES, DEFAULT_ENGINE, DEFAULT_MODE, QUERY_CACHE_TTL_MINUTES, QUERY_CACHE_MAX_JOBS
     try:
         from web.web_communicator import WebCommunicator
         from web.web_data_saver import WebDataSaver
         from web.email_web_communicator import email_web_comm
+        from web.export_cache import ExportCache
+        from web.query_cache import QueryCache, query_key
+        from web.result_store import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
     except ModuleNotFoundError:
         # Fallback for local runs from web/ directory
         from web_communicator import WebCommunicator
         from web_data_saver import WebDataSaver
         from email_web_communicator import email_web_comm
+        from export_cache import ExportCache
+        from query_cache import QueryCache, query_key
+        from result_store import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
     print("✅ Successfully imported desktop scraper modules and email scraper!")
 except Exception as e:
     print(f"❌ Error importing scraper modules: {e}")
@@ -71,9 +80,16 @@ except Exception as e:
         from scraper.communicator import Communicator
         from scraper.common import Common
         from scraper.email_scraper import EmailScraper
+        from scraper import exporter
+        from scraper.metrics import PROCESS_METRICS
+        from scraper import tiling
+        from settings import ENGINES, MODES, DEFAULT_ENGINE, DEFAULT_MODE, QUERY_CACHE_TTL_MINUTES, QUERY_CACHE_MAX_JOBS
         from web.web_communicator import WebCommunicator
         from web.web_data_saver import WebDataSaver
         from web.email_web_communicator import email_web_comm
+        from web.export_cache import ExportCache
+        from web.query_cache import QueryCache, query_key
+        from web.result_store import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
         print("✅ Successfully imported after installing setuptools!")
     except Exception as e2:
         print(f"❌ Still failed: {e2}")
@@ -105,13 +121,18 @@ scraping_progress = {
     'progress': 0,
     'message': '',
     'results': None,
-    'extracted_rows': [],
-    'live_messages': []
+    'live_rows': []
 }
 
 # Global web communicator instance
 web_communicator = None
 
+# Generated export files, reused until the job's rows change
+export_cache = ExportCache()
+
+# Finished and running jobs per query, so repeated requests do not scrape again
+query_cache = QueryCache(QUERY_CACHE_TTL_MINUTES, QUERY_CACHE_MAX_JOBS)
+
 @app.route('/static/<path:filename>')
 def serve_static(filename):
     """Serve static files like images, CSS, JS"""
@@ -180,7 +201,7 @@ def index():
 @app.route('/api/scrape', methods=['POST'])
 def scrape():
     """Handle scraping requests"""
-    global scraping_progress
+    global scraping_progress, web_communicator
     
     try:
         data = request.get_json()
@@ -189,8 +210,41 @@ def scrape():
         if not data.get('search_query'):
             return jsonify({'error': 'Search query is required'}), 400
         
+        if data.get('engine') and data['engine'] not in ENGINES:
+            return jsonify({'error': f"Engine must be one of: {', '.join(ENGINES)}"}), 400
+        
+        if data.get('mode') and data['mode'] not in MODES:
+            return jsonify({'error': f"Mode must be one of: {', '.join(MODES)}"}), 400
+        
+        if data.get('area'):
+            try:
+                tiling.parse_bbox(data['area'])
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        
+        if data.get('deadline') is not None:
+            if isinstance(data['deadline'], bool) or not isinstance(data['deadline'], (int, float)) or data['deadline'] <= 0:
+                return jsonify({'error': 'Deadline must be a positive number of seconds'}), 400
+        
+        key = query_key(data, DEFAULT_ENGINE, DEFAULT_MODE)
+        
+        # Same query finished recently: serve that job by its job_id, whatever job is running now
+        cached = None if data.get('refresh') else query_cache.get(key)
+        if cached:
+            cached_job_id, state = cached
+            return jsonify({'message': 'Served from a recent scrape', 'status': 'completed',
+                            'job_id': cached_job_id, 'cached': True})
+        
+        # Same query being scraped: attach to that job instead of starting another one
+        job_id = uuid.uuid4().hex
+        running_job_id = query_cache.start(key, job_id)
+        if running_job_id is not None:
+            return jsonify({'message': 'Attached to the running scrape', 'status': 'running',
+                            'job_id': running_job_id, 'attached': True})
+        
         # Reset progress
         scraping_progress = {
+            'job_id': job_id,
             'status': 'running',
             'progress': 0,
             'message': 'Starting scraper...',
@@ -198,11 +252,11 @@ def scrape():
         }
         
         # Start scraping in a separate thread
-        thread = threading.Thread(target=run_scraper, args=(data,))
+        thread = threading.Thread(target=run_scraper, args=(data, job_id, key))
         thread.daemon = True
         thread.start()
         
-        return jsonify({'message': 'Scraping started', 'status': 'running'})
+        return jsonify({'message': 'Scraping started', 'status': 'running', 'job_id': job_id})
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -219,7 +273,9 @@ def manual_complete():
         scraping_progress['message'] = f'Scraping completed! Found {len(web_communicator.extracted_rows)} businesses.'
         scraping_progress['results'] = {
             'total_results': len(web_communicator.extracted_rows),
-            'excel_file': '/api/download/excel'
+            'excel_file': '/api/download/excel',
+            'csv_file': '/api/download/csv',
+            'jsonl_file': '/api/download/jsonl'
         }
         return jsonify({'success': True, 'message': 'Completion triggered manually'})
     else:
@@ -231,7 +287,7 @@ def debug():
     global scraping_progress
     return jsonify({
         'message': 'Debug endpoint working',
-        'scraping_progress': scraping_progress,
+        'scraping_progress': progress_payload(),
         'web_communicator_status': web_communicator is not None
     })
 
@@ -241,48 +297,48 @@ def get_progress():
     global scraping_progress, web_communicator
     
     try:
+        # A cached job served by job_id is finished, its progress does not change
+        cached = cached_job()
+        if cached is not None:
+            return jsonify(progress_payload(cached[0]))
+        
         if web_communicator:
             # Update progress from communicator
             scraping_progress['progress'] = web_communicator.get_progress()
             scraping_progress['message'] = web_communicator.get_latest_message()
             
             # Add processing phase indicator
-            latest_message = web_communicator.get_latest_message()
-            if "scrolling" in latest_message.lower():
-                scraping_progress['phase'] = 'scrolling'
-            elif "parsing" in latest_message.lower() or "scrape each location" in latest_message.lower():
-                scraping_progress['phase'] = 'extracting'
-            elif "saving" in latest_message.lower():
-                scraping_progress['phase'] = 'saving'
-            else:
-                scraping_progress['phase'] = 'initializing'
+            scraping_progress['phase'] = web_communicator.phase or 'initializing'
+            scraping_progress['phase_timings'] = web_communicator.get_phase_timings()
             
-            # Get live messages (including extracted rows)
-            all_messages = web_communicator.get_all_messages()
+            # Network and timing counters of the job, and of the rate controller, breaker and proxies shared by all jobs
+            scraping_progress['metrics'] = PROCESS_METRICS.snapshot()
+            if web_communicator.metrics is not None:
+                scraping_progress['metrics'].update(web_communicator.metrics.snapshot())
             
-            # Filter extracted row messages
-            extracted_messages = [msg for msg in all_messages if msg.startswith('EXTRACTED_ROW:')]
-            latest_extracted = extracted_messages  # Show ALL extracted businesses
+            # Latest extracted rows for the live table
+            scraping_progress['live_rows'] = web_communicator.get_live_rows()
             
-            # Regular status messages
-            status_messages = [msg for msg in all_messages if not msg.startswith('EXTRACTED_ROW:')]
-            latest_status = status_messages[-1] if status_messages else scraping_progress['message']
+            # Kind of page Google blocked the job with, so callers can back off
+            scraping_progress['blocked'] = web_communicator.blocked
             
-            scraping_progress['live_messages'] = latest_extracted
-            scraping_progress['message'] = latest_status
+            # Places given up after their attempts, with the last error
+            scraping_progress['dead_letters'] = web_communicator.dead_letters
             
             # Add extraction progress stats
             scraping_progress['extracted_count'] = len(web_communicator.extracted_rows)
             scraping_progress['total_locations'] = web_communicator.total_locations
             
             # Check if scraping is completed
-            if (web_communicator.get_progress() >= 100 or 
-                "successfully saved" in latest_message.lower() or 
-                "closing the driver" in latest_message.lower()):
+            # (a failed or blocked job ends processing too, and stays failed or blocked)
+            finished = web_communicator.get_progress() >= 100 or web_communicator.phase == 'done'
+            if web_communicator.blocked:
+                scraping_progress['status'] = 'blocked'
+            elif finished and scraping_progress.get('status') not in ('error', 'blocked'):
                 scraping_progress['status'] = 'completed'
                 scraping_progress['progress'] = 100
             
-        return jsonify(scraping_progress)
+        return jsonify(progress_payload())
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -292,62 +348,208 @@ def download_excel():
     try:
         global scraping_progress
         
-        # Get the extracted data
-        extracted_data = scraping_progress.get('extracted_data', [])
+        # Get the extracted data, of the cached job named by job_id if there is one
+        progress = (cached_job() or (scraping_progress,))[0]
+        extracted_data = progress.get('extracted_data', [])
         
         if not extracted_data:
             return jsonify({'error': 'No data available to download. Please run a scraping operation first.'}), 404
         
-        # Create Excel file in memory
-        # Convert data to DataFrame
-        df = pd.DataFrame(extracted_data)
-        
-        # Create Excel file in memory
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Scraped Data', index=False)
-        
-        output.seek(0)
-        
-        # Generate filename with timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        search_query = scraping_progress.get('search_query', 'google_maps_data')
-        # Clean search query for filename
-        clean_query = "".join(c for c in search_query if c.isalnum() or c in (' ', '-', '_')).rstrip()
-        clean_query = clean_query.replace(' ', '_')[:50]  # Limit length
-        
-        filename = f"Google_Maps_Scraper_{clean_query}_{timestamp}.xlsx"
+        # Reuse the workbook while the rows are unchanged
+        version = len(extracted_data)
+        output = export_cache.get_or_build(
+            progress.get('job_id', 'default'), 'xlsx', version,
+            export_writer(extracted_data, 'xlsx', version)
+        )
         
         return send_file(
             output,
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
             as_attachment=True,
-            download_name=filename
+            download_name=download_filename('xlsx', progress)
         )
         
     except Exception as e:
         return jsonify({'error': f'Error generating Excel file: {str(e)}'}), 500
 
+# Streaming formats: file extension and mimetype
+STREAM_FORMATS = {
+    'csv': ('csv', 'text/csv'),
+    'jsonl': ('jsonl', 'application/x-ndjson'),
+}
+
+def download_filename(extension, progress=None):
+    """Build the download filename from the search query of the job and a timestamp"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    progress = scraping_progress if progress is None else progress
+    search_query = progress.get('search_query', 'google_maps_data')
+    # Clean search query for filename
+    clean_query = "".join(c for c in search_query if c.isalnum() or c in (' ', '-', '_')).rstrip()
+    clean_query = clean_query.replace(' ', '_')[:50]  # Limit length
+    
+    return f"Google_Maps_Scraper_{clean_query}_{timestamp}.{extension}"
+
+def export_writer(rows, file_format, version, sheet_name='Scraped Data'):
+    """
+    Writer of one cached export artifact from the first `version` rows.
+    file_format is 'xlsx', 'csv', 'jsonl', or 'csv.gz' / 'jsonl.gz' for gzip-encoded ones.
+    """
+    def write(artifact):
+        if file_format == 'xlsx':
+            exporter.write_xlsx(
+                exporter.snapshot(rows, version),
+                artifact,
+                exporter.collect_columns(exporter.snapshot(rows, version)),
+                sheet_name=sheet_name
+            )
+            return
+        
+        base_format, _, encoding = file_format.partition('.')
+        chunks = exporter.iter_export(rows, base_format, version)
+        if encoding == 'gz':
+            chunks = exporter.gzip_chunks(chunks)
+        for chunk in chunks:
+            artifact.write(chunk)
+    
+    return write
+
+def stream_rows(rows, file_format, filename, job_id=None):
+    """
+    Send rows as csv or jsonl, gzip-compressed when the client accepts it.
+    With a job_id the rows are final, so the file is served from the export cache;
+    otherwise it is streamed row by row.
+    """
+    extension, mimetype = STREAM_FORMATS[file_format]
+    use_gzip = 'gzip' in request.accept_encodings
+    
+    headers = {
+        'Content-Disposition': f'attachment; filename="{filename}"',
+        'Vary': 'Accept-Encoding',
+    }
+    if use_gzip:
+        headers['Content-Encoding'] = 'gzip'
+    
+    if job_id is not None:
+        cache_format = f'{file_format}.gz' if use_gzip else file_format
+        version = len(rows)
+        artifact = export_cache.get_or_build(
+            job_id, cache_format, version, export_writer(rows, cache_format, version)
+        )
+        response = send_file(artifact, mimetype=mimetype)
+        response.headers.update(headers)
+        return response
+    
+    chunks = exporter.iter_export(rows, file_format)
+    if use_gzip:
+        chunks = exporter.gzip_chunks(chunks)
+    
+    return Response(chunks, mimetype=mimetype, headers=headers)
+
+@app.route('/api/download/<file_format>')
+def download_stream(file_format):
+    """Stream the current scraped data as csv or jsonl"""
+    try:
+        if file_format not in STREAM_FORMATS:
+            return jsonify({'error': f'Unsupported format: {file_format}'}), 404
+        
+        # Rows of a finished job, or the rows extracted so far while it runs
+        progress, communicator = cached_job() or (scraping_progress, web_communicator)
+        extracted_data = progress.get('extracted_data')
+        job_id = progress.get('job_id', 'default')
+        if not extracted_data and communicator:
+            extracted_data = communicator.extracted_rows
+            job_id = None  # still growing, stream instead of caching
+        
+        if not extracted_data:
+            return jsonify({'error': 'No data available to download. Please run a scraping operation first.'}), 404
+        
+        return stream_rows(
+            extracted_data, file_format, download_filename(STREAM_FORMATS[file_format][0], progress), job_id
+        )
+        
+    except Exception as e:
+        return jsonify({'error': f'Error generating {file_format} file: {str(e)}'}), 500
+
 @app.route('/api/data')
 def get_extracted_data():
-    """Get the extracted data for display in table"""
-    global scraping_progress
+    """
+    Get one page of the extracted data for display in table.
+    Query parameters: job_id, limit, offset, category, min_rating, max_rating,
+    has_website, has_email, sort (position, name, category, rating, reviews), order (asc, desc)
+    """
+    global web_communicator
     
     try:
-        if 'extracted_data' in scraping_progress:
-            return jsonify({
-                'success': True,
-                'data': scraping_progress['extracted_data']
-            })
-        else:
+        communicator = (cached_job() or (None, web_communicator))[1]
+        if not communicator or not communicator.extracted_rows:
             return jsonify({'error': 'No data available'}), 404
+        
+        try:
+            limit = request.args.get('limit', DEFAULT_PAGE_SIZE, type=int)
+            offset = request.args.get('offset', 0, type=int)
+            rows, total = communicator.result_store.query(
+                category=request.args.get('category'),
+                min_rating=request.args.get('min_rating', type=float),
+                max_rating=request.args.get('max_rating', type=float),
+                has_website=flag_arg('has_website'),
+                has_email=flag_arg('has_email'),
+                sort=request.args.get('sort', 'position'),
+                descending=request.args.get('order', 'asc').lower() == 'desc',
+                limit=limit,
+                offset=offset
+            )
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        limit = max(1, min(limit, MAX_PAGE_SIZE))
+        offset = max(0, offset)
+        next_offset = offset + len(rows)
+        return jsonify({
+            'success': True,
+            'data': rows,
+            'total': total,
+            'limit': limit,
+            'offset': offset,
+            'next_offset': next_offset if next_offset < total else None
+        })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def run_scraper(data):
+def flag_arg(name):
+    """Read a true/false query parameter, None if it is not given"""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    if value.lower() in ('1', 'true', 'yes'):
+        return True
+    if value.lower() in ('0', 'false', 'no'):
+        return False
+    raise ValueError(f"{name} must be true or false")
+
+def progress_payload(progress=None):
+    """Progress without the extracted rows, which are served page by page from /api/data"""
+    progress = scraping_progress if progress is None else progress
+    return {key: value for key, value in progress.items() if key != 'extracted_data'}
+
+def cached_job():
+    """
+    (progress, communicator) of the finished job named by the job_id query parameter,
+    when it is a cached job other than the current one, else None
+    """
+    job_id = request.args.get('job_id')
+    if not job_id or job_id == scraping_progress.get('job_id'):
+        return None
+    state = query_cache.job(job_id)
+    if state is None:
+        return None
+    return state['progress'], state['communicator']
+
+def run_scraper(data, job_id, key=None):
     """Run the scraper in a separate thread using the exact same Backend class"""
     global scraping_progress, web_communicator
     
+    # Finished job kept in the query cache, None if it failed or found nothing
+    cached_state = None
     try:
         # Create web communicator
         web_communicator = WebCommunicator()
@@ -359,12 +561,12 @@ def run_scraper(data):
         
         # Reset progress
         scraping_progress = {
+            'job_id': job_id,
             'status': 'running',
             'progress': 0,
             'message': 'Initializing...',
             'results': None,
-            'extracted_rows': [],
-            'live_messages': []
+            'live_rows': []
         }
         
         # Use the exact same Backend class from desktop version
@@ -376,43 +578,82 @@ def run_scraper(data):
         backend = Backend(
             searchquery=search_query,
             outputformat=output_format,
-            healdessmode=headless_mode
+            healdessmode=headless_mode,
+            engine=data.get('engine'),
+            mode=data.get('mode'),
+            bbox=data.get('area'),
+            resume=bool(data.get('resume')),
+            fresh=bool(data.get('fresh')),
+            cache=bool(data['cache']) if data.get('cache') is not None else None,
+            deadline=data.get('deadline')
         )
         
+        web_communicator.metrics = backend.metrics
+        
         # Run the main scraping method
         backend.mainscraping()
         
         # Get the extracted data from the backend
         extracted_data = getattr(backend, 'finalData', []) or web_communicator.extracted_rows
         
-        scraping_progress['message'] = 'Scraping completed successfully!'
-        scraping_progress['progress'] = 100
-        scraping_progress['status'] = 'completed'
+        # The table is served from the communicator's store: fill it with the rows the downloads are made of
+        web_communicator.extracted_rows = extracted_data
         
         # Store the data for display
         scraping_progress['extracted_data'] = extracted_data
         scraping_progress['search_query'] = search_query  # Store search query for filename
-        
-        # Mark as completed
-        scraping_progress['status'] = 'completed'
+        scraping_progress['partial'] = backend.deadline.partial()
+        scraping_progress['cut_stages'] = backend.deadline.cut_stages()
+        
+        if backend.blocked:
+            # Blocked: the job ends here, with the rows found before the block still downloadable
+            scraping_progress['status'] = 'blocked'
+            scraping_progress['blocked'] = backend.blocked
+            scraping_progress['message'] = (f"Google is showing a {backend.blocked.replace('_', ' ')} page instead "
+                                            f"of Maps after {len(extracted_data)} businesses. "
+                                            f"Try again later or from another network.")
+        else:
+            # Mark as completed, partial if a stage ran out of time
+            scraping_progress['status'] = 'completed'
+            scraping_progress['message'] = f'Scraping completed successfully! Found {len(extracted_data)} businesses.'
+            if backend.deadline.partial():
+                scraping_progress['message'] = (f"Partial results: found {len(extracted_data)} businesses before the "
+                                                f"time budget ran out ({', '.join(backend.deadline.cut_stages())}).")
         scraping_progress['progress'] = 100
-        scraping_progress['message'] = f'Scraping completed successfully! Found {len(extracted_data)} businesses.'
         
         # Get the scraped data from the backend
         scraping_progress['results'] = {
             'total_results': len(extracted_data) if extracted_data else 0,
-            'excel_file': '/api/download/excel'
+            'excel_file': f'/api/download/excel?job_id={job_id}',
+            'csv_file': f'/api/download/csv?job_id={job_id}',
+            'jsonl_file': f'/api/download/jsonl?job_id={job_id}',
+            'dead_letters': web_communicator.dead_letters,
+            'cache_hits': backend.metrics.get('cache_hits')
         }
         
+        # Build the downloads in the background, so the first one is served from cache
+        if extracted_data:
+            version = len(extracted_data)
+            export_cache.build_async(job_id, version, {
+                file_format: export_writer(extracted_data, file_format, version)
+                for file_format in ('xlsx', 'csv.gz')
+            })
+        
         # End processing in communicator
         if web_communicator:
             web_communicator.end_processing()
         
+        if extracted_data and not backend.blocked and not Common.close_thread_is_set() and not backend.deadline.partial():
+            cached_state = {'progress': dict(scraping_progress), 'communicator': web_communicator}
+        
     except Exception as e:
         scraping_progress['status'] = 'error'
         scraping_progress['message'] = f'Error: {str(e)}'
         scraping_progress['progress'] = 0
         print(f"❌ Scraping error: {e}")
+    finally:
+        if key is not None:
+            query_cache.finish(key, job_id, cached_state)
 
 
 # Email Scraping Routes
@@ -570,37 +811,25 @@ def download_email_excel():
         if not results:
             return jsonify({'error': 'No email results to download'}), 400
         
-        # Convert results to DataFrame
-        from scraper.email_scraper import EmailScraper
-        scraper = EmailScraper()
-        export_data = scraper.export_to_dict(results)
-        
-        df = pd.DataFrame(export_data)
-        
-        # Create Excel file in memory
-        excel_buffer = BytesIO()
-        
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Email Results', index=False)
-            
-            # Get workbook and worksheet
-            workbook = writer.book
-            worksheet = writer.sheets['Email Results']
+        def write_workbook(artifact):
+            # Convert results to rows
+            from scraper.email_scraper import EmailScraper
+            scraper = EmailScraper()
+            export_data = scraper.export_to_dict(results)
+            columns = exporter.collect_columns(export_data)
             
-            # Auto-adjust column widths
-            for column in worksheet.columns:
-                max_length = 0
-                column_letter = column[0].column_letter
-                for cell in column:
-                    try:
-                        if len(str(cell.value)) > max_length:
-                            max_length = len(str(cell.value))
-                    except:
-                        pass
-                adjusted_width = min(max_length + 2, 50)
-                worksheet.column_dimensions[column_letter].width = adjusted_width
-        
-        excel_buffer.seek(0)
+            # Write the workbook row by row, with column widths fitted to the data
+            exporter.write_xlsx(
+                export_data,
+                artifact,
+                columns,
+                sheet_name='Email Results',
+                widths=exporter.column_widths(export_data, columns)
+            )
+        
+        # Reuse the workbook for repeated downloads of the same extraction
+        job_id = f"email-{email_web_comm.get_progress().get('job_id', 'default')}"
+        excel_buffer = export_cache.get_or_build(job_id, 'xlsx', len(results), write_workbook)
         
         # Generate filename with timestamp
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -618,6 +847,34 @@ def download_email_excel():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/email/download/<file_format>', methods=['GET'])
+def download_email_stream(file_format):
+    """Stream email results as csv or jsonl"""
+    try:
+        if file_format not in STREAM_FORMATS:
+            return jsonify({'error': f'Unsupported format: {file_format}'}), 404
+        
+        if not email_web_comm.is_completed():
+            return jsonify({'error': 'Email scraping not completed yet'}), 400
+        
+        results = email_web_comm.get_results()
+        
+        if not results:
+            return jsonify({'error': 'No email results to download'}), 400
+        
+        from scraper.email_scraper import EmailScraper
+        export_data = EmailScraper().export_to_dict(results)
+        
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        domain = email_web_comm.get_progress().get('current_domain', 'unknown')
+        filename = f"email_results_{domain}_{timestamp}.{STREAM_FORMATS[file_format][0]}"
+        
+        return stream_rows(export_data, file_format, filename)
+        
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
 if __name__ == '__main__':
     print("🚀 Starting Orizon Google Maps Scraper Web Server...")
     print("📍 Web Interface: http://localhost:5000")
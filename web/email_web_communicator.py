@@ -5,6 +5,7 @@ Handles real-time communication between email scraper and web interface
 
 import json
 import time
+import uuid
 from typing import Dict, List, Any
 from threading import Lock
 
@@ -50,6 +51,7 @@ class EmailWebCommunicator:
         """Start email extraction process"""
         with self.lock:
             self.progress_data.update({
+                'job_id': uuid.uuid4().hex,
                 'status': 'running',
                 'progress': 0,
                 'message': f'Starting email extraction for {domain}',
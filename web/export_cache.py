@@ -0,0 +1,114 @@
+"""
+Cache of generated export files, per job and format.
+An artifact is valid for one version of the job's rows (their count,
+as rows are only ever appended), so new rows invalidate it.
+"""
+
+import os
+import shutil
+import tempfile
+import threading
+
+
+class ExportCache:
+    def __init__(self, max_jobs=4):
+        self.directory = tempfile.mkdtemp(prefix="gms_exports_")
+        self.max_jobs = max_jobs  # artifacts of older jobs are deleted
+        self.entries = {}  # (job_id, file_format) -> (version, path)
+        self.jobs = []  # cached job ids, oldest first
+        self.lock = threading.Lock()
+        self.build_locks = {}  # (job_id, file_format) -> Lock
+
+    def get(self, job_id, file_format, version):
+        """
+        The cached artifact opened for reading, or None if missing or built from older rows.
+        It is opened under the lock, so evicting it afterwards only unlinks the file
+        the download keeps reading. The caller closes it (send_file does)
+        """
+        key = (job_id, file_format)
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] != version:
+                # New rows arrived since this artifact was built
+                self.__drop(key)
+                return None
+            return open(entry[1], "rb")
+
+    def get_or_build(self, job_id, file_format, version, writer):
+        """
+        Return the cached artifact opened for reading, building it with writer(file)
+        if needed. Concurrent requests for the same artifact wait for one build.
+        """
+        artifact = self.get(job_id, file_format, version)
+        if artifact is not None:
+            return artifact
+
+        key = (job_id, file_format)
+        with self.lock:
+            build_lock = self.build_locks.setdefault(key, threading.Lock())
+
+        with build_lock:
+            artifact = self.get(job_id, file_format, version)
+            if artifact is not None:
+                return artifact
+
+            path = os.path.join(self.directory, f"{job_id}-{version}.{file_format}")
+            with open(path, "wb") as artifact:
+                writer(artifact)
+
+            with self.lock:
+                self.__remember_job(job_id)
+                self.__drop(key)
+                self.entries[key] = (version, path)
+                return open(path, "rb")
+
+    def build_async(self, job_id, version, writers):
+        """Build artifacts in a background thread. writers maps file_format -> writer"""
+
+        def build_all():
+            for file_format, writer in writers.items():
+                try:
+                    self.get_or_build(job_id, file_format, version, writer).close()
+                except Exception as e:
+                    print(f"[EXPORT_CACHE] Building {file_format} for job {job_id} failed: {e}")
+
+        thread = threading.Thread(target=build_all, daemon=True)
+        thread.start()
+        return thread
+
+    def invalidate(self, job_id):
+        """Delete every artifact of a job"""
+        with self.lock:
+            for key in [key for key in self.entries if key[0] == job_id]:
+                self.__drop(key)
+
+    def clear(self):
+        with self.lock:
+            self.entries = {}
+            self.jobs = []
+            self.build_locks = {}
+        shutil.rmtree(self.directory, ignore_errors=True)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def __drop(self, key):
+        """Remove one entry and its file. Caller holds self.lock"""
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            try:
+                os.remove(entry[1])  # open downloads keep reading the unlinked file
+            except OSError:
+                pass
+
+    def __remember_job(self, job_id):
+        """Track job order and evict the oldest jobs. Caller holds self.lock"""
+        if job_id in self.jobs:
+            return
+        self.jobs.append(job_id)
+        while len(self.jobs) > self.max_jobs:
+            oldest = self.jobs.pop(0)
+            for key in [key for key in self.entries if key[0] == oldest]:
+                self.__drop(key)
+            for key in [key for key in self.build_locks if key[0] == oldest]:
+                del self.build_locks[key]
@@ -44,6 +44,9 @@ scraping_progress = {
 # Global web communicator instance
 web_communicator = None
 
+# Seconds a scraping job may take, it then returns partial results
+JOB_TIMEOUT_SECONDS = 300
+
 print(f"🚀 Starting Orizon Google Maps Scraper (Production: {is_production})")
 
 @app.route('/')
@@ -353,60 +356,15 @@ def api_scrape():
                 backend = Backend(
                     searchquery=search_query,
                     outputformat='excel',
-                    healdessmode=1  # Always headless in production
+                    healdessmode=1,  # Always headless in production
+                    deadline=JOB_TIMEOUT_SECONDS
                 )
                 
                 scraping_progress['message'] = 'Starting scraping process...'
                 scraping_progress['progress'] = 20
                 
-                # Add timeout using threading Timer (works in background threads)
-                import threading
-                import time
-                
-                scraping_completed = threading.Event()
-                scraping_error_occurred = False
-                scraping_exception = None
-                
-                def scraping_with_timeout():
-                    nonlocal scraping_error_occurred, scraping_exception
-                    try:
-                        # Run scraping
-                        backend.mainscraping()
-                        scraping_completed.set()
-                    except Exception as e:
-                        scraping_error_occurred = True
-                        scraping_exception = e
-                        scraping_completed.set()
-                
-                # Start scraping in a separate thread
-                scraping_thread = threading.Thread(target=scraping_with_timeout, daemon=True)
-                scraping_thread.start()
-                
-                # Wait for completion or timeout (5 minutes) with progress updates
-                timeout_seconds = 300  # 5 minutes
-                check_interval = 10   # Check every 10 seconds
-                elapsed = 0
-                
-                while elapsed < timeout_seconds:
-                    if scraping_completed.wait(timeout=check_interval):
-                        if scraping_error_occurred:
-                            raise scraping_exception
-                        # Scraping completed successfully
-                        break
-                    
-                    elapsed += check_interval
-                    minutes_elapsed = elapsed // 60
-                    seconds_elapsed = elapsed % 60
-                    scraping_progress['message'] = f'Scraping in progress... ({minutes_elapsed}m {seconds_elapsed}s elapsed)'
-                    scraping_progress['progress'] = min(90, 20 + (elapsed / timeout_seconds) * 70)  # Progress from 20% to 90%
-                    print(f"⏰ Scraping progress: {elapsed}s elapsed")
-                    
-                else:
-                    # Timeout occurred
-                    scraping_progress['status'] = 'error'
-                    scraping_progress['message'] = 'Scraping timed out after 5 minutes. This may be due to Google Maps loading issues in Railway.'
-                    print("❌ Scraping timed out")
-                    return
+                # The job returns what it has once its deadline is reached
+                backend.mainscraping()
                 
                 # Get extracted data from multiple possible sources
                 extracted_data = []
@@ -434,6 +392,10 @@ def api_scrape():
                 scraping_progress['progress'] = 100
                 scraping_progress['message'] = f'Scraping completed! Found {len(extracted_data)} businesses.'
                 scraping_progress['extracted_data'] = extracted_data
+                scraping_progress['partial'] = backend.deadline.partial()
+                if backend.deadline.partial():
+                    scraping_progress['message'] = (f'Partial results: found {len(extracted_data)} businesses '
+                                                    f'before the {JOB_TIMEOUT_SECONDS // 60} minute limit.')
                 
                 print(f"✅ Scraping completed for: {search_query} - Found {len(extracted_data)} results")
                 
@@ -480,9 +442,9 @@ def api_progress():
 def download_excel():
     """Download Excel file with scraped data"""
     try:
-        import pandas as pd
-        from io import BytesIO
+        import tempfile
         from flask import send_file
+        from scraper import exporter
         import glob
         import os
         
@@ -531,13 +493,14 @@ def download_excel():
         if not extracted_data:
             return {"error": "No data available to download. Please run a scraping operation first."}, 404
         
-        # Create Excel file from extracted data
-        df = pd.DataFrame(extracted_data)
-        output = BytesIO()
-        
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, sheet_name='Scraped Data', index=False)
-        
+        # Create Excel file from extracted data, written row by row
+        output = tempfile.TemporaryFile()
+        exporter.write_xlsx(
+            extracted_data,
+            output,
+            exporter.collect_columns(extracted_data),
+            sheet_name='Scraped Data'
+        )
         output.seek(0)
         
         return send_file(
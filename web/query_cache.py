@@ -0,0 +1,78 @@
+"""
+Cache of finished scraping jobs, per query.
+An identical request within the TTL is answered with the finished job,
+and one arriving while that query is being scraped attaches to the
+running job instead of starting a second browser.
+"""
+
+import re
+import threading
+import time
+
+
+def query_key(data, engine='', mode=''):
+    """
+    Key of a scrape request: the normalized query and the options that change its results.
+    engine and mode are the defaults of a request that leaves them out, so it shares
+    the key of one that names them
+    """
+    query = re.sub(r"\s+", " ", str(data.get('search_query') or '')).strip().lower()
+    area = re.sub(r"\s+", "", str(data.get('area') or ''))
+    return (query, data.get('engine') or engine, data.get('mode') or mode, area)
+
+
+class QueryCache:
+    def __init__(self, ttl_minutes=30, max_jobs=4):
+        self.ttl = ttl_minutes * 60
+        self.max_jobs = max_jobs  # older finished jobs are dropped, with their rows
+        self.running = {}  # key -> job_id of the job scraping it
+        self.finished = {}  # key -> (finished_at, job_id, state of the finished job), oldest first
+        self.lock = threading.Lock()
+
+    def start(self, key, job_id):
+        """
+        Register job_id as the job scraping key.
+        Returns the job_id of a job already scraping it (nothing is registered then), else None.
+        """
+        with self.lock:
+            running = self.running.get(key)
+            if running is not None:
+                return running
+            self.running[key] = job_id
+            return None
+
+    def finish(self, key, job_id, state=None):
+        """
+        End the job. state is what is needed to serve the job again
+        (None for a failed or empty job, which is not cached)
+        """
+        with self.lock:
+            if self.running.get(key) == job_id:
+                del self.running[key]
+            if state is not None:
+                self.finished.pop(key, None)  # moves to the end, as the latest
+                self.finished[key] = (time.time(), job_id, state)
+            self.__expire()
+            while len(self.finished) > self.max_jobs:
+                del self.finished[next(iter(self.finished))]
+
+    def get(self, key):
+        """(job_id, state) of the job that finished key within the TTL, or None"""
+        with self.lock:
+            self.__expire()
+            entry = self.finished.get(key)
+            return entry[1:] if entry else None
+
+    def job(self, job_id):
+        """State of the finished job job_id if it is still cached, else None"""
+        with self.lock:
+            self.__expire()
+            for finished_at, finished_job_id, state in self.finished.values():
+                if finished_job_id == job_id:
+                    return state
+            return None
+
+    def __expire(self):
+        now = time.time()
+        for key in [key for key, entry in self.finished.items() if now - entry[0] > self.ttl]:
+            del self.finished[key]
@@ -0,0 +1,142 @@
+"""
+Indexed store of a job's extracted rows.
+Rows are kept once, in a plain list; an in-memory SQLite table holds only
+the columns used for filtering and sorting, each with its own index.
+"""
+
+import re
+import sqlite3
+import threading
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+# sort parameter -> indexed column
+SORT_COLUMNS = {
+    "position": "position",
+    "name": "name",
+    "category": "category",
+    "rating": "rating",
+    "reviews": "reviews",
+}
+
+# Prefixes of the placeholder values the scraper writes when a field was not found
+MISSING_PREFIXES = ("not available", "[not found]")
+
+
+def _field(row, key):
+    """Rows use capitalized keys, fallback rows use lowercase ones"""
+    value = row.get(key)
+    if value is None:
+        value = row.get(key.lower())
+    return value
+
+
+def _present(value):
+    text = "" if value is None else str(value).strip().lower()
+    return bool(text) and not text.startswith(MISSING_PREFIXES)
+
+
+def _number(value, integer=False):
+    """First number in a value like '4,5', '(1,234)' or 'Rated 4.5 stars'"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    text = str(value)
+    if integer:
+        match = re.search(r"\d[\d,.\s]*", text)
+        return int(re.sub(r"\D", "", match.group())) if match else None
+    match = re.search(r"\d+(?:[.,]\d+)?", text)
+    return float(match.group().replace(",", ".")) if match else None
+
+
+class ResultStore:
+    def __init__(self):
+        self.rows = []
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(":memory:", check_same_thread=False)
+        self.connection.executescript(
+            """
+            CREATE TABLE rows (
+                position INTEGER PRIMARY KEY,
+                name TEXT COLLATE NOCASE,
+                category TEXT COLLATE NOCASE,
+                rating REAL,
+                reviews INTEGER,
+                has_website INTEGER,
+                has_email INTEGER
+            );
+            CREATE INDEX rows_name ON rows (name);
+            CREATE INDEX rows_category ON rows (category);
+            CREATE INDEX rows_rating ON rows (rating);
+            CREATE INDEX rows_reviews ON rows (reviews);
+            CREATE INDEX rows_has_website ON rows (has_website);
+            CREATE INDEX rows_has_email ON rows (has_email);
+            """
+        )
+
+    def add(self, row):
+        """Store a row and index its filter and sort columns"""
+        with self.lock:
+            position = len(self.rows)
+            self.rows.append(row)
+            self.connection.execute(
+                "INSERT INTO rows VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    position,
+                    _field(row, "Name"),
+                    _field(row, "Category"),
+                    _number(_field(row, "Rating")),
+                    _number(row.get("Total Reviews") or row.get("reviews"), integer=True),
+                    int(_present(_field(row, "Website"))),
+                    int(_present(_field(row, "Email"))),
+                ),
+            )
+
+    def query(self, category=None, min_rating=None, max_rating=None, has_website=None,
+              has_email=None, sort="position", descending=False, limit=DEFAULT_PAGE_SIZE, offset=0):
+        """
+        Return (rows of the requested page, number of matching rows).
+        Every filter and the sort column is served from an index.
+        """
+        if sort not in SORT_COLUMNS:
+            raise ValueError(f"Cannot sort by {sort}. Use one of: {', '.join(SORT_COLUMNS)}")
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        offset = max(0, int(offset))
+
+        conditions, parameters = [], []
+        if category:
+            conditions.append("category = ?")
+            parameters.append(category)
+        if min_rating is not None:
+            conditions.append("rating >= ?")
+            parameters.append(float(min_rating))
+        if max_rating is not None:
+            conditions.append("rating <= ?")
+            parameters.append(float(max_rating))
+        if has_website is not None:
+            conditions.append("has_website = ?")
+            parameters.append(int(has_website))
+        if has_email is not None:
+            conditions.append("has_email = ?")
+            parameters.append(int(has_email))
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+        direction = "DESC" if descending else "ASC"
+        order = f"{SORT_COLUMNS[sort]} IS NULL, {SORT_COLUMNS[sort]} {direction}, position"
+
+        with self.lock:
+            total = self.connection.execute(
+                f"SELECT COUNT(*) FROM rows {where}", parameters
+            ).fetchone()[0]
+            positions = self.connection.execute(
+                f"SELECT position FROM rows {where} ORDER BY {order} LIMIT ? OFFSET ?",
+                parameters + [limit, offset],
+            ).fetchall()
+            page = [self.rows[position] for (position,) in positions]
+
+        return page, total
+
+    def __len__(self):
+        return len(self.rows)
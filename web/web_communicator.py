@@ -2,136 +2,151 @@
 Web communicator for Flask interface - replaces the desktop GUI communicator
 """
 
+import time
+from collections import deque
+
+try:
+    from web.result_store import ResultStore
+except ImportError:
+    from result_store import ResultStore
+
+# Only the most recent log lines are kept, so memory per job stays flat
+LOG_BUFFER_SIZE = 500
+
+# Progress percentage where each phase starts
+PHASE_PROGRESS = {
+    "driver": 5,
+    "navigating": 20,
+    "scrolling": 30,
+    "parsing": 70,
+    "saving": 90,
+    "done": 100,
+}
+
+
 class WebCommunicator:
     def __init__(self):
-        self.messages = []
+        self.messages = deque(maxlen=LOG_BUFFER_SIZE)
         self.is_processing = True
         self.output_format = "excel"  # Default format
         self.search_query = ""
-        self.extracted_rows = []  # Store extracted business data
+        self.result_store = ResultStore()  # Extracted business data, indexed for /api/data
         self.current_progress = 0
+        self.phase = None
+        self.phase_started_at = {}  # phase -> timestamp of its first event
         self.total_locations = 0  # Track total locations found during scrolling
-        self.parsing_started = False
-        
+        self.parsed_locations = 0
+        self.blocked = None  # kind of page Google blocked the job with
+        self.dead_letters = []  # places given up: url, last error, attempts
+        self.metrics = None  # the job's metrics.Metrics, once its Backend is created
+
     def messageshowing(self, message):
         """Store messages for web interface"""
         print(f"[SCRAPER] {message}")  # Also print to console
         self.messages.append(message)
-        
-        # Update progress based on message content
-        if "Wait checking for driver" in message:
-            self.current_progress = 5
-        elif "Opening browser" in message:
-            self.current_progress = 10
-        elif "Working start" in message:
-            self.current_progress = 20
-        elif "Starting scrolling" in message:
-            self.current_progress = 30
-        elif "Total locations scrolled" in message:
-            # Extract number and calculate progress
-            try:
-                import re
-                numbers = re.findall(r'\d+', message)
-                if numbers:
-                    count = int(numbers[-1])
-                    self.total_locations = count  # Store total for parsing progress
-                    # Progress from 30 to 60 based on scrolled locations
-                    self.current_progress = min(30 + (count * 1), 60)
-            except:
-                pass
-        elif "Scrolling is done" in message:
-            self.current_progress = 65
-        elif "Starting parsing" in message or "Now going to scrape each location" in message:
-            self.parsing_started = True
-            self.current_progress = 70
-        elif "Saving the scraped data" in message:
-            self.current_progress = 90
-        elif "Scraped data successfully saved" in message or "Total records saved:" in message:
-            self.current_progress = 100
-        elif "Closing the driver" in message:
-            self.current_progress = 100
-        
+
+    def on_progress(self, event):
+        """Update progress from a typed progress event"""
+        if event.phase not in self.phase_started_at:
+            self.phase_started_at[event.phase] = event.timestamp
+        self.phase = event.phase
+
+        self.total_locations = max(self.total_locations, event.found, event.total)
+        if event.parsed:  # the done event carries no counts
+            self.parsed_locations = event.parsed
+
+        progress = PHASE_PROGRESS.get(event.phase, self.current_progress)
+        if event.phase == "scrolling":
+            # Progress from 30 to 60 based on scrolled locations
+            progress += min(event.found, 30)
+        elif event.phase == "parsing" and event.total > 0:
+            # Progress from 70 to 85 based on extraction progress
+            progress += min(15 * (event.parsed / event.total), 15)
+
+        # Progress never moves backwards within a job
+        self.current_progress = max(self.current_progress, progress)
+
+    def on_blocked(self, kind):
+        """Google showed a captcha, unusual traffic or consent page instead of Maps"""
+        self.blocked = kind
+
+    def on_dead_letters(self, dead_letters):
+        """Places the parser gave up after their attempts"""
+        self.dead_letters.extend(dead_letters)
+
     def add_extracted_row(self, business_data):
         """Add a newly extracted business row"""
-        self.extracted_rows.append(business_data)
-        
-        # Update parsing progress based on extracted rows
-        if self.parsing_started and self.total_locations > 0:
-            extracted_count = len(self.extracted_rows)
-            # Progress from 70 to 85 based on extraction progress
-            parsing_progress = min(15 * (extracted_count / self.total_locations), 15)
-            self.current_progress = 70 + parsing_progress
-        
-        # Format the data for display
-        formatted_data = self.format_business_data(business_data)
-        
-        # Add to messages for real-time display
-        self.messages.append(f"EXTRACTED_ROW:{formatted_data}")
-        print(f"[EXTRACTED] {formatted_data}")
-        
-    def format_business_data(self, data):
-        """Format business data for display"""
-        try:
-            # The parser uses capitalized keys
-            name = data.get('Name', 'Unknown')
-            phone = data.get('Phone', '[NOT FOUND]')
-            website = data.get('Website', '[NOT FOUND]')
-            email = data.get('Email', '[NOT FOUND]')
-            address = data.get('Address', '[NOT FOUND]')
-            rating = data.get('Rating', '[NOT FOUND]')
-            category = data.get('Category', '[NOT FOUND]')
-            business_status = data.get('Business Status', '[NOT FOUND]')
-            
-            return f"""
-Extracted data for {name}:
-  Category: {category}
-  Name: {name}
-  Phone: {phone}
-  Website: {website}
-  Email: {email}
-  Business Status: {business_status}
-  Address: {address}
-  Rating: {rating}
---------------------------------------------------"""
-        except:
-            return f"Extracted business data: {str(data)[:100]}..."
-        
+        self.result_store.add(business_data)
+        print(f"[EXTRACTED] {business_data.get('Name') or business_data.get('name', 'Unknown')}")
+
     def end_processing(self):
         """End the processing"""
         self.is_processing = False
         self.current_progress = 100
-        
+
     def get_latest_message(self):
         """Get the latest message"""
         if self.messages:
             return self.messages[-1]
         return "Initializing..."
-        
+
     def get_all_messages(self):
-        """Get all messages"""
-        return self.messages
-        
+        """Get all buffered messages"""
+        return list(self.messages)
+
+    @property
+    def extracted_rows(self):
+        """Extracted rows, in extraction order"""
+        return self.result_store.rows
+
+    @extracted_rows.setter
+    def extracted_rows(self, rows):
+        """Replace the extracted rows (used for the scroller's backup data)"""
+        self.result_store = ResultStore()
+        for row in rows:
+            self.result_store.add(row)
+
+    def get_live_rows(self, limit=100):
+        """Get the most recently extracted rows"""
+        return self.extracted_rows[-limit:]
+
+    def get_phase_timings(self):
+        """Get seconds spent in each phase so far"""
+        timings = {}
+        started = sorted(self.phase_started_at.items(), key=lambda item: item[1])
+        for index, (phase, started_at) in enumerate(started):
+            if index + 1 < len(started):
+                ended_at = started[index + 1][1]
+            else:
+                ended_at = time.time()
+            timings[phase] = round(ended_at - started_at, 2)
+        return timings
+
     def get_progress(self):
         """Get current progress percentage"""
         return self.current_progress
-        
+
     def clear_messages(self):
         """Clear all messages"""
-        self.messages = []
-        self.extracted_rows = []
+        self.messages.clear()
+        self.result_store = ResultStore()
         self.current_progress = 0
+        self.phase = None
+        self.phase_started_at = {}
         self.total_locations = 0
-        self.parsing_started = False
-        
+        self.parsed_locations = 0
+        self.blocked = None  # kind of page Google blocked the job with
+        self.dead_letters = []
+
     @property
     def outputFormatValue(self):
         """Return output format for compatibility"""
         return self.output_format
-        
+
     def set_output_format(self, format_type):
         """Set output format"""
         self.output_format = format_type
-        
+
     def set_search_query(self, query):
         """Set search query"""
-        self.search_query = query
\ No newline at end of file
+        self.search_query = query